@@ -1,16 +1,130 @@
-from flask import Flask, render_template, request, redirect, url_for, flash, session, Response
-from werkzeug.utils import secure_filename
+from flask import Flask, render_template, request, redirect, url_for, flash, session, Response, jsonify, g
+from flask import before_render_template, send_from_directory, template_rendered
+import atexit
+import base64
+import binascii
+import cProfile
+import csv
 import hashlib
-import json
+import io
 import os
-from datetime import datetime
+import pstats
+import threading
+import time
+import zlib
+from collections import OrderedDict, deque
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from datetime import datetime, timezone
 from typing import List, Dict, Any
 
-
+from werkzeug.http import is_resource_modified
+
+from blockchain import (
+    create_genesis_block,
+    make_block,
+    summary_from_counts,
+)
+from coordination import (
+    ALL as CHANGED_ALL,
+    BLOCKS as CHANGED_BLOCKS,
+    META as CHANGED_META,
+    RESET as CHANGED_RESET,
+    open_coordinator,
+)
+from hashing import ALGORITHMS as HASH_ALGORITHMS, hash_settings, hasher_for
+from images import ImagePipeline, is_content_addressed, media_references
+from ingest import VoteRejected, VoteWriter
+from live import ChainFeed, StreamSlots, stream_chain
+from metrics import METRICS
+from passwords import PasswordHasher
+from storage import EventCache, open_storage
+from verify import verify_chain
+
+
+# Backend storage: "json" (katalog + log JSON Lines per-event + users.json) atau "sqlite"
+STORAGE_BACKEND = os.environ.get("CHAINVOTE_STORAGE", "json")
+# File lama (semua event + blockchain dalam satu JSON), hanya dipakai untuk migrasi
 EVENTS_FILE = "events.json"
+# Backend json: katalog metadata event & folder log blockchain per-event (JSON Lines)
+EVENTS_META_FILE = "events_meta.json"
+CHAINS_DIR = "chains"
 USERS_FILE = "users.json"
+# Backend sqlite: satu file database untuk events, blocks & users
+SQLITE_FILE = "chainvote.db"
+# Arsip chain event yang sudah ditutup (gzip per potongan + manifest), dipakai kedua backend
+ARCHIVE_DIR = "archive"
+# Mode multi-worker (beberapa proses, mis. gunicorn -c gunicorn.conf.py): lock file
+# per event & change log bersama di COORDINATION_DIR, dicek tiap CHANGE_POLL_INTERVAL detik
+MULTIPROCESS = os.environ.get("CHAINVOTE_MULTIPROCESS") == "1"
+COORDINATION_DIR = "coordination"
+CHANGE_POLL_INTERVAL = 0.2
+# fsync log blok dilakukan per N blok atau per N detik (mana yang lebih dulu)
+FSYNC_BATCH_SIZE = 32
+FSYNC_INTERVAL = 1.0
+# Cache event in-process: cek perubahan file dari luar proses paling sering tiap N detik
+CACHE_REVALIDATE_INTERVAL = 1.0
+# Maksimum shard chain per event yang disimpan di memori (None = tanpa batas)
+CACHE_MAX_CHAINS = 64
+# Writer vote per-event: maksimum vote per group commit, batas tunggu request (detik)
+# & lama antrean kosong sebelum thread writer event berhenti (detik)
+VOTE_BATCH_MAX = 256
+VOTE_SUBMIT_TIMEOUT = 10.0
+VOTE_WRITER_IDLE_TIMEOUT = 60.0
+# Upload vote massal (TPS/kiosk offline): maksimum entri per request
+VOTE_UPLOAD_MAX = 10000
+# Jumlah proses untuk verifikasi audit penuh (None = semua core CPU)
+AUDIT_WORKERS = None
+# Viewer blockchain: jumlah blok per halaman & batas maksimum per request API
+BLOCKS_PAGE_SIZE = 60
+BLOCKS_API_MAX_LIMIT = 500
+# Ekspor CSV: jumlah baris per potongan yang dikirim saat streaming
+CSV_STREAM_ROWS = 500
+# Stream hasil real-time (SSE): interval heartbeat, umur maksimum satu koneksi (detik)
+# & jumlah blok maksimum yang dikirim ulang saat reconnect (lebih dari itu -> snapshot)
+SSE_HEARTBEAT = 15.0
+SSE_MAX_DURATION = 300.0
+SSE_REPLAY_MAX = 1000
+# Jumlah stream SSE terbuka bersamaan per worker. Setiap stream menahan satu thread, jadi
+# batas ini harus di bawah jumlah thread worker (gunicorn.conf.py mengisinya dari
+# CHAINVOTE_THREADS); stream di atas batas ditolak 503 dan halaman tetap memakai hasil statis
+SSE_MAX_STREAMS = int(os.environ.get("CHAINVOTE_SSE_MAX_STREAMS", "32"))
+# Profiling runtime (cProfile per request, bisa dinyalakan admin saat berjalan):
+# jumlah profil request terakhir yang disimpan & jumlah fungsi teratas per profil
+PROFILING_ENABLED = os.environ.get("CHAINVOTE_PROFILING") == "1"
+PROFILE_HISTORY = 20
+PROFILE_TOP_FUNCTIONS = 25
+# Hash password (PBKDF2-SHA256): work factor & jumlah thread KDF paralel.
+# Hash lama dengan iterasi lebih kecil di-upgrade otomatis saat login berhasil.
+PASSWORD_HASH_ITERATIONS = int(os.environ.get("CHAINVOTE_PASSWORD_ITERATIONS", "200000"))
+PASSWORD_HASH_WORKERS = 4
+# Impor user massal (CSV): maksimum baris per upload
+USER_IMPORT_MAX = 10000
+# Algoritma hash blok default untuk event baru ("sha256" atau "blake2b"); event lama
+# tetap diverifikasi dengan skema yang tercatat di metadata-nya
+HASH_ALGORITHM = os.environ.get("CHAINVOTE_HASH_ALGORITHM", "sha256")
 UPLOAD_FOLDER = os.path.join("static", "uploads")
 ALLOWED_EXTENSIONS = {"png", "jpg", "jpeg", "gif"}
+# Pipeline gambar kandidat (validasi, resize, thumbnail) di background
+IMAGE_WORKERS = 2
+IMAGE_MAX_BYTES = 5 * 1024 * 1024
+IMAGE_MAX_DIMENSION = 1024
+THUMBNAIL_SIZE = 320
+# Gambar bernama hash isi tidak pernah berubah -> cache browser 1 tahun
+MEDIA_MAX_AGE = 365 * 24 * 3600
+# Provisioning event massal: maksimum event per request
+EVENT_BULK_MAX = 500
+# HTTP caching: jumlah halaman viewer blockchain hasil render yang disimpan per
+# versi event (ETag); 0 = nonaktif (hanya 304 untuk request kondisional)
+RENDER_CACHE_PAGES = 128
+# Warm-up setelah start: index user, katalog & chain event terbuka (terbaru dulu, maksimum
+# CACHE_MAX_CHAINS) dimuat di thread background; /readyz baru 200 setelah selesai
+WARMUP_ENABLED = os.environ.get("CHAINVOTE_WARMUP", "1") != "0"
+# User default yang dibuat jika belum ada: (username, password, role)
+DEFAULT_USERS = (
+    ("admin", "admin123", "admin"),
+    ("user", "user123", "user"),
+    ("attacker", "attacker123", "attacker"),
+)
 
 
 def create_app() -> Flask:
@@ -21,196 +135,309 @@ def create_app() -> Flask:
     # Konfigurasi upload folder
     os.makedirs(UPLOAD_FOLDER, exist_ok=True)
     app.config["UPLOAD_FOLDER"] = UPLOAD_FOLDER
+    app.config["PROFILING"] = PROFILING_ENABLED
+
+    # Lock & broadcast perubahan antar worker (versi satu proses jika bukan mode multi-worker)
+    coordinator = open_coordinator(MULTIPROCESS, COORDINATION_DIR, poll_interval=CHANGE_POLL_INTERVAL)
+    atexit.register(coordinator.close)
+    app.extensions["coordinator"] = coordinator
+
+    # Storage event & user sesuai backend yang dipilih.
+    # events.json format lama dimigrasi otomatis saat pertama kali start.
+    store, user_store = open_storage(
+        STORAGE_BACKEND,
+        meta_file=EVENTS_META_FILE,
+        chains_dir=CHAINS_DIR,
+        users_file=USERS_FILE,
+        sqlite_file=SQLITE_FILE,
+        fsync_batch_size=FSYNC_BATCH_SIZE,
+        fsync_interval=FSYNC_INTERVAL,
+        locks=coordinator if coordinator.shared else None,
+        archive_dir=ARCHIVE_DIR,
+    )
+    # Beberapa worker bisa start bersamaan: migrasi & user default dijalankan satu per satu.
+    # Setelah migrasi file lama tidak ada lagi, jadi start berikutnya tidak perlu mengambil lock.
+    if os.path.exists(EVENTS_FILE):
+        with coordinator.lock("startup"):
+            store.migrate_legacy(EVENTS_FILE)
+    atexit.register(store.close)
+    atexit.register(user_store.close)
+    # Semua akses event lewat cache (write-through) agar GET tidak mem-parse file lagi
+    events_cache = EventCache(store, revalidate_interval=CACHE_REVALIDATE_INTERVAL, max_chains=CACHE_MAX_CHAINS)
+    app.extensions["event_store"] = store
+    app.extensions["user_store"] = user_store
+    app.extensions["events_cache"] = events_cache
+    password_hasher = PasswordHasher(iterations=PASSWORD_HASH_ITERATIONS, workers=PASSWORD_HASH_WORKERS)
+    atexit.register(password_hasher.close)
+    app.extensions["password_hasher"] = password_hasher
+    # Gambar kandidat diproses (validasi, resize, thumbnail) di worker pool, bukan di request
+    image_pipeline = ImagePipeline(
+        os.path.abspath(UPLOAD_FOLDER),
+        workers=IMAGE_WORKERS,
+        max_bytes=IMAGE_MAX_BYTES,
+        max_dimension=IMAGE_MAX_DIMENSION,
+        thumbnail_size=THUMBNAIL_SIZE,
+    )
+    atexit.register(image_pipeline.close)
+    app.extensions["image_pipeline"] = image_pipeline
+
+    # Notifikasi blok baru untuk observer stream SSE
+    chain_feed = ChainFeed()
+    app.extensions["chain_feed"] = chain_feed
+    stream_slots = StreamSlots(SSE_MAX_STREAMS)
+    app.extensions["stream_slots"] = stream_slots
+
+    # Pindah dari backend json: akun di users.json diimpor sekali (sebelum user default dibuat)
+    user_store.migrate_legacy(USERS_FILE)
+
+    def ensure_default_users() -> int:
+        """Buat user default yang belum ada; idempotent.
+
+        Jika semuanya sudah terdaftar (kasus normal saat restart) tidak ada
+        password yang di-hash, lock yang diambil, maupun file yang ditulis.
+        """
+        missing = [spec for spec in DEFAULT_USERS if user_store.find_user(spec[0]) is None]
+        if not missing:
+            return 0
+        with coordinator.lock("startup"):
+            # Worker lain mungkin sudah membuatnya selagi menunggu lock
+            missing = [spec for spec in missing if user_store.find_user(spec[0]) is None]
+            hashes = password_hasher.hash_many([password for _, password, _ in missing])
+            return user_store.add_users(
+                [
+                    {"username": username, "password": hashed, "role": role}
+                    for (username, _, role), hashed in zip(missing, hashes)
+                ]
+            )
 
-    # Pastikan file events.json ada
-    if not os.path.exists(EVENTS_FILE):
-        with open(EVENTS_FILE, "w", encoding="utf-8") as f:
-            json.dump([], f, indent=2)
-
-    # Pastikan file users.json ada, lalu pastikan user default (admin, user, attacker) tersedia
-    if not os.path.exists(USERS_FILE):
-        with open(USERS_FILE, "w", encoding="utf-8") as f:
-            json.dump([], f, indent=2, ensure_ascii=False)
-
-    # Tambahkan user default jika belum ada
-    try:
-        with open(USERS_FILE, "r", encoding="utf-8") as f:
-            existing_users = json.load(f)
-    except json.JSONDecodeError:
-        existing_users = []
-
-    def ensure_default_user(username: str, password: str, role: str) -> None:
-        nonlocal existing_users
-        for u in existing_users:
-            if u.get("username") == username:
-                return
-        existing_users.append({"username": username, "password": password, "role": role})
-
-    ensure_default_user("admin", "admin123", "admin")
-    ensure_default_user("user", "user123", "user")
-    ensure_default_user("attacker", "attacker123", "attacker")
-
-    with open(USERS_FILE, "w", encoding="utf-8") as f:
-        json.dump(existing_users, f, indent=2, ensure_ascii=False)
+    ensure_default_users()
 
     # ---------- Helper fungsi untuk blockchain & event ----------
 
     def load_events() -> List[Dict[str, Any]]:
-        """Membaca semua event dari file JSON."""
-        if not os.path.exists(EVENTS_FILE):
-            return []
-        with open(EVENTS_FILE, "r", encoding="utf-8") as f:
-            try:
-                return json.load(f)
-            except json.JSONDecodeError:
-                return []
-
-    def save_events(events: List[Dict[str, Any]]) -> None:
-        """Menyimpan semua event ke file JSON."""
-        with open(EVENTS_FILE, "w", encoding="utf-8") as f:
-            json.dump(events, f, indent=2, ensure_ascii=False)
-
-    def find_event(events: List[Dict[str, Any]], event_id: str) -> Dict[str, Any] | None:
-        """Mencari event berdasarkan event_id."""
-        for e in events:
-            if e.get("event_id") == event_id:
-                return e
-        return None
+        """Daftar semua event dari katalog (metadata saja, shard blockchain tidak dimuat)."""
+        return [dict(meta) for meta in events_cache.list_event_meta()]
+
+    def find_event(event_id: str) -> Dict[str, Any] | None:
+        """Mencari event berdasarkan event_id (dari cache, dibaca ulang hanya jika berubah)."""
+        return events_cache.get_event(event_id)
+
+    def find_event_meta(event_id: str) -> Dict[str, Any] | None:
+        """Metadata event saja, untuk route yang tidak butuh blockchain-nya."""
+        meta = events_cache.get_event_meta(event_id)
+        return dict(meta) if meta is not None else None
+
+    def load_event_meta_for_update(event_id: str) -> Dict[str, Any] | None:
+        """Metadata event langsung dari storage untuk read-modify-write (di bawah ``candidates_lock``).
+
+        Cache bisa tertinggal dari worker lain sampai ``CACHE_REVALIDATE_INTERVAL``,
+        jadi tidak dipakai di sini. Storage mengembalikan hasil parse baru, sehingga
+        dict bersarang (gambar, deskripsi) boleh diubah tanpa menyentuh milik cache.
+        """
+        return store.get_event_meta(event_id)
 
     def allowed_file(filename: str) -> bool:
         """Cek ekstensi file yang diizinkan untuk upload gambar."""
         return "." in filename and filename.rsplit(".", 1)[1].lower() in ALLOWED_EXTENSIONS
 
-    # ---------- Helper fungsi untuk users ----------
+    def candidates_lock(event_id: str):
+        """Lock read-modify-write data kandidat event (form admin vs. worker gambar)."""
+        return coordinator.lock(f"candidates-{event_id}")
 
-    def load_users() -> List[Dict[str, Any]]:
-        """Membaca semua user dari file JSON."""
-        if not os.path.exists(USERS_FILE):
-            return []
-        with open(USERS_FILE, "r", encoding="utf-8") as f:
-            try:
-                return json.load(f)
-            except json.JSONDecodeError:
-                return []
+    def media_lock():
+        """Lock file gambar: penghapusan file tidak terpakai vs. pencatatan gambar baru."""
+        return coordinator.lock("media")
 
-    def save_users(users: List[Dict[str, Any]]) -> None:
-        """Menyimpan semua user ke file JSON."""
-        with open(USERS_FILE, "w", encoding="utf-8") as f:
-            json.dump(users, f, indent=2, ensure_ascii=False)
+    def release_media(names: set) -> None:
+        """Hapus file gambar yang tidak lagi dirujuk event mana pun.
 
-    def find_user(username: str) -> Dict[str, Any] | None:
-        """Mencari user berdasarkan username."""
-        users = load_users()
-        for u in users:
-            if u.get("username") == username:
-                return u
-        return None
+        Nama berbasis hash isi bisa dipakai bersama beberapa event, jadi rujukan
+        dibaca ulang dari storage (bukan cache) di bawah lock media.
+        """
+        if not names:
+            return
+        with media_lock():
+            image_pipeline.remove(names - media_references(store.list_event_meta()))
 
-    def calculate_hash(index: int, timestamp: str, voter_id: str, candidate: str, previous_hash: str) -> str:
-        """Menghitung hash SHA-256 berdasarkan field blok."""
-        raw = f"{index}{timestamp}{voter_id}{candidate}{previous_hash}"
-        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
-
-    def create_genesis_block() -> Dict[str, Any]:
-        """Membuat genesis block untuk event baru."""
-        index = 0
-        timestamp = datetime.utcnow().isoformat()
-        voter_id = "GENESIS"
-        candidate = "-"
-        previous_hash = "0"
-        block_hash = calculate_hash(index, timestamp, voter_id, candidate, previous_hash)
-        return {
-            "index": index,
-            "timestamp": timestamp,
-            "voter_id": voter_id,
-            "candidate": candidate,
-            "previous_hash": previous_hash,
-            "hash": block_hash,
-        }
+    def queue_candidate_image(event_id: str, candidate: str, data: bytes) -> None:
+        """Antrekan gambar kandidat ke pipeline; metadata event diperbarui saat selesai.
 
-    def add_block_to_event(event: Dict[str, Any], voter_id: str, candidate: str) -> None:
-        """Menambahkan blok baru ke blockchain suatu event."""
-        chain = event.setdefault("blockchain", [])
-        if not chain:
-            # jika belum ada genesis (harusnya tidak terjadi untuk event valid)
-            chain.append(create_genesis_block())
-
-        last_block = chain[-1]
-        index = last_block["index"] + 1
-        timestamp = datetime.utcnow().isoformat()
-        previous_hash = last_block["hash"]
-        block_hash = calculate_hash(index, timestamp, voter_id, candidate, previous_hash)
-        new_block = {
-            "index": index,
-            "timestamp": timestamp,
-            "voter_id": voter_id,
-            "candidate": candidate,
-            "previous_hash": previous_hash,
-            "hash": block_hash,
-        }
-        chain.append(new_block)
+        File gambar lama kandidat tersebut dihapus jika tidak dipakai event lain.
+        """
+
+        def store_image(result) -> None:
+            with media_lock():
+                if not (image_pipeline.exists(result.image) and image_pipeline.exists(result.thumbnail)):
+                    # File dengan isi sama baru saja dihapus sebagai file tidak terpakai: tulis ulang
+                    result = image_pipeline.process(data)
+                new = {result.image, result.thumbnail}
+                with candidates_lock(event_id):
+                    meta = load_event_meta_for_update(event_id)
+                    if meta is None or candidate not in meta.get("candidates", []):
+                        release_media(new)
+                        return
+                    images = meta.setdefault("candidate_images", {})
+                    thumbnails = meta.setdefault("candidate_thumbnails", {})
+                    old = {images.get(candidate), thumbnails.get(candidate)} - {None}
+                    images[candidate] = result.image
+                    thumbnails[candidate] = result.thumbnail
+                    events_cache.save_event_meta(meta)
+                release_media(old - new)
+            coordinator.publish(CHANGED_META, event_id)
+
+        image_pipeline.submit(event_id, candidate, data, store_image)
+
+    # ---------- Helper fungsi untuk users ----------
+
+    def load_users() -> List[Dict[str, Any]]:
+        """Membaca semua user dari storage."""
+        return user_store.load_users()
+
+    def find_user(username: str) -> Dict[str, Any] | None:
+        """Mencari user berdasarkan username (index-backed pada backend sqlite)."""
+        return user_store.find_user(username)
 
     def has_user_voted(event: Dict[str, Any], username: str) -> bool:
         """Cek apakah user sudah pernah melakukan voting pada event ini.
 
-        Dicek pada seluruh blok (kecuali genesis) berdasarkan voter_id.
+        Memakai index voter_id per-event milik cache (O(1)), bukan scan seluruh blok.
         """
-        chain = event.get("blockchain", [])
-        for block in chain:
-            # Lewati genesis block
-            if block.get("index") == 0:
-                continue
-            if block.get("voter_id") == username:
-                return True
-        return False
+        return username in events_cache.get_voters(event["event_id"])
 
     def summarize_votes(event: Dict[str, Any]) -> Dict[str, Any]:
-        """Membuat ringkasan hasil voting untuk sebuah event.
+        """Ringkasan hasil voting (counts, total, winners) dari tally berjalan milik cache.
 
-        Menghasilkan:
-        - counts: dict kandidat -> jumlah suara
-        - total: total suara (tanpa genesis)
-        - winners: list kandidat dengan suara terbanyak (bisa lebih dari satu jika seri)
+        Tally diperbarui setiap blok ditambahkan, jadi tidak perlu menghitung ulang chain.
+        """
+        return summary_from_counts(event.get("candidates", []), events_cache.get_tally(event["event_id"]))
+
+    def add_blocks_to_event(event: Dict[str, Any], votes: List[tuple]) -> List[Dict[str, Any]]:
+        """Menambahkan beberapa blok (voter_id, candidate) berurutan ke blockchain event.
+
+        Semua blok dirangkai lalu disimpan dengan satu penulisan durable (group commit);
+        index voter dan tally milik cache ikut diperbarui pada saat yang sama.
         """
-        counts: Dict[str, int] = {c: 0 for c in event.get("candidates", [])}
         chain = event.get("blockchain", [])
-        for block in chain:
-            if block.get("index") == 0:
-                continue
-            cand = block.get("candidate")
-            if cand in counts:
-                counts[cand] += 1
-        total = sum(counts.values())
-        max_votes = max(counts.values()) if counts else 0
-        winners = [c for c, v in counts.items() if v == max_votes and max_votes > 0]
-        return {"counts": counts, "total": total, "winners": winners}
-
-    def is_chain_valid(chain: List[Dict[str, Any]]) -> bool:
-        """Validasi integritas blockchain."""
+        hasher = hasher_for(event)
+        new_blocks: List[Dict[str, Any]] = []
         if not chain:
-            return True
-
-        for i in range(1, len(chain)):
-            current = chain[i]
-            prev = chain[i - 1]
-            # cek previous_hash
-            if current.get("previous_hash") != prev.get("hash"):
-                return False
-            # cek perhitungan hash
-            recalculated = calculate_hash(
-                current.get("index"),
-                current.get("timestamp"),
-                current.get("voter_id"),
-                current.get("candidate"),
-                current.get("previous_hash"),
-            )
-            if recalculated != current.get("hash"):
-                return False
-        # Optionally: cek genesis block konsisten (index 0, previous_hash '0')
-        genesis = chain[0]
-        if genesis.get("index") != 0 or genesis.get("previous_hash") != "0":
-            return False
-        return True
+            # jika belum ada genesis (harusnya tidak terjadi untuk event valid)
+            new_blocks.append(create_genesis_block(hasher))
+
+        last_block = new_blocks[-1] if new_blocks else chain[-1]
+        for voter_id, candidate in votes:
+            last_block = make_block(last_block, voter_id, candidate, hasher)
+            new_blocks.append(last_block)
+        # Persist: cukup append baris baru ke log event, bukan menulis ulang semua event.
+        # Chain milik cache ikut diperbarui oleh cache (jangan di-extend di sini).
+        events_cache.append_blocks(event["event_id"], new_blocks)
+        chain_feed.notify_blocks(event["event_id"])
+        coordinator.publish(CHANGED_BLOCKS, event["event_id"])
+        return new_blocks[-len(votes):] if votes else []
+
+    def add_block_to_event(event: Dict[str, Any], voter_id: str, candidate: str) -> Dict[str, Any]:
+        """Menambahkan satu blok baru ke blockchain suatu event dan menyimpannya ke log."""
+        return add_blocks_to_event(event, [(voter_id, candidate)])[0]
+
+    # Satu writer per event: vote dari banyak thread request dirangkai berurutan
+    # dan disimpan per kelompok, jadi tidak ada vote yang hilang / chain bercabang.
+    def find_event_for_write(event_id: str) -> Dict[str, Any] | None:
+        """``find_event`` untuk writer (dipanggil di bawah lock event).
+
+        Di mode multi-worker worker lain mungkin baru saja menambah blok, jadi
+        cache disamakan dulu dengan storage agar blok baru tersambung ke ujung chain.
+        """
+        if coordinator.shared:
+            events_cache.refresh(event_id)
+        return find_event(event_id)
+
+    vote_writer = VoteWriter(
+        find_event_for_write,
+        has_user_voted,
+        add_blocks_to_event,
+        max_batch=VOTE_BATCH_MAX,
+        lock_factory=coordinator.event_lock,
+        idle_timeout=VOTE_WRITER_IDLE_TIMEOUT,
+    )
+    app.extensions["vote_writer"] = vote_writer
+
+    def apply_remote_change(kind: str, event_id: str | None) -> None:
+        """Perubahan dari worker lain: samakan cache & bangunkan stream SSE di worker ini."""
+        if kind == CHANGED_ALL or event_id is None:
+            events_cache.invalidate()
+        elif kind == CHANGED_BLOCKS:
+            events_cache.refresh(event_id)
+            chain_feed.notify_blocks(event_id)
+        elif kind == CHANGED_RESET:
+            events_cache.invalidate(event_id)
+            chain_feed.notify_reset(event_id)
+        else:
+            events_cache.refresh(event_id)
+
+    coordinator.subscribe(apply_remote_change)
+
+    # ---------- HTTP caching (ETag / Last-Modified) ----------
+
+    # ETag -> HTML halaman viewer blockchain yang sudah di-render (LRU)
+    rendered_pages: "OrderedDict[str, str]" = OrderedDict()
+    rendered_pages_lock = threading.Lock()
+
+    def event_validators(event_id: str, *variant: Any) -> tuple | None:
+        """(ETag, Last-Modified) sebuah respons event, atau None jika event tidak ada.
+
+        ETag = versi event (metadata + head chain, lihat ``EventCache.get_version``)
+        digabung ``variant``: apa pun selain event yang ikut menentukan isi respons
+        (user, halaman, parameter query). Last-Modified = waktu blok terakhir.
+        """
+        version = events_cache.get_version(event_id)
+        if version is None:
+            return None
+        token, head_timestamp = version
+        etag = hashlib.sha256(repr((token,) + variant).encode("utf-8")).hexdigest()[:32]
+        try:
+            last_modified = datetime.fromisoformat(head_timestamp).replace(tzinfo=timezone.utc)
+        except (TypeError, ValueError):
+            last_modified = None
+        return etag, last_modified
+
+    def with_validators(response: Response, validators: tuple) -> Response:
+        """Pasang ETag/Last-Modified; browser wajib revalidasi (isi bergantung user, jadi private)."""
+        etag, last_modified = validators
+        response.set_etag(etag)
+        if last_modified is not None:
+            response.last_modified = last_modified
+        response.cache_control.private = True
+        response.cache_control.no_cache = True
+        return response
+
+    def not_modified(validators: tuple) -> Response | None:
+        """Respons 304 jika salinan milik client masih berlaku, tanpa memuat atau me-render apa pun."""
+        if session.get("_flashes"):
+            # Ada pesan flash yang harus ditampilkan: render penuh
+            return None
+        etag, last_modified = validators
+        if is_resource_modified(request.environ, etag=etag, last_modified=last_modified):
+            return None
+        METRICS.inc("chainvote_http_not_modified_total", route=request.endpoint or "unknown")
+        return with_validators(Response(status=304), validators)
+
+    def render_cached(etag: str, template: str, **context: Any) -> str:
+        """``render_template`` dengan cache hasil render per ETag (jika tidak ada pesan flash)."""
+        cacheable = RENDER_CACHE_PAGES > 0 and not session.get("_flashes")
+        if cacheable:
+            with rendered_pages_lock:
+                html = rendered_pages.get(etag)
+                if html is not None:
+                    rendered_pages.move_to_end(etag)
+                    METRICS.inc("chainvote_render_cache_hits_total", template=template)
+                    return html
+        html = render_template(template, **context)
+        if cacheable:
+            with rendered_pages_lock:
+                rendered_pages[etag] = html
+                while len(rendered_pages) > RENDER_CACHE_PAGES:
+                    rendered_pages.popitem(last=False)
+        return html
 
     # ---------- Helper untuk autentikasi ----------
 
@@ -226,6 +453,80 @@ def create_app() -> Flask:
             return redirect(url_for("login"))
         return None
 
+    # ---------- Instrumentasi (metrik & profiling) ----------
+
+    # Profil request terakhir (ring buffer) saat profiling dinyalakan
+    recent_profiles: deque = deque(maxlen=PROFILE_HISTORY)
+
+    @app.before_request
+    def start_request_timer():
+        g.request_started = time.perf_counter()
+        if app.config["PROFILING"]:
+            g.profiler = cProfile.Profile()
+            g.profiler.enable()
+
+    @app.after_request
+    def record_request_metrics(response):
+        started = g.pop("request_started", None)
+        if started is not None:
+            elapsed = time.perf_counter() - started
+            METRICS.observe(
+                "chainvote_http_request_duration_seconds",
+                elapsed,
+                endpoint=request.endpoint or "unknown",
+                method=request.method,
+                status=response.status_code,
+            )
+        profiler = g.pop("profiler", None)
+        if profiler is not None:
+            profiler.disable()
+            output = io.StringIO()
+            pstats.Stats(profiler, stream=output).sort_stats("cumulative").print_stats(PROFILE_TOP_FUNCTIONS)
+            recent_profiles.append(
+                {
+                    "path": request.path,
+                    "method": request.method,
+                    "endpoint": request.endpoint,
+                    "duration_seconds": round(elapsed, 6) if started is not None else None,
+                    "recorded_at": datetime.utcnow().isoformat(),
+                    "stats": output.getvalue(),
+                }
+            )
+        return response
+
+    def start_template_timer(sender, template, context, **extra):
+        g.template_started = time.perf_counter()
+
+    def record_template_metrics(sender, template, context, **extra):
+        started = g.pop("template_started", None)
+        if started is not None:
+            METRICS.observe(
+                "chainvote_template_render_duration_seconds",
+                time.perf_counter() - started,
+                template=template.name or "unknown",
+            )
+
+    before_render_template.connect(start_template_timer, app, weak=False)
+    template_rendered.connect(record_template_metrics, app, weak=False)
+
+    # ---------- Warm-up & readiness ----------
+
+    # Request sudah dilayani sejak awal (cache terisi lazy); warm-up hanya mempercepat
+    # request pertama. Load balancer memakai /readyz untuk rolling restart.
+    readiness: Dict[str, Any] = {"ready": not WARMUP_ENABLED, "warmed_chains": 0, "error": None}
+    started_at = time.monotonic()
+
+    def warm_up() -> None:
+        """Isi index user & cache event di background, lalu tandai worker siap."""
+        try:
+            with METRICS.timer("chainvote_warmup_duration_seconds"):
+                user_store.find_user("")  # memuat index username (backend json)
+                readiness["warmed_chains"] = events_cache.warm()
+        except Exception as exc:  # cache tetap terisi lazy; jangan sampai worker tidak pernah siap
+            readiness["error"] = str(exc) or exc.__class__.__name__
+        readiness["ready"] = True
+        readiness["ready_after_seconds"] = round(time.monotonic() - started_at, 3)
+
     # ---------- Routes ----------
 
     @app.route("/login", methods=["GET", "POST"])
@@ -236,10 +537,15 @@ def create_app() -> Flask:
             password = request.form.get("password", "").strip()
 
             user_data = find_user(username)
-            if not user_data or user_data.get("password") != password:
+            if not user_data or not password_hasher.verify(password, user_data.get("password")):
                 flash("Username atau password salah.", "danger")
                 return redirect(url_for("login"))
 
+            # Password plain text lama / work factor lama -> simpan ulang dengan hash terbaru
+            if password_hasher.needs_rehash(user_data.get("password")):
+                user_data["password"] = password_hasher.hash(password)
+                user_store.update_user(user_data)
+
             # Simpan info user di session
             session["user"] = {"username": username, "role": user_data.get("role", "user")}
             flash(f"Berhasil login sebagai {username} ({user_data['role']}).", "success")
@@ -268,15 +574,16 @@ def create_app() -> Flask:
                 flash("Username sudah digunakan, silakan pilih yang lain.", "warning")
                 return redirect(url_for("register"))
 
-            users = load_users()
-            users.append(
+            added = user_store.add_user(
                 {
                     "username": username,
-                    "password": password,
+                    "password": password_hasher.hash(password),
                     "role": "user",  # user biasa
                 }
             )
-            save_users(users)
+            if not added:  # didaftarkan request lain di antara cek & simpan
+                flash("Username sudah digunakan, silakan pilih yang lain.", "warning")
+                return redirect(url_for("register"))
             flash("Registrasi berhasil! Silakan login.", "success")
             return redirect(url_for("login"))
 
@@ -295,12 +602,107 @@ def create_app() -> Flask:
             return redirect(url_for("index"))
 
         users = load_users()
-        # Jangan tampilkan password di UI (meski di file tetap plain text untuk demo)
+        # Jangan tampilkan hash password di UI
         safe_users = [
             {"username": u.get("username", ""), "role": u.get("role", "user")}
             for u in users
         ]
-        return render_template("admin_users.html", user=user, users=safe_users)
+        return render_template("admin_users.html", user=user, users=safe_users, import_max=USER_IMPORT_MAX)
+
+    @app.route("/admin/users/import", methods=["POST"])
+    def import_users():
+        """Impor user massal dari CSV (kolom ``username,password[,role]``, hanya admin).
+
+        Password di-hash paralel di worker pool lalu semua user baru disimpan
+        dengan satu kali tulis. Username yang sudah ada / duplikat dilewati.
+        """
+        need_login = login_required()
+        if need_login:
+            return need_login
+
+        user = get_current_user()
+        if not user or user.get("role") != "admin":
+            flash("Hanya admin yang dapat mengimpor user.", "danger")
+            return redirect(url_for("index"))
+
+        file = request.files.get("users_csv")
+        if not file or not file.filename:
+            flash("Pilih file CSV berisi daftar user.", "danger")
+            return redirect(url_for("admin_users"))
+        try:
+            text = file.read().decode("utf-8-sig")
+        except UnicodeDecodeError:
+            flash("File CSV harus berencoding UTF-8.", "danger")
+            return redirect(url_for("admin_users"))
+
+        rows = [row for row in csv.reader(io.StringIO(text)) if row and any(cell.strip() for cell in row)]
+        if rows and [cell.strip().lower() for cell in rows[0][:2]] == ["username", "password"]:
+            rows = rows[1:]  # baris header
+        if len(rows) > USER_IMPORT_MAX:
+            flash(f"Maksimum {USER_IMPORT_MAX} user per impor.", "danger")
+            return redirect(url_for("admin_users"))
+
+        candidates: List[Dict[str, Any]] = []
+        seen = set()
+        skipped = 0
+        for row in rows:
+            username = row[0].strip()
+            password = row[1].strip() if len(row) > 1 else ""
+            role = row[2].strip() if len(row) > 2 and row[2].strip() else "user"
+            if not username or not password or role not in ("user", "admin") or username in seen:
+                skipped += 1
+                continue
+            seen.add(username)
+            candidates.append({"username": username, "password": password, "role": role})
+
+        # Lewati user yang sudah ada sebelum menghitung hash (KDF mahal)
+        new_users = [u for u in candidates if not find_user(u["username"])]
+        skipped += len(candidates) - len(new_users)
+        hashes = password_hasher.hash_many([u["password"] for u in new_users])
+        for new_user, hashed in zip(new_users, hashes):
+            new_user["password"] = hashed
+        added = user_store.add_users(new_users) if new_users else 0
+        skipped += len(new_users) - added
+
+        flash(f"{added} user diimpor, {skipped} baris dilewati.", "success" if added else "warning")
+        return redirect(url_for("admin_users"))
+
+    @app.route("/admin/metrics")
+    def admin_metrics():
+        """Metrik dalam format teks Prometheus (hanya admin).
+
+        Panjang chain dilaporkan hanya untuk event yang sudah ada di cache agar
+        scrape tidak memicu pembacaan seluruh storage.
+        """
+        user = get_current_user()
+        if not user or user.get("role") != "admin":
+            return Response("forbidden\n", status=403, mimetype="text/plain")
+
+        METRICS.clear_gauge("chainvote_chain_length")
+        for cached_id, length in events_cache.cached_chain_lengths().items():
+            METRICS.set_gauge("chainvote_chain_length", length, event_id=cached_id)
+        METRICS.set_gauge("chainvote_sse_streams", stream_slots.active)
+        return Response(METRICS.render(), mimetype="text/plain; version=0.0.4")
+
+    @app.route("/admin/profiling", methods=["GET", "POST"])
+    def admin_profiling():
+        """Nyalakan/matikan profiling per request (POST) atau lihat profil terakhir (GET)."""
+        user = get_current_user()
+        if not user or user.get("role") != "admin":
+            return jsonify({"error": "Hanya admin yang dapat mengakses profiling."}), 403
+
+        if request.method == "POST":
+            enabled = request.form.get("enabled", request.args.get("enabled", ""))
+            app.config["PROFILING"] = enabled.lower() in ("1", "true", "on", "yes")
+            if not app.config["PROFILING"]:
+                recent_profiles.clear()
+        return jsonify({"enabled": app.config["PROFILING"], "profiles": list(recent_profiles)})
+
+    @app.route("/readyz")
+    def readyz():
+        """Readiness probe: 200 setelah warm-up selesai, 503 selama masih berjalan."""
+        body = {"status": "ready" if readiness["ready"] else "warming", **readiness}
+        return jsonify(body), 200 if readiness["ready"] else 503
 
     @app.route("/logout")
     def logout():
@@ -318,7 +720,6 @@ def create_app() -> Flask:
             return need_login
 
         user = get_current_user()
-        events = load_events()
 
         if request.method == "POST":
             name = request.form.get("name", "").strip()
@@ -338,6 +739,12 @@ def create_app() -> Flask:
                 flash("Hanya admin yang boleh membuat event.", "danger")
                 return redirect(url_for("index"))
 
+            hash_algorithm = request.form.get("hash_algorithm") or HASH_ALGORITHM
+            if hash_algorithm not in HASH_ALGORITHMS:
+                flash("Algoritma hash tidak dikenal.", "danger")
+                return redirect(url_for("index"))
+            settings = hash_settings(hash_algorithm)
+
             event_id = f"event-{int(datetime.utcnow().timestamp())}"
             created_at = datetime.utcnow().isoformat()
 
@@ -350,14 +757,120 @@ def create_app() -> Flask:
                 "candidate_images": {},
                 # mapping kandidat -> deskripsi, dikelola di halaman khusus admin
                 "candidate_descriptions": {},
-                "blockchain": [create_genesis_block()],
+                # skema hash blok event ini (versi encoding + algoritma)
+                **settings,
+                "blockchain": [create_genesis_block(hasher_for(settings))],
             }
-            events.append(new_event)
-            save_events(events)
+            events_cache.create_event(new_event)
+            coordinator.publish(CHANGED_META, event_id)
             flash("Event baru berhasil dibuat.", "success")
             return redirect(url_for("index"))
 
-        return render_template("index.html", events=events, user=user)
+        events = load_events()
+        return render_template(
+            "index.html",
+            events=events,
+            user=user,
+            hash_algorithms=sorted(HASH_ALGORITHMS),
+            default_hash_algorithm=HASH_ALGORITHM,
+        )
+
+    @app.route("/admin/events/bulk", methods=["POST"])
+    def provision_events():
+        """Provisioning event massal (hanya admin), semua event disimpan dalam satu write.
+
+        Body JSON: ``{"events": [{"name": ..., "candidates": [...],
+        "candidate_descriptions": {kandidat: teks}, "candidate_images": {kandidat: base64}}, ...]}``
+        (maksimal ``EVENT_BULK_MAX``). Semua entri divalidasi dulu; jika ada yang salah,
+        tidak ada event yang dibuat. Gambar diantrekan ke pipeline dan respons kembali
+        segera (202 jika ada gambar yang masih diproses).
+        """
+        need_login = login_required()
+        if need_login:
+            return need_login
+
+        user = get_current_user()
+        if not user or user.get("role") != "admin":
+            return jsonify({"error": "Hanya admin yang boleh membuat event."}), 403
+
+        payload = request.get_json(silent=True)
+        items = payload.get("events") if isinstance(payload, dict) else None
+        if not isinstance(items, list) or not items:
+            return jsonify({"error": "Body harus berupa JSON {\"events\": [...]}"}), 400
+        if len(items) > EVENT_BULK_MAX:
+            return jsonify({"error": f"Maksimum {EVENT_BULK_MAX} event per request."}), 413
+
+        errors = []
+        new_events = []
+        uploads = []
+        existing_ids = {meta.get("event_id") for meta in events_cache.list_event_meta()}
+        stamp = int(datetime.utcnow().timestamp())
+        created_at = datetime.utcnow().isoformat()
+        for position, item in enumerate(items):
+            if not isinstance(item, dict):
+                errors.append({"index": position, "error": "entri harus berupa objek"})
+                continue
+            name = str(item.get("name") or "").strip()
+            raw_candidates = item.get("candidates")
+            if isinstance(raw_candidates, str):
+                raw_candidates = raw_candidates.split(",")
+            candidates = [str(c).strip() for c in raw_candidates or [] if str(c).strip()]
+            if not name or not candidates:
+                errors.append({"index": position, "error": "nama event dan minimal satu kandidat wajib diisi"})
+                continue
+            descriptions = item.get("candidate_descriptions") or {}
+            images = item.get("candidate_images") or {}
+            if not isinstance(descriptions, dict) or not isinstance(images, dict):
+                errors.append({"index": position, "error": "candidate_descriptions/candidate_images harus berupa objek"})
+                continue
+            unknown = [c for c in list(descriptions) + list(images) if c not in candidates]
+            if unknown:
+                errors.append({"index": position, "error": f"kandidat tidak dikenal: {unknown[0]}"})
+                continue
+            hash_algorithm = item.get("hash_algorithm") or HASH_ALGORITHM
+            if hash_algorithm not in HASH_ALGORITHMS:
+                errors.append({"index": position, "error": f"algoritma hash tidak dikenal: {hash_algorithm}"})
+                continue
+            settings = hash_settings(hash_algorithm)
+
+            event_id = f"event-{stamp}-{position + 1}"
+            suffix = 1
+            while event_id in existing_ids:
+                suffix += 1
+                event_id = f"event-{stamp}-{position + 1}-{suffix}"
+            existing_ids.add(event_id)
+            try:
+                for cand, encoded in images.items():
+                    uploads.append((event_id, cand, base64.b64decode(encoded, validate=True)))
+            except (TypeError, ValueError, binascii.Error):
+                errors.append({"index": position, "error": "candidate_images harus berisi data base64"})
+                continue
+            new_events.append(
+                {
+                    "event_id": event_id,
+                    "name": name,
+                    "candidates": candidates,
+                    "created_at": created_at,
+                    "candidate_images": {},
+                    "candidate_descriptions": {c: str(d).strip() for c, d in descriptions.items() if str(d).strip()},
+                    **settings,
+                    "blockchain": [create_genesis_block(hasher_for(settings))],
+                }
+            )
+
+        if errors:
+            return jsonify({"error": "Tidak ada event yang dibuat.", "errors": errors}), 400
+
+        events_cache.create_events(new_events)
+        for event in new_events:
+            coordinator.publish(CHANGED_META, event["event_id"])
+        for event_id, cand, data in uploads:
+            queue_candidate_image(event_id, cand, data)
+        body = {
+            "created": [{"event_id": e["event_id"], "name": e["name"]} for e in new_events],
+            "images_queued": len(uploads),
+        }
+        return jsonify(body), 202 if uploads else 201
 
     @app.route("/event/<event_id>/delete", methods=["POST"])
     def delete_event(event_id: str):
@@ -371,17 +884,63 @@ def create_app() -> Flask:
             flash("Anda tidak memiliki hak untuk menghapus event.", "danger")
             return redirect(url_for("index"))
 
-        events = load_events()
-        new_events = [e for e in events if e.get("event_id") != event_id]
-
-        if len(new_events) == len(events):
+        meta = find_event_meta(event_id)
+        if meta is None or not events_cache.delete_event(event_id):
             flash("Event tidak ditemukan.", "warning")
         else:
-            save_events(new_events)
+            release_media(media_references([meta]))
+            chain_feed.notify_reset(event_id)
+            coordinator.publish(CHANGED_RESET, event_id)
             flash("Event berhasil dihapus.", "success")
 
         return redirect(url_for("index"))
 
+    @app.route("/event/<event_id>/close", methods=["POST"])
+    def close_event(event_id: str):
+        """Menutup event (hanya admin): voting dibekukan dan chain dipindah ke arsip.
+
+        Tally akhir, panjang chain, hash blok terakhir dan root Merkle dicatat
+        sebagai checkpoint di katalog & manifest arsip. Chain panas dihapus;
+        viewer, API blok dan ekspor CSV selanjutnya membaca dari arsip.
+        """
+        need_login = login_required()
+        if need_login:
+            return need_login
+
+        user = get_current_user()
+        if not user or user.get("role") != "admin":
+            flash("Hanya admin yang dapat menutup event.", "danger")
+            return redirect(url_for("index"))
+
+        # Di bawah lock writer: tidak ada vote yang bisa masuk selama arsip ditulis
+        with vote_writer.event_lock(event_id):
+            event = find_event_for_write(event_id)
+            if not event:
+                flash("Event tidak ditemukan.", "danger")
+                return redirect(url_for("index"))
+            if event.get("status") == "closed":
+                flash("Event sudah ditutup sebelumnya.", "info")
+                return redirect(url_for("view_blockchain", event_id=event_id))
+
+            chain = event.get("blockchain", [])
+            first_invalid = events_cache.check_chain(event_id)
+            summary = {
+                "closed_at": datetime.utcnow().isoformat(),
+                "final_tally": dict(events_cache.get_tally(event_id)),
+                "chain_length": len(chain),
+                "head_hash": chain[-1].get("hash") if chain else None,
+                "merkle_root": events_cache.get_merkle(event_id).root().hex(),
+                "chain_valid": first_invalid is None,
+            }
+            # Katalog ditulis ulang: jangan sampai gambar kandidat yang baru dicatat worker lain hilang
+            with candidates_lock(event_id):
+                events_cache.refresh(event_id)
+                events_cache.archive_event(event_id, summary)
+        chain_feed.notify_reset(event_id)
+        coordinator.publish(CHANGED_RESET, event_id)
+        flash(f"Event ditutup dan blockchain ({summary['chain_length']} blok) dipindahkan ke arsip.", "success")
+        return redirect(url_for("view_blockchain", event_id=event_id))
+
     @app.route("/event/<event_id>", methods=["GET", "POST"])
     def event_page(event_id: str):
         """Halaman voting untuk event tertentu."""
@@ -390,8 +949,7 @@ def create_app() -> Flask:
             return need_login
 
         user = get_current_user()
-        events = load_events()
-        event = find_event(events, event_id)
+        event = find_event_meta(event_id)
         if not event:
             flash("Event tidak ditemukan.", "danger")
             return redirect(url_for("index"))
@@ -402,11 +960,15 @@ def create_app() -> Flask:
                 flash("Admin tidak diperbolehkan melakukan voting. Gunakan akun user biasa untuk vote.", "warning")
                 return redirect(url_for("event_page", event_id=event_id))
 
+            if event.get("status") == "closed":
+                flash("Event sudah ditutup, voting tidak lagi diterima.", "warning")
+                return redirect(url_for("event_page", event_id=event_id))
+
             candidate = request.form.get("candidate")
             # voter_id diambil dari user yang sedang login
             voter_id = user.get("username", "anonymous") if user else "anonymous"
 
-            # Cegah user voting lebih dari satu kali di event yang sama
+            # Cek cepat sebelum antre; writer tetap memeriksa ulang secara berurutan
             if user and has_user_voted(event, user["username"]):
                 flash("Anda sudah memberikan suara pada event ini. Voting hanya boleh sekali.", "warning")
                 return redirect(url_for("event_page", event_id=event_id))
@@ -415,42 +977,388 @@ def create_app() -> Flask:
                 flash("Kandidat tidak valid.", "danger")
                 return redirect(url_for("event_page", event_id=event_id))
 
-            add_block_to_event(event, voter_id=voter_id, candidate=candidate)
-            save_events(events)
+            try:
+                vote_writer.submit(event_id, voter_id, candidate, timeout=VOTE_SUBMIT_TIMEOUT)
+            except VoteRejected as exc:
+                if exc.reason == VoteRejected.ALREADY_VOTED:
+                    flash("Anda sudah memberikan suara pada event ini. Voting hanya boleh sekali.", "warning")
+                elif exc.reason == VoteRejected.INVALID_CANDIDATE:
+                    flash("Kandidat tidak valid.", "danger")
+                elif exc.reason == VoteRejected.EVENT_CLOSED:
+                    flash("Event sudah ditutup, voting tidak lagi diterima.", "warning")
+                elif exc.reason == VoteRejected.INVALID_ENTRY:
+                    flash("Data vote tidak valid.", "danger")
+                else:
+                    flash("Event tidak ditemukan.", "danger")
+                    return redirect(url_for("index"))
+                return redirect(url_for("event_page", event_id=event_id))
+            except FutureTimeoutError:
+                # Commit lambat: vote tetap di antrean writer dan mungkin sudah tersimpan
+                flash(
+                    "Vote Anda masih diproses. Muat ulang halaman ini sebentar lagi untuk memeriksa "
+                    "apakah suara Anda sudah tercatat sebelum mencoba lagi.",
+                    "warning",
+                )
+                return redirect(url_for("event_page", event_id=event_id))
             flash("Vote berhasil direkam di blockchain.", "success")
             return redirect(url_for("event_page", event_id=event_id))
 
+        validators = event_validators(event_id, "event", user.get("username"), user.get("role"))
+        if validators is None:
+            flash("Event tidak ditemukan.", "danger")
+            return redirect(url_for("index"))
+        cached = not_modified(validators)
+        if cached is not None:
+            return cached
+
         # Untuk tampilan: informasi apakah user sudah pernah vote (hanya relevan untuk non-admin)
         already_voted = False
         if user and user.get("role") != "admin":
             already_voted = has_user_voted(event, user["username"])
-        return render_template("event.html", event=event, user=user, already_voted=already_voted)
+        html = render_template("event.html", event=event, user=user, already_voted=already_voted)
+        return with_validators(app.make_response(html), validators)
+
+    @app.route("/event/<event_id>/votes/batch", methods=["POST"])
+    def submit_vote_batch(event_id: str):
+        """API JSON upload vote massal dari TPS/kiosk (hanya admin).
+
+        Body: ``{"votes": [{"voter_id": "...", "candidate": "..."}, ...]}``.
+        Semua entri divalidasi sekaligus (kandidat & voter ganda lewat index),
+        lalu blok yang diterima dirangkai dan disimpan dengan satu penulisan durable.
+        Respons berisi hasil per entri sesuai urutan: diterima (+ index blok) atau ditolak (+ alasan).
+        """
+        need_login = login_required()
+        if need_login:
+            return need_login
+
+        user = get_current_user()
+        if not user or user.get("role") != "admin":
+            return jsonify({"error": "Hanya admin yang dapat mengunggah vote massal."}), 403
+
+        payload = request.get_json(silent=True)
+        votes = payload.get("votes") if isinstance(payload, dict) else None
+        if not isinstance(votes, list):
+            return jsonify({"error": "Body harus berupa JSON {\"votes\": [...]}."}), 400
+        if len(votes) > VOTE_UPLOAD_MAX:
+            return jsonify({"error": f"Maksimum {VOTE_UPLOAD_MAX} vote per request."}), 413
+
+        entries = [
+            (v.get("voter_id"), v.get("candidate")) if isinstance(v, dict) else (None, None)
+            for v in votes
+        ]
+        try:
+            results = vote_writer.submit_many(event_id, entries)
+        except VoteRejected as exc:
+            if exc.reason == VoteRejected.EVENT_CLOSED:
+                return jsonify({"error": "Event sudah ditutup."}), 409
+            return jsonify({"error": "Event tidak ditemukan."}), 404
+
+        for (voter_id, candidate), result in zip(entries, results):
+            result["voter_id"] = voter_id
+            result["candidate"] = candidate
+        accepted = sum(1 for r in results if r["accepted"])
+        return jsonify(
+            {
+                "event_id": event_id,
+                "accepted": accepted,
+                "rejected": len(results) - accepted,
+                "results": results,
+            }
+        )
 
     @app.route("/event/<event_id>/blockchain")
     def view_blockchain(event_id: str):
-        """Halaman untuk melihat blockchain suatu event."""
+        """Halaman untuk melihat blockchain suatu event.
+
+        Hanya satu halaman blok (``?page=N``) yang di-render; blok berikutnya dimuat
+        bertahap lewat API ``list_blocks``. Ringkasan & status validitas diambil dari
+        state incremental milik cache, jadi biaya halaman tidak bergantung panjang chain.
+        """
         need_login = login_required()
         if need_login:
             return need_login
 
         user = get_current_user()
-        events = load_events()
-        event = find_event(events, event_id)
+        page = max(1, request.args.get("page", 1, type=int))
+        # Versi event + user + halaman: 304 / hasil render tersimpan tanpa menyentuh blok
+        validators = event_validators(event_id, "blockchain", user.get("username"), user.get("role"), page)
+        if validators is None:
+            flash("Event tidak ditemukan.", "danger")
+            return redirect(url_for("index"))
+        cached = not_modified(validators)
+        if cached is not None:
+            return cached
+
+        event = find_event(event_id)
         if not event:
             flash("Event tidak ditemukan.", "danger")
             return redirect(url_for("index"))
 
         chain = event.get("blockchain", [])
-        valid = is_chain_valid(chain)
+        start = (page - 1) * BLOCKS_PAGE_SIZE
+        end = start + BLOCKS_PAGE_SIZE
+        # Validasi incremental: hanya blok setelah checkpoint terakhir yang di-hash ulang
+        first_invalid = events_cache.check_chain(event_id)
         summary = summarize_votes(event)
-        return render_template(
+        html = render_cached(
+            validators[0],
             "blockchain.html",
             event=event,
-            chain=chain,
-            is_valid=valid,
+            chain=chain[start:end],
+            chain_length=len(chain),
+            page=page,
+            page_size=BLOCKS_PAGE_SIZE,
+            next_start=end if end < len(chain) else None,
+            is_valid=first_invalid is None,
+            first_invalid=first_invalid,
             user=user,
             summary=summary,
         )
+        return with_validators(app.make_response(html), validators)
+
+    @app.route("/event/<event_id>/stream")
+    def stream_results(event_id: str):
+        """Stream SSE hasil voting: snapshot tally, lalu header blok + delta tally per vote.
+
+        Reconnect melanjutkan dari header ``Last-Event-ID`` (atau ``?last_index=``).
+        """
+        need_login = login_required()
+        if need_login:
+            return need_login
+
+        if events_cache.get_event_meta(event_id) is None:
+            return jsonify({"error": "Event tidak ditemukan."}), 404
+
+        last_index = request.headers.get("Last-Event-ID", request.args.get("last_index"))
+        try:
+            last_index = int(last_index) if last_index not in (None, "") else None
+        except ValueError:
+            last_index = None
+
+        if not stream_slots.acquire():
+            # Semua slot stream terpakai: thread sisanya untuk request biasa
+            METRICS.inc("chainvote_sse_rejected_total")
+            response = jsonify({"error": "Terlalu banyak stream terbuka, coba lagi nanti."})
+            response.status_code = 503
+            response.headers["Retry-After"] = str(int(SSE_HEARTBEAT))
+            return response
+
+        stream = stream_chain(
+            chain_feed,
+            event_id,
+            events_cache.get_chain,
+            events_cache.get_tally,
+            last_index=last_index,
+            heartbeat=SSE_HEARTBEAT,
+            max_duration=SSE_MAX_DURATION,
+            replay_max=SSE_REPLAY_MAX,
+        )
+        response = Response(
+            stream,
+            mimetype="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+        # Slot dilepas saat koneksi ditutup (juga jika generator belum sempat berjalan)
+        response.call_on_close(stream_slots.release)
+        return response
+
+    @app.route("/event/<event_id>/blocks")
+    def list_blocks(event_id: str):
+        """API JSON: blok-blok dengan index ``start`` .. ``start + limit - 1``."""
+        need_login = login_required()
+        if need_login:
+            return need_login
+
+        event = find_event(event_id)
+        if not event:
+            return jsonify({"error": "Event tidak ditemukan."}), 404
+
+        chain = event.get("blockchain", [])
+        start = max(0, request.args.get("start", 0, type=int))
+        limit = min(max(1, request.args.get("limit", BLOCKS_PAGE_SIZE, type=int)), BLOCKS_API_MAX_LIMIT)
+        end = start + limit
+        return jsonify(
+            {
+                "event_id": event_id,
+                "start": start,
+                "limit": limit,
+                "chain_length": len(chain),
+                "blocks": chain[start:end],
+                "next_start": end if end < len(chain) else None,
+            }
+        )
+
+    @app.route("/event/<event_id>/blockchain/verify", methods=["POST"])
+    def verify_blockchain(event_id: str):
+        """Verifikasi ulang seluruh chain dari genesis secara paralel (hanya admin)."""
+        need_login = login_required()
+        if need_login:
+            return need_login
+
+        user = get_current_user()
+        if not user or user.get("role") != "admin":
+            flash("Hanya admin yang dapat memverifikasi ulang blockchain.", "danger")
+            return redirect(url_for("view_blockchain", event_id=event_id))
+
+        event = find_event(event_id)
+        if not event:
+            flash("Event tidak ditemukan.", "danger")
+            return redirect(url_for("index"))
+
+        chain = event.get("blockchain", [])
+        with METRICS.timer("chainvote_chain_validation_duration_seconds", mode="full"):
+            report = verify_chain(chain, max_workers=AUDIT_WORKERS, hasher=hasher_for(event))
+        events_cache.record_verification(event_id, report["length"], report["first_invalid"])
+        if report["valid"]:
+            flash(f"Verifikasi penuh selesai: blockchain VALID ({report['length']} blok).", "success")
+        else:
+            flash(
+                "Verifikasi penuh selesai: blockchain TIDAK VALID. "
+                f"Blok rusak pertama: #{report['first_invalid']}, "
+                f"link putus: {len(report['broken_links'])}, "
+                f"hash tidak cocok: {len(report['hash_mismatches'])}.",
+                "danger",
+            )
+        return redirect(url_for("view_blockchain", event_id=event_id))
+
+    @app.route("/event/<event_id>/blockchain/audit")
+    def audit_blockchain(event_id: str):
+        """Laporan audit JSON: verifikasi penuh paralel + daftar semua kerusakan (hanya admin)."""
+        need_login = login_required()
+        if need_login:
+            return need_login
+
+        user = get_current_user()
+        if not user or user.get("role") != "admin":
+            return jsonify({"error": "Hanya admin yang dapat menjalankan audit."}), 403
+
+        event = find_event(event_id)
+        if not event:
+            return jsonify({"error": "Event tidak ditemukan."}), 404
+
+        chain = event.get("blockchain", [])
+        with METRICS.timer("chainvote_chain_validation_duration_seconds", mode="full"):
+            report = verify_chain(chain, max_workers=AUDIT_WORKERS, hasher=hasher_for(event))
+        events_cache.record_verification(event_id, report["length"], report["first_invalid"])
+        report["event_id"] = event_id
+        if event.get("status") == "closed":
+            # Event tertutup: bandingkan isi arsip dengan checkpoint yang dicatat saat ditutup
+            head_hash = chain[-1].get("hash") if chain else None
+            report["checkpoint"] = {
+                "closed_at": event.get("closed_at"),
+                "chain_length_matches": len(chain) == event.get("chain_length"),
+                "head_hash_matches": head_hash == event.get("head_hash"),
+                "merkle_root_matches": events_cache.get_merkle(event_id).root().hex() == event.get("merkle_root"),
+            }
+        return jsonify(report)
+
+    @app.route("/event/<event_id>/merkle")
+    def merkle_root(event_id: str):
+        """API JSON: root Merkle tree atas hash blok event (ukuran = panjang chain)."""
+        need_login = login_required()
+        if need_login:
+            return need_login
+
+        if events_cache.get_event_meta(event_id) is None:
+            return jsonify({"error": "Event tidak ditemukan."}), 404
+
+        tree = events_cache.get_merkle(event_id)
+        size = len(tree)
+        return jsonify({"event_id": event_id, "size": size, "root": tree.root(size).hex()})
+
+    @app.route("/event/<event_id>/merkle/proof")
+    def merkle_inclusion_proof(event_id: str):
+        """API JSON: bukti inklusi O(log n) untuk blok milik voter (default: user yang login).
+
+        Query opsional ``voter_id`` dan ``size`` (ukuran tree, default panjang chain saat ini).
+        Leaf = hash blok; cek dengan ``merkle.verify_inclusion``.
+        """
+        need_login = login_required()
+        if need_login:
+            return need_login
+
+        if events_cache.get_event_meta(event_id) is None:
+            return jsonify({"error": "Event tidak ditemukan."}), 404
+
+        voter_id = request.args.get("voter_id") or get_current_user().get("username")
+        position = events_cache.find_voter_block(event_id, voter_id)
+        if position is None:
+            return jsonify({"error": f"Voter '{voter_id}' belum memiliki blok pada event ini."}), 404
+
+        tree = events_cache.get_merkle(event_id)
+        size = request.args.get("size", len(tree), type=int)
+        try:
+            proof = tree.inclusion_proof(position, size)
+            root = tree.root(size)
+        except ValueError as exc:
+            return jsonify({"error": str(exc)}), 400
+
+        block = events_cache.get_chain(event_id)[position]
+        return jsonify(
+            {
+                "event_id": event_id,
+                "voter_id": voter_id,
+                "index": position,
+                "block": block,
+                "size": size,
+                "root": root.hex(),
+                "proof": [node.hex() for node in proof],
+            }
+        )
+
+    @app.route("/event/<event_id>/merkle/consistency")
+    def merkle_consistency_proof(event_id: str):
+        """API JSON: bukti konsistensi bahwa chain ukuran ``old`` adalah prefix chain ukuran ``new``."""
+        need_login = login_required()
+        if need_login:
+            return need_login
+
+        if events_cache.get_event_meta(event_id) is None:
+            return jsonify({"error": "Event tidak ditemukan."}), 404
+
+        tree = events_cache.get_merkle(event_id)
+        old_size = request.args.get("old", type=int)
+        new_size = request.args.get("new", len(tree), type=int)
+        if old_size is None:
+            return jsonify({"error": "Parameter 'old' wajib diisi."}), 400
+        try:
+            proof = tree.consistency_proof(old_size, new_size)
+            old_root, new_root = tree.root(old_size), tree.root(new_size)
+        except ValueError as exc:
+            return jsonify({"error": str(exc)}), 400
+        return jsonify(
+            {
+                "event_id": event_id,
+                "old_size": old_size,
+                "new_size": new_size,
+                "old_root": old_root.hex(),
+                "new_root": new_root.hex(),
+                "proof": [node.hex() for node in proof],
+            }
+        )
+
+    @app.route("/event/<event_id>/results")
+    def event_results(event_id: str):
+        """Endpoint JSON ringan: hasil voting terkini tanpa me-render blockchain."""
+        need_login = login_required()
+        if need_login:
+            return need_login
+
+        event = find_event(event_id)
+        if not event:
+            return jsonify({"error": "Event tidak ditemukan."}), 404
+
+        summary = summarize_votes(event)
+        return jsonify(
+            {
+                "event_id": event_id,
+                "name": event.get("name"),
+                "counts": summary["counts"],
+                "total": summary["total"],
+                "winners": summary["winners"],
+                "chain_length": len(event.get("blockchain", [])),
+            }
+        )
 
     @app.route("/event/<event_id>/candidates", methods=["GET", "POST"])
     def manage_candidates(event_id: str):
@@ -464,106 +1372,149 @@ def create_app() -> Flask:
             flash("Hanya admin yang dapat mengelola kandidat.", "danger")
             return redirect(url_for("index"))
 
-        events = load_events()
-        event = find_event(events, event_id)
+        event = find_event_meta(event_id)
         if not event:
             flash("Event tidak ditemukan.", "danger")
             return redirect(url_for("index"))
 
-        candidates = event.get("candidates", [])
-        candidate_images = event.setdefault("candidate_images", {})
-        candidate_descriptions = event.setdefault("candidate_descriptions", {})
-
         if request.method == "POST":
-            for idx, cand in enumerate(candidates):
-                desc_field = f"desc_{idx}"
-                file_field = f"img_{idx}"
-
-                # update deskripsi
-                desc_val = request.form.get(desc_field, "").strip()
-                if desc_val:
-                    candidate_descriptions[cand] = desc_val
-                else:
-                    # kalau dikosongkan, hapus deskripsi
-                    candidate_descriptions.pop(cand, None)
-
-                # update gambar jika ada file baru
-                file = request.files.get(file_field)
-                if file and file.filename:
-                    if not allowed_file(file.filename):
-                        flash(f"File gambar untuk kandidat '{cand}' tidak didukung.", "warning")
+            uploads = []
+            with candidates_lock(event_id):
+                # Baca ulang di bawah lock: worker gambar bisa saja baru memperbarui metadata
+                event = load_event_meta_for_update(event_id)
+                if event is None:
+                    flash("Event tidak ditemukan.", "danger")
+                    return redirect(url_for("index"))
+                candidate_descriptions = event.setdefault("candidate_descriptions", {})
+                for idx, cand in enumerate(event.get("candidates", [])):
+                    desc_field = f"desc_{idx}"
+                    file_field = f"img_{idx}"
+
+                    # update deskripsi
+                    desc_val = request.form.get(desc_field, "").strip()
+                    if desc_val:
+                        candidate_descriptions[cand] = desc_val
                     else:
-                        filename_raw = secure_filename(file.filename)
-                        ext = filename_raw.rsplit(".", 1)[1].lower()
-                        safe_cand = "".join(ch for ch in cand if ch.isalnum() or ch in ("-", "_")).strip("_")
-                        unique_name = f"{event_id}_{safe_cand}.{ext}"
-                        save_path = os.path.join(app.config["UPLOAD_FOLDER"], unique_name)
-                        file.save(save_path)
-                        candidate_images[cand] = unique_name
-
-            save_events(events)
-            flash("Data kandidat berhasil diperbarui.", "success")
+                        # kalau dikosongkan, hapus deskripsi
+                        candidate_descriptions.pop(cand, None)
+
+                    # gambar baru hanya dibaca di sini; validasi & resize di worker pool
+                    file = request.files.get(file_field)
+                    if file and file.filename:
+                        if not allowed_file(file.filename):
+                            flash(f"File gambar untuk kandidat '{cand}' tidak didukung.", "warning")
+                        else:
+                            uploads.append((cand, file.read()))
+
+                events_cache.save_event_meta(event)
+            coordinator.publish(CHANGED_META, event_id)
+            for cand, data in uploads:
+                queue_candidate_image(event_id, cand, data)
+            if uploads:
+                flash(f"Data kandidat disimpan; {len(uploads)} gambar sedang diproses di background.", "success")
+            else:
+                flash("Data kandidat berhasil diperbarui.", "success")
             return redirect(url_for("manage_candidates", event_id=event_id))
 
         return render_template(
             "manage_candidates.html",
             event=event,
-            candidates=candidates,
-            candidate_images=candidate_images,
-            candidate_descriptions=candidate_descriptions,
+            candidates=event.get("candidates", []),
+            candidate_images=event.get("candidate_thumbnails") or event.get("candidate_images", {}),
+            candidate_descriptions=event.get("candidate_descriptions", {}),
+            image_status=image_pipeline.status(event_id),
             user=user,
         )
 
+    @app.route("/media/<path:filename>")
+    def candidate_media(filename: str):
+        """Gambar kandidat. Nama berbasis hash isi di-cache browser selamanya (immutable)."""
+        if not is_content_addressed(filename):
+            # Upload lama (nama per kandidat, isinya bisa diganti): tanpa cache panjang
+            return send_from_directory(image_pipeline.upload_dir, filename, max_age=0)
+        response = send_from_directory(image_pipeline.upload_dir, filename, max_age=MEDIA_MAX_AGE)
+        response.cache_control.immutable = True
+        return response
+
     @app.route("/event/<event_id>/blockchain/export_csv")
     def export_blockchain_csv(event_id: str):
-        """Ekspor data blockchain (tanpa genesis) menjadi file CSV untuk Excel/analisis."""
+        """Ekspor data blockchain (tanpa genesis) menjadi file CSV untuk Excel/analisis.
+
+        CSV di-stream baris demi baris langsung dari log blok event (memori konstan).
+        Query opsional:
+        - ``start`` / ``end``: hanya blok dengan index di rentang ini (inklusif)
+        - ``compress=gzip``: unduh sebagai ``.csv.gz``
+        """
         need_login = login_required()
         if need_login:
             return need_login
 
-        events = load_events()
-        event = find_event(events, event_id)
+        # Cukup metadata; blok dibaca langsung dari storage saat streaming
+        event = events_cache.get_event_meta(event_id)
         if not event:
             flash("Event tidak ditemukan.", "danger")
             return redirect(url_for("index"))
 
-        chain = event.get("blockchain", [])
-        # Bangun CSV secara manual
-        import csv
-        import io
-
-        output = io.StringIO()
-        writer = csv.writer(output)
-        # Header
-        writer.writerow(
-            ["event_id", "event_name", "index", "timestamp", "voter_id", "candidate", "previous_hash", "hash"]
-        )
-        # Data (skip genesis block)
-        for block in chain:
-            if block.get("index") == 0:
-                continue
+        start = max(1, request.args.get("start", 1, type=int))
+        end = request.args.get("end", type=int)
+        use_gzip = request.args.get("compress") == "gzip"
+        event_name = event.get("name")
+        # Isi CSV hanya bergantung versi event & rentang: 304 tanpa membaca blok
+        validators = event_validators(event_id, "csv", start, end, use_gzip)
+        cached = not_modified(validators) if validators is not None else None
+        if cached is not None:
+            return cached
+
+        def generate_rows():
+            output = io.StringIO()
+            writer = csv.writer(output)
+            # Header
             writer.writerow(
-                [
-                    event.get("event_id"),
-                    event.get("name"),
-                    block.get("index"),
-                    block.get("timestamp"),
-                    block.get("voter_id"),
-                    block.get("candidate"),
-                    block.get("previous_hash"),
-                    block.get("hash"),
-                ]
+                ["event_id", "event_name", "index", "timestamp", "voter_id", "candidate", "previous_hash", "hash"]
             )
-
-        csv_data = output.getvalue()
-        output.close()
+            stop = end + 1 if end is not None else None
+            # Data (skip genesis block)
+            for count, block in enumerate(store.iter_blocks(event_id, start, stop), 1):
+                writer.writerow(
+                    [
+                        event_id,
+                        event_name,
+                        block.get("index"),
+                        block.get("timestamp"),
+                        block.get("voter_id"),
+                        block.get("candidate"),
+                        block.get("previous_hash"),
+                        block.get("hash"),
+                    ]
+                )
+                if count % CSV_STREAM_ROWS == 0:
+                    yield output.getvalue()
+                    output.seek(0)
+                    output.truncate(0)
+            yield output.getvalue()
+
+        def generate_gzip():
+            compressor = zlib.compressobj(wbits=31)  # wbits=31 -> format gzip
+            for chunk in generate_rows():
+                data = compressor.compress(chunk.encode("utf-8"))
+                if data:
+                    yield data
+            yield compressor.flush()
 
         filename = f"{event.get('event_id', 'event')}_blockchain.csv"
-        return Response(
-            csv_data,
-            mimetype="text/csv",
-            headers={"Content-Disposition": f"attachment; filename={filename}"},
-        )
+        if use_gzip:
+            response = Response(
+                generate_gzip(),
+                mimetype="application/gzip",
+                headers={"Content-Disposition": f"attachment; filename={filename}.gz"},
+            )
+        else:
+            response = Response(
+                generate_rows(),
+                mimetype="text/csv",
+                headers={"Content-Disposition": f"attachment; filename={filename}"},
+            )
+        return with_validators(response, validators) if validators is not None else response
 
     @app.route("/event/<event_id>/block/<int:block_index>/tamper", methods=["GET", "POST"])
     def tamper_block(event_id: str, block_index: int):
@@ -583,12 +1534,15 @@ def create_app() -> Flask:
             flash("Hanya user attacker yang boleh memodifikasi blok (demo serangan).", "danger")
             return redirect(url_for("view_blockchain", event_id=event_id))
 
-        events = load_events()
-        event = find_event(events, event_id)
+        event = find_event(event_id)
         if not event:
             flash("Event tidak ditemukan.", "danger")
             return redirect(url_for("index"))
 
+        if event.get("status") == "closed":
+            flash("Event sudah ditutup; blockchain-nya tersimpan di arsip dan tidak bisa dimodifikasi.", "warning")
+            return redirect(url_for("view_blockchain", event_id=event_id))
+
         chain = event.get("blockchain", [])
         # Pastikan index valid dan bukan genesis block
         if block_index < 1 or block_index >= len(chain):
@@ -612,26 +1566,31 @@ def create_app() -> Flask:
                 block["voter_id"] = new_voter_id
 
             # Hitung ulang hash blok ini saja (tidak menyentuh blok berikutnya)
-            block["hash"] = calculate_hash(
-                block["index"],
-                block["timestamp"],
-                block["voter_id"],
-                block["candidate"],
-                block["previous_hash"],
-            )
-
-            save_events(events)
+            block["hash"] = hasher_for(event).block_hash(block)
+
+            # Di bawah lock writer: chain dibaca ulang (mungkin sudah bertambah) lalu ditulis
+            # ulang sebagai salinan. Objek chain milik cache (CompactChain / shard mmap) tidak
+            # pernah diubah langsung, jadi tidak bertabrakan dengan vote yang sedang di-commit.
+            with vote_writer.event_lock(event_id):
+                tampered = list(events_cache.get_chain(event_id))
+                if block_index >= len(tampered):
+                    flash("Blok tidak ditemukan.", "warning")
+                    return redirect(url_for("view_blockchain", event_id=event_id))
+                tampered[block_index] = block
+                events_cache.replace_chain(event_id, tampered, modified_index=block_index)
+            chain_feed.notify_reset(event_id)
+            coordinator.publish(CHANGED_RESET, event_id)
             flash("Blok berhasil dimodifikasi oleh attacker. Chain kemungkinan menjadi INVALID.", "warning")
             return redirect(url_for("view_blockchain", event_id=event_id))
 
         return render_template("tamper_block.html", event=event, block=block, user=user)
 
+    if WARMUP_ENABLED:
+        threading.Thread(target=warm_up, name="chainvote-warmup", daemon=True).start()
     return app
 
 
 if __name__ == "__main__":
     app = create_app()
-    # debug=True untuk demo di kelas, bisa dimatikan untuk produksi
-    app.run(host="0.0.0.0", port=5000, debug=True)
-
-
+    # Server development Flask; debugger interaktif (bisa menjalankan kode) hanya jika CHAINVOTE_DEBUG=1
+    app.run(host="0.0.0.0", port=5000, debug=os.environ.get("CHAINVOTE_DEBUG") == "1")
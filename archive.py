@@ -0,0 +1,258 @@
+"""Arsip chain untuk event yang sudah ditutup.
+
+Saat event ditutup, chain-nya dipindahkan dari storage "panas" ke dua file di
+folder arsip:
+
+- ``<event_id>.jsonl.gz``: blok JSON Lines terkompresi gzip, dipotong per
+  ``chunk_blocks`` blok; setiap potongan adalah member gzip tersendiri
+  sehingga file tetap bisa dibuka ``gunzip`` biasa, tetapi blok ke-N bisa
+  dibaca dengan seek ke member-nya tanpa mendekompresi bagian sebelumnya.
+- ``<event_id>.json``: manifest (jumlah blok, offset byte tiap member) dan
+  ringkasan saat ditutup (tally akhir, hash blok terakhir, root Merkle).
+
+``ChainArchive`` bersifat read-only dengan antarmuka seperti ``ChainFile``
+(``len()``, ``chain[i]`` / ``chain[a:b]``, iterasi, ``iter_range``,
+``find_invalid``, ``tally``, ``voters``, ``find_voter``), jadi viewer, API
+blok, ekspor CSV dan audit membacanya langsung dari arsip.
+"""
+
+import json
+import os
+import threading
+import zlib
+from typing import Any, Dict, Iterable, Iterator, List, Set
+
+from hashing import LEGACY_HASHER, BlockHasher
+
+FORMAT_VERSION = 1
+DATA_EXTENSION = ".jsonl.gz"
+MANIFEST_EXTENSION = ".json"
+DEFAULT_CHUNK_BLOCKS = 1000
+
+
+def _temp_path(path: str) -> str:
+    """Nama file sementara unik per proses & thread (beberapa worker berbagi folder arsip)."""
+    return f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+
+
+class ChainArchiveError(Exception):
+    """Arsip tidak valid, atau operasi tulis pada arsip (read-only)."""
+
+
+def archive_paths(archive_dir: str, event_id: str) -> tuple:
+    """(path data gzip, path manifest) arsip sebuah event."""
+    base = os.path.join(archive_dir, event_id)
+    return f"{base}{DATA_EXTENSION}", f"{base}{MANIFEST_EXTENSION}"
+
+
+class ChainArchive:
+    """Chain event yang sudah diarsipkan (read-only, dibaca per potongan gzip)."""
+
+    def __init__(self, data_path: str, manifest: Dict[str, Any]) -> None:
+        if manifest.get("format") != FORMAT_VERSION:
+            raise ChainArchiveError(f"{data_path}: format arsip tidak dikenal")
+        self.path = data_path
+        self.manifest = manifest
+        self._length: int = manifest["chain_length"]
+        self._chunk_blocks: int = manifest["chunk_blocks"]
+        self._offsets: List[int] = manifest["offsets"]
+        self._lock = threading.Lock()
+        # Potongan terakhir yang didekompresi (akses berurutan / halaman viewer)
+        self._cached_chunk: tuple = (-1, [])
+        self._index: tuple | None = None
+
+    @classmethod
+    def open(cls, archive_dir: str, event_id: str) -> "ChainArchive | None":
+        """Buka arsip event, atau None jika event belum diarsipkan."""
+        data_path, manifest_path = archive_paths(archive_dir, event_id)
+        if not os.path.exists(manifest_path):
+            return None
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            return cls(data_path, json.load(f))
+
+    @classmethod
+    def write(
+        cls,
+        archive_dir: str,
+        event_id: str,
+        blocks: Iterable[Dict[str, Any]],
+        summary: Dict[str, Any],
+        chunk_blocks: int = DEFAULT_CHUNK_BLOCKS,
+    ) -> Dict[str, Any]:
+        """Tulis arsip (atomik: file sementara lalu rename) dan kembalikan manifest-nya."""
+        os.makedirs(archive_dir, exist_ok=True)
+        data_path, manifest_path = archive_paths(archive_dir, event_id)
+        chunk_blocks = max(1, chunk_blocks)
+        offsets: List[int] = []
+        count = 0
+        tmp_path = _temp_path(data_path)
+        with open(tmp_path, "wb") as f:
+            lines: List[str] = []
+
+            def flush_chunk() -> None:
+                offsets.append(f.tell())
+                compressor = zlib.compressobj(9, zlib.DEFLATED, 31)  # wbits=31 -> member gzip
+                f.write(compressor.compress("".join(lines).encode("utf-8")) + compressor.flush())
+                lines.clear()
+
+            for block in blocks:
+                lines.append(json.dumps(block, ensure_ascii=False, separators=(",", ":")) + "\n")
+                count += 1
+                if len(lines) == chunk_blocks:
+                    flush_chunk()
+            if lines:
+                flush_chunk()
+            f.flush()
+            os.fsync(f.fileno())
+            size = f.tell()
+        os.replace(tmp_path, data_path)
+
+        manifest = {
+            "format": FORMAT_VERSION,
+            "event_id": event_id,
+            "chain_length": count,
+            "chunk_blocks": chunk_blocks,
+            "offsets": offsets,
+            "compressed_bytes": size,
+            "summary": summary,
+        }
+        tmp_path = _temp_path(manifest_path)
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, manifest_path)
+        return manifest
+
+    @staticmethod
+    def remove(archive_dir: str, event_id: str) -> None:
+        for path in archive_paths(archive_dir, event_id):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    @property
+    def summary(self) -> Dict[str, Any]:
+        return self.manifest.get("summary", {})
+
+    # ---------- Baca ----------
+
+    def _chunk(self, number: int) -> List[Dict[str, Any]]:
+        """Blok-blok dalam satu member gzip (hasil terakhir disimpan)."""
+        with self._lock:
+            cached_number, cached_blocks = self._cached_chunk
+            if cached_number == number:
+                return cached_blocks
+        start = self._offsets[number]
+        end = self._offsets[number + 1] if number + 1 < len(self._offsets) else None
+        with open(self.path, "rb") as f:
+            f.seek(start)
+            data = f.read() if end is None else f.read(end - start)
+        text = zlib.decompressobj(31).decompress(data).decode("utf-8")
+        blocks = [json.loads(line) for line in text.splitlines() if line]
+        with self._lock:
+            self._cached_chunk = (number, blocks)
+        return blocks
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __bool__(self) -> bool:
+        return self._length > 0
+
+    def _position(self, index: int) -> int:
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("chain index out of range")
+        return index
+
+    def block(self, position: int) -> Dict[str, Any]:
+        chunk = self._chunk(position // self._chunk_blocks)
+        return dict(chunk[position % self._chunk_blocks])
+
+    def __getitem__(self, key: int | slice) -> Any:
+        if isinstance(key, slice):
+            start, stop, step = key.indices(self._length)
+            if step != 1:
+                return [self.block(i) for i in range(start, stop, step)]
+            return list(self.iter_range(start, stop))
+        return self.block(self._position(key))
+
+    def __setitem__(self, key: int, block: Dict[str, Any]) -> None:
+        raise ChainArchiveError("chain event yang sudah diarsipkan tidak bisa diubah")
+
+    def append_blocks(self, blocks: List[Dict[str, Any]]) -> None:
+        raise ChainArchiveError("event sudah ditutup; blok baru tidak bisa ditambahkan")
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return self.iter_range(0, None)
+
+    def iter_range(self, start: int = 0, stop: int | None = None) -> Iterator[Dict[str, Any]]:
+        """Blok posisi ``start`` .. ``stop - 1``; hanya member gzip yang relevan yang didekompresi."""
+        stop = self._length if stop is None else min(stop, self._length)
+        position = max(0, start)
+        while position < stop:
+            number, offset = divmod(position, self._chunk_blocks)
+            for block in self._chunk(number)[offset : offset + stop - position]:
+                yield dict(block)
+                position += 1
+
+    # ---------- Validasi & index (satu kali lewat arsip) ----------
+
+    def find_invalid(self, start: int = 0, hasher: BlockHasher = LEGACY_HASHER) -> int | None:
+        """Seperti ``blockchain.find_invalid_block``, membaca arsip per potongan gzip.
+
+        Hash satu potongan dihitung ulang sekaligus lewat ``hasher.hash_many``.
+        """
+        if not self._length:
+            return None
+        if start <= 0:
+            genesis = self.block(0)
+            if genesis.get("index") != 0 or genesis.get("previous_hash") != "0":
+                return 0
+            start = 1
+        if start >= self._length:
+            return None
+        previous_hash = self.block(start - 1).get("hash")
+        position = start
+        while position < self._length:
+            number, offset = divmod(position, self._chunk_blocks)
+            blocks = self._chunk(number)[offset:]
+            recalculated = hasher.hash_many(
+                (b.get("index"), b.get("timestamp"), b.get("voter_id"), b.get("candidate"), b.get("previous_hash"))
+                for b in blocks
+            )
+            for current, expected in zip(blocks, recalculated):
+                if current.get("previous_hash") != previous_hash or expected != current.get("hash"):
+                    return position
+                previous_hash = current.get("hash")
+                position += 1
+        return None
+
+    def _scan(self) -> tuple:
+        if self._index is None:
+            voters: Set[Any] = set()
+            tally: Dict[str, int] = {}
+            for block in self:
+                if block.get("index") == 0:
+                    continue
+                voters.add(block.get("voter_id"))
+                candidate = block.get("candidate")
+                tally[candidate] = tally.get(candidate, 0) + 1
+            self._index = (voters, tally)
+        return self._index
+
+    def tally(self) -> Dict[str, int]:
+        """Hitungan suara per kandidat, dihitung dari isi arsip (bukan dari ringkasan)."""
+        return dict(self._scan()[1])
+
+    def voters(self) -> Set[Any]:
+        return set(self._scan()[0])
+
+    def find_voter(self, voter_id: Any) -> int | None:
+        for position, block in enumerate(self):
+            if block.get("index") != 0 and block.get("voter_id") == voter_id:
+                return position
+        return None
@@ -0,0 +1,353 @@
+"""Benchmark & load test jalur panas ChainVote.
+
+Membuat fixture sintetis ``events.json`` (format lama, dimigrasi otomatis saat
+start) dan ``users.json`` di direktori sementara, lalu menjalankan
+``create_app()`` dengan Flask test client dan mengukur:
+
+- HTTP: login, vote POST, halaman blockchain, ekspor CSV, endpoint hasil JSON
+- fungsi inti lewat jalur yang sama dengan aplikasi: validasi chain (penuh
+  dari genesis vs checkpoint incremental), ringkasan hasil dari tally cache,
+  cek voter lewat index voter cache, dan hash ulang satu chain lewat
+  ``hash_many`` skema v2
+- mode voter bersamaan (``--concurrency``): banyak thread vote sekaligus lalu
+  dicek apakah ada vote yang hilang atau voter yang tercatat dua kali
+
+Hasil berupa throughput dan latensi p50/p95/p99; ``--json`` menulis hasil
+dalam format JSON agar run sebelum/sesudah perubahan bisa dibandingkan.
+
+Contoh:
+
+    python benchmark.py --events 5 --chain-length 20000 --users 2000 --json bench_output.txt
+"""
+
+import argparse
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from typing import Any, Callable, Dict, List
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, BASE_DIR)
+
+import app as chainvote  # noqa: E402
+from blockchain import create_genesis_block, is_chain_valid, make_block, summary_from_counts  # noqa: E402
+from hashing import CURRENT_VERSION, get_hasher  # noqa: E402
+from storage_sqlite import SqliteUserStore  # noqa: E402
+
+
+# ---------- Statistik ----------
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Persentil nearest-rank dari list yang sudah terurut."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, int(round(pct / 100.0 * len(sorted_values))))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def summarize_timings(timings: List[float], wall_time: float | None = None) -> Dict[str, Any]:
+    """Ringkasan latensi (ms) dan throughput (operasi/detik)."""
+    values = sorted(timings)
+    total = wall_time if wall_time is not None else sum(values)
+    return {
+        "count": len(values),
+        "total_s": round(total, 6),
+        "throughput_per_s": round(len(values) / total, 2) if total > 0 else None,
+        "mean_ms": round(sum(values) / len(values) * 1000, 3) if values else 0.0,
+        "p50_ms": round(percentile(values, 50) * 1000, 3),
+        "p95_ms": round(percentile(values, 95) * 1000, 3),
+        "p99_ms": round(percentile(values, 99) * 1000, 3),
+    }
+
+
+def time_calls(fn: Callable[[int], Any], iterations: int) -> Dict[str, Any]:
+    """Jalankan ``fn(i)`` sebanyak ``iterations`` kali dan ukur latensinya."""
+    timings = []
+    start_all = time.perf_counter()
+    for i in range(iterations):
+        start = time.perf_counter()
+        fn(i)
+        timings.append(time.perf_counter() - start)
+    return summarize_timings(timings, time.perf_counter() - start_all)
+
+
+# ---------- Fixture ----------
+
+
+def build_fixtures(data_dir: str, events: int, chain_length: int, users: int, candidates: int, seed: int) -> Dict:
+    """Tulis ``events.json`` dan ``users.json`` sintetis ke ``data_dir``."""
+    rng = random.Random(seed)
+    candidate_names = [f"Kandidat {i + 1}" for i in range(candidates)]
+    event_list = []
+    for e in range(events):
+        chain = [create_genesis_block()]
+        for i in range(chain_length):
+            chain.append(make_block(chain[-1], f"voter-{e}-{i}", rng.choice(candidate_names)))
+        event_list.append(
+            {
+                "event_id": f"bench-event-{e}",
+                "name": f"Benchmark Event {e}",
+                "candidates": candidate_names,
+                "created_at": chain[0]["timestamp"],
+                "candidate_images": {},
+                "candidate_descriptions": {},
+                "blockchain": chain,
+            }
+        )
+    user_list = [{"username": f"bench-user-{i}", "password": f"pw-{i}", "role": "user"} for i in range(users)]
+    user_list.append({"username": "admin", "password": "admin123", "role": "admin"})
+
+    with open(os.path.join(data_dir, chainvote.EVENTS_FILE), "w", encoding="utf-8") as f:
+        json.dump(event_list, f, ensure_ascii=False)
+    with open(os.path.join(data_dir, chainvote.USERS_FILE), "w", encoding="utf-8") as f:
+        json.dump(user_list, f, ensure_ascii=False)
+    return {"events": event_list, "users": user_list, "candidates": candidate_names}
+
+
+# ---------- Benchmark ----------
+
+
+def login_client(app, username: str, password: str):
+    client = app.test_client()
+    resp = client.post("/login", data={"username": username, "password": password})
+    if resp.status_code != 302 or "/login" in resp.headers.get("Location", ""):
+        raise RuntimeError(f"login gagal untuk {username}")
+    return client
+
+
+def run_benchmarks(args: argparse.Namespace) -> Dict[str, Any]:
+    data_dir = tempfile.mkdtemp(prefix="chainvote-bench-")
+    old_cwd = os.getcwd()
+    results: Dict[str, Any] = {}
+    try:
+        os.chdir(data_dir)
+        t0 = time.perf_counter()
+        fixtures = build_fixtures(
+            data_dir, args.events, args.chain_length, args.users, args.candidates, args.seed
+        )
+        fixture_time = time.perf_counter() - t0
+
+        chainvote.STORAGE_BACKEND = args.backend
+        if args.backend == "sqlite":
+            # events.json dimigrasi otomatis, tetapi user fixture harus dimasukkan ke database dulu
+            user_store = SqliteUserStore(chainvote.SQLITE_FILE)
+            user_store.save_users(fixtures["users"])
+            user_store.close()
+        t0 = time.perf_counter()
+        app = chainvote.create_app()
+        startup_time = time.perf_counter() - t0
+        app.config["TESTING"] = True
+
+        event_ids = [e["event_id"] for e in fixtures["events"]]
+        candidates = fixtures["candidates"]
+        users = [u for u in fixtures["users"] if u["role"] == "user"]
+        rng = random.Random(args.seed)
+        iterations = args.iterations
+
+        # --- HTTP: login ---
+        login_users = users[: min(iterations, len(users))]
+        clients: List[Any] = []
+
+        def do_login(i: int) -> None:
+            u = login_users[i]
+            clients.append(login_client(app, u["username"], u["password"]))
+
+        results["http_login"] = time_calls(do_login, len(login_users))
+
+        # --- HTTP: vote POST (satu user = satu vote) ---
+        def do_vote(i: int) -> None:
+            event_id = event_ids[i % len(event_ids)]
+            resp = clients[i].post(f"/event/{event_id}", data={"candidate": rng.choice(candidates)})
+            if resp.status_code != 302:
+                raise RuntimeError(f"vote gagal: HTTP {resp.status_code}")
+
+        results["http_vote_post"] = time_calls(do_vote, len(clients))
+
+        viewer = login_client(app, "admin", "admin123")
+
+        # --- HTTP: halaman blockchain ---
+        def do_view(i: int) -> None:
+            viewer.get(f"/event/{event_ids[i % len(event_ids)]}/blockchain")
+
+        results["http_blockchain_page"] = time_calls(do_view, iterations)
+
+        # --- HTTP: hasil JSON ---
+        def do_results(i: int) -> None:
+            viewer.get(f"/event/{event_ids[i % len(event_ids)]}/results")
+
+        results["http_results_json"] = time_calls(do_results, iterations)
+
+        # --- HTTP: ekspor CSV ---
+        def do_export(i: int) -> None:
+            resp = viewer.get(f"/event/{event_ids[i % len(event_ids)]}/blockchain/export_csv")
+            resp.get_data()
+
+        results["http_export_csv"] = time_calls(do_export, max(1, iterations // 10))
+
+        # --- Fungsi inti: jalur yang sama dengan route aplikasi (cache event) ---
+        events_cache = app.extensions["events_cache"]
+        sample_meta = events_cache.get_event_meta(event_ids[0])
+        probe_voters = [f"voter-0-{rng.randrange(max(1, args.chain_length))}" for _ in range(iterations)]
+        fn_iterations = max(1, iterations // 10)
+
+        # Verifikasi ulang dari genesis (tombol verifikasi penuh) vs checkpoint (halaman blockchain)
+        results["check_chain_full"] = time_calls(
+            lambda i: events_cache.check_chain(event_ids[0], full=True), fn_iterations
+        )
+        results["check_chain_incremental"] = time_calls(
+            lambda i: events_cache.check_chain(event_ids[0]), iterations
+        )
+        results["summary_from_tally"] = time_calls(
+            lambda i: summary_from_counts(sample_meta["candidates"], events_cache.get_tally(event_ids[0])), iterations
+        )
+        results["has_user_voted_index"] = time_calls(
+            lambda i: probe_voters[i] in events_cache.get_voters(event_ids[0]), iterations
+        )
+        # Hash ulang seluruh chain dengan skema v2 (jalur batch validasi, audit & impor)
+        hash_rows = [
+            (b.get("index"), b.get("timestamp"), b.get("voter_id"), b.get("candidate"), b.get("previous_hash"))
+            for b in events_cache.get_chain(event_ids[0])
+        ]
+        v2_hasher = get_hasher(CURRENT_VERSION, chainvote.HASH_ALGORITHM)
+        results["hash_many_v2"] = time_calls(lambda i: v2_hasher.hash_many(hash_rows), fn_iterations)
+
+        # --- Mode voter bersamaan: deteksi vote hilang ---
+        concurrency = None
+        if args.concurrency > 0:
+            concurrency = run_concurrent_voters(app, event_ids[0], users[len(login_users) :], candidates, args)
+
+        return {
+            "config": {
+                "backend": args.backend,
+                "events": args.events,
+                "chain_length": args.chain_length,
+                "users": args.users,
+                "candidates": args.candidates,
+                "iterations": iterations,
+                "concurrency": args.concurrency,
+                "seed": args.seed,
+            },
+            "setup": {
+                "fixture_build_s": round(fixture_time, 3),
+                "create_app_s": round(startup_time, 3),
+            },
+            "results": results,
+            "concurrency": concurrency,
+        }
+    finally:
+        os.chdir(old_cwd)
+        if not args.keep_data:
+            shutil.rmtree(data_dir, ignore_errors=True)
+
+
+def run_concurrent_voters(app, event_id: str, users: List[Dict], candidates: List[str], args) -> Dict[str, Any]:
+    """Banyak thread vote bersamaan pada satu event, lalu cocokkan dengan isi chain."""
+    voters = users[: args.concurrency * args.votes_per_thread]
+    if not voters:
+        return {"error": "user tidak cukup untuk mode concurrency (tambah --users)"}
+
+    clients = [login_client(app, u["username"], u["password"]) for u in voters]
+    timings: List[float] = []
+    timings_lock = threading.Lock()
+    errors: List[str] = []
+
+    def worker(offset: int) -> None:
+        for i in range(offset, len(voters), args.concurrency):
+            start = time.perf_counter()
+            resp = clients[i].post(f"/event/{event_id}", data={"candidate": candidates[i % len(candidates)]})
+            elapsed = time.perf_counter() - start
+            with timings_lock:
+                timings.append(elapsed)
+                if resp.status_code != 302:
+                    errors.append(f"{voters[i]['username']}: HTTP {resp.status_code}")
+
+    threads = [threading.Thread(target=worker, args=(t,)) for t in range(args.concurrency)]
+    start_all = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    wall = time.perf_counter() - start_all
+
+    # Baca ulang dari storage (bukan cache) untuk memastikan vote benar-benar tersimpan
+    app.extensions["event_store"].sync()
+    chain = app.extensions["event_store"].load_chain(event_id)
+    recorded: Dict[str, int] = {}
+    for block in chain[1:]:
+        recorded[block.get("voter_id")] = recorded.get(block.get("voter_id"), 0) + 1
+    expected = {u["username"] for u in voters}
+    lost = sorted(v for v in expected if v not in recorded)
+    duplicated = sorted(v for v, n in recorded.items() if n > 1)
+
+    return {
+        "threads": args.concurrency,
+        "votes_submitted": len(voters),
+        "votes_recorded": sum(recorded.get(v, 0) for v in expected),
+        "lost_votes": len(lost),
+        "lost_voters_sample": lost[:10],
+        "duplicated_voters": len(duplicated),
+        "http_errors": len(errors),
+        "chain_valid": is_chain_valid(chain),
+        "latency": summarize_timings(timings, wall),
+    }
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    cfg = report["config"]
+    print(
+        f"ChainVote benchmark — backend={cfg['backend']} events={cfg['events']} "
+        f"chain_length={cfg['chain_length']} users={cfg['users']} iterations={cfg['iterations']}"
+    )
+    print(f"setup: fixture {report['setup']['fixture_build_s']}s, create_app {report['setup']['create_app_s']}s")
+    print(f"{'benchmark':28} {'n':>7} {'ops/s':>11} {'p50 ms':>10} {'p95 ms':>10} {'p99 ms':>10}")
+    for name, r in report["results"].items():
+        print(
+            f"{name:28} {r['count']:>7} {str(r['throughput_per_s']):>11} "
+            f"{r['p50_ms']:>10} {r['p95_ms']:>10} {r['p99_ms']:>10}"
+        )
+    conc = report.get("concurrency")
+    if conc:
+        if "error" in conc:
+            print(f"concurrency: {conc['error']}")
+        else:
+            lat = conc["latency"]
+            print(
+                f"concurrency: {conc['threads']} thread, {conc['votes_submitted']} vote dikirim, "
+                f"{conc['votes_recorded']} tercatat, {conc['lost_votes']} hilang, "
+                f"{conc['duplicated_voters']} voter ganda, chain_valid={conc['chain_valid']}, "
+                f"{lat['throughput_per_s']} vote/s, p99 {lat['p99_ms']} ms"
+            )
+
+
+def main(argv: list | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark jalur panas ChainVote.")
+    parser.add_argument("--events", type=int, default=3, help="jumlah event sintetis")
+    parser.add_argument("--chain-length", type=int, default=2000, help="jumlah blok vote per event")
+    parser.add_argument("--users", type=int, default=500, help="jumlah user sintetis")
+    parser.add_argument("--candidates", type=int, default=3, help="jumlah kandidat per event")
+    parser.add_argument("--iterations", type=int, default=200, help="jumlah iterasi per benchmark")
+    parser.add_argument("--concurrency", type=int, default=0, help="jumlah thread voter bersamaan (0 = nonaktif)")
+    parser.add_argument("--votes-per-thread", type=int, default=10, help="vote per thread pada mode concurrency")
+    parser.add_argument("--backend", choices=("json", "sqlite"), default="json", help="backend storage")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", metavar="PATH", help="tulis hasil dalam format JSON ke file ini")
+    parser.add_argument("--keep-data", action="store_true", help="jangan hapus direktori data sementara")
+    args = parser.parse_args(argv)
+
+    report = run_benchmarks(args)
+    print_report(report)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    conc = report.get("concurrency") or {}
+    return 1 if conc.get("lost_votes") or conc.get("duplicated_voters") else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,108 @@
+"""Logika inti blockchain ChainVote: hashing blok, genesis, ringkasan & validasi.
+
+Fungsi-fungsi di sini murni (tidak menyentuh storage maupun Flask) sehingga
+bisa dipakai bersama oleh route, writer vote, dan tool lain.
+
+Fungsi yang menghitung hash menerima ``hasher`` (lihat ``hashing.hasher_for``)
+sesuai skema hash event; tanpa argumen dipakai skema versi 1 (chain lama).
+"""
+
+from datetime import datetime
+from typing import Any, Dict, List
+
+from hashing import LEGACY_HASHER, BlockHasher
+
+# Jumlah blok yang di-hash ulang sekaligus saat validasi
+VALIDATION_BATCH = 1024
+
+
+def create_genesis_block(hasher: BlockHasher = LEGACY_HASHER) -> Dict[str, Any]:
+    """Membuat genesis block untuk event baru."""
+    index = 0
+    timestamp = datetime.utcnow().isoformat()
+    voter_id = "GENESIS"
+    candidate = "-"
+    previous_hash = "0"
+    block_hash = hasher.hash(index, timestamp, voter_id, candidate, previous_hash)
+    return {
+        "index": index,
+        "timestamp": timestamp,
+        "voter_id": voter_id,
+        "candidate": candidate,
+        "previous_hash": previous_hash,
+        "hash": block_hash,
+    }
+
+
+def make_block(
+    last_block: Dict[str, Any], voter_id: str, candidate: str, hasher: BlockHasher = LEGACY_HASHER
+) -> Dict[str, Any]:
+    """Membuat blok baru yang tersambung ke ``last_block`` (index & previous_hash)."""
+    index = last_block["index"] + 1
+    timestamp = datetime.utcnow().isoformat()
+    previous_hash = last_block["hash"]
+    block_hash = hasher.hash(index, timestamp, voter_id, candidate, previous_hash)
+    return {
+        "index": index,
+        "timestamp": timestamp,
+        "voter_id": voter_id,
+        "candidate": candidate,
+        "previous_hash": previous_hash,
+        "hash": block_hash,
+    }
+
+
+def summary_from_counts(candidates: List[str], raw_counts: Dict[str, int]) -> Dict[str, Any]:
+    """Ringkasan hasil voting dari hitungan suara per kandidat yang sudah ada.
+
+    Menghasilkan:
+    - counts: dict kandidat -> jumlah suara
+    - total: total suara (tanpa genesis)
+    - winners: list kandidat dengan suara terbanyak (bisa lebih dari satu jika seri)
+
+    ``raw_counts`` boleh berisi kandidat yang tidak terdaftar (mis. hasil
+    tamper); hanya kandidat event yang dihitung.
+    """
+    counts: Dict[str, int] = {c: raw_counts.get(c, 0) for c in candidates}
+    total = sum(counts.values())
+    max_votes = max(counts.values()) if counts else 0
+    winners = [c for c, v in counts.items() if v == max_votes and max_votes > 0]
+    return {"counts": counts, "total": total, "winners": winners}
+
+
+def find_invalid_block(chain: List[Dict[str, Any]], start: int = 0, hasher: BlockHasher = LEGACY_HASHER) -> int | None:
+    """Cari index blok pertama yang tidak valid, mulai dari ``start``.
+
+    Blok sebelum ``start`` dianggap sudah terverifikasi (checkpoint), tetapi
+    sambungan ``previous_hash`` blok ``start`` ke blok sebelumnya tetap dicek.
+    Hash dihitung ulang per kelompok ``VALIDATION_BATCH`` blok lewat
+    ``hasher.hash_many``. Mengembalikan None jika semua blok dari ``start`` valid.
+    """
+    if not chain:
+        return None
+
+    if start <= 0:
+        # cek genesis block konsisten (index 0, previous_hash '0')
+        genesis = chain[0]
+        if genesis.get("index") != 0 or genesis.get("previous_hash") != "0":
+            return 0
+        start = 1
+
+    for batch_start in range(start, len(chain), VALIDATION_BATCH):
+        blocks = chain[batch_start : batch_start + VALIDATION_BATCH]
+        recalculated = hasher.hash_many(
+            (b.get("index"), b.get("timestamp"), b.get("voter_id"), b.get("candidate"), b.get("previous_hash"))
+            for b in blocks
+        )
+        prev_hash = chain[batch_start - 1].get("hash")
+        for offset, current in enumerate(blocks):
+            # cek previous_hash, lalu perhitungan hash
+            if current.get("previous_hash") != prev_hash or recalculated[offset] != current.get("hash"):
+                return batch_start + offset
+            prev_hash = current.get("hash")
+    return None
+
+
+def is_chain_valid(chain: List[Dict[str, Any]], hasher: BlockHasher = LEGACY_HASHER) -> bool:
+    """Validasi integritas blockchain (penuh, dari genesis)."""
+    return find_invalid_block(chain, hasher=hasher) is None
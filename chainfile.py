@@ -0,0 +1,512 @@
+"""Format file biner blockchain per event (``chains/<event_id>.cvc``).
+
+Tata letak file (little-endian):
+
+- header 64 byte: magic ``CVCHAIN1``, versi format, ukuran record, jumlah
+  blok, offset tabel string, jumlah entri tabel string
+- record blok berukuran tetap (96 byte) mulai offset 64: index, timestamp
+  (mikrodetik sejak epoch), kode voter, kode kandidat, kode field khusus,
+  lalu ``previous_hash`` dan ``hash`` sebagai digest mentah 32 byte
+- tabel string setelah record (boleh ada ruang cadangan di antaranya) sampai
+  akhir file: tiap entri ``tag (1 byte) + panjang (4 byte) + data``; tag 0 =
+  string UTF-8, tag 1 = nilai JSON (mis. field khusus satu blok)
+
+Karena record berukuran tetap, blok ke-N dibaca langsung di offset
+``64 + N * 96`` lewat mmap tanpa mem-parse blok lain. Nilai yang tidak bisa
+dikodekan ulang persis (genesis ``previous_hash = "0"``, hash hasil tamper,
+field tambahan) disimpan sebagai field khusus JSON, sama seperti
+``CompactChain``.
+
+Format ini opsional (untuk audit/arsip): event tetap memakai log JSON Lines
+kecuali shard-nya dikonversi dengan ``python chainfile.py pack``.
+
+Append tidak pernah menimpa data yang masih ditunjuk header: record baru
+ditulis ke ruang cadangan antara record terakhir dan tabel string, string
+baru di ekor tabel, lalu di-fsync sebelum header (yang menaikkan jumlah blok)
+ditulis paling akhir. Jika ruang cadangan habis, tabel string disalin dulu ke
+posisi baru di ekor file (dengan cadangan baru) dan header dipindahkan ke
+sana sebelum record menimpa tabel lama. Crash di tengah jalan hanya
+menyisakan byte yang belum ditunjuk header.
+
+Contoh CLI:
+
+    python chainfile.py pack [event_id ...]         # chains/*.jsonl -> chains/*.cvc
+    python chainfile.py unpack [event_id ...]       # chains/*.cvc -> chains/*.jsonl
+    python chainfile.py import-json events.json     # events.json lama -> katalog + shard .cvc
+    python chainfile.py export-json events.json     # katalog + shard -> struktur events.json
+"""
+
+import argparse
+import json
+import mmap
+import os
+import struct
+import sys
+import threading
+from collections import Counter
+from typing import Any, Dict, Iterable, Iterator, List, Set
+
+from hashing import LEGACY_HASHER, BlockHasher
+from compact_chain import DIGEST_SIZE, FIELDS, decode_timestamp, encode_hash, encode_timestamp
+
+MAGIC = b"CVCHAIN1"
+FORMAT_VERSION = 1
+EXTENSION = ".cvc"
+
+HEADER = struct.Struct("<8sHHIQQQ24x")
+RECORD = struct.Struct("<qqIII4x32s32s")
+STRING_ENTRY = struct.Struct("<BI")
+NO_CODE = 0xFFFFFFFF
+# Ruang cadangan minimum (jumlah record) saat tabel string dipindah ke ekor file
+MIN_RESERVE = 64
+_ZERO_DIGEST = bytes(DIGEST_SIZE)
+_TAG_STR = 0
+_TAG_JSON = 1
+
+
+def _temp_path(path: str) -> str:
+    """File sementara unik per proses & thread (worker dan ``pack`` bisa menulis shard yang sama)."""
+    return f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+
+
+class ChainFileError(Exception):
+    """File biner chain rusak atau bukan format ChainVote."""
+
+
+class ChainFile:
+    """Chain event di file biner, dibaca lewat mmap (akses acak per blok).
+
+    Antarmuka mirip ``CompactChain``: ``len()``, ``chain[i]`` / ``chain[a:b]``
+    (dict biasa), iterasi, ``find_invalid``, ``tally`` dan ``voters``.
+    ``chain[i] = block`` menulis ulang satu record langsung di file.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._file = open(path, "r+b")
+        self._strings: List[Any] = []
+        self._codes: Dict[Any, int] = {}
+        self._map: mmap.mmap | None = None
+        self._load()
+
+    # ---------- Baca header & tabel string ----------
+
+    def _load(self) -> None:
+        header = self._file.read(HEADER.size)
+        if len(header) < HEADER.size:
+            raise ChainFileError(f"{self.path}: header terpotong")
+        magic, version, record_size, _flags, count, strings_offset, strings_count = HEADER.unpack(header)
+        if magic != MAGIC or version != FORMAT_VERSION or record_size != RECORD.size:
+            raise ChainFileError(f"{self.path}: bukan file chain ChainVote versi {FORMAT_VERSION}")
+        self._count = count
+        self._strings_offset = strings_offset
+        self._remap()
+        offset = strings_offset
+        for _ in range(strings_count):
+            tag, length = STRING_ENTRY.unpack_from(self._map, offset)
+            offset += STRING_ENTRY.size
+            data = bytes(self._map[offset : offset + length])
+            offset += length
+            value = data.decode("utf-8") if tag == _TAG_STR else json.loads(data)
+            self._register(value)
+        self._strings_end = offset
+
+    def _remap(self) -> None:
+        # Mapping lama tidak ditutup eksplisit: pembaca lain mungkin masih memakainya
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def _register(self, value: Any) -> int:
+        code = len(self._strings)
+        self._strings.append(value)
+        if isinstance(value, str):
+            self._codes.setdefault(value, code)
+        return code
+
+    # ---------- Encoding record ----------
+
+    def _string_code(self, value: Any, new_entries: List[Any]) -> int:
+        code = self._codes.get(value) if isinstance(value, str) else None
+        if code is None:
+            code = self._register(value)
+            new_entries.append(value)
+        return code
+
+    def _encode(self, position: int, block: Dict[str, Any], new_entries: List[Any]) -> bytes:
+        extra = {k: v for k, v in block.items() if k not in FIELDS}
+        index = block.get("index")
+        if not isinstance(index, int) or isinstance(index, bool) or index != position:
+            extra["index"] = index
+            index = position
+        digest = encode_hash(block.get("hash"))
+        if digest is None:
+            extra["hash"] = block.get("hash")
+            digest = _ZERO_DIGEST
+        prev_digest = encode_hash(block.get("previous_hash"))
+        if prev_digest is None:
+            extra["previous_hash"] = block.get("previous_hash")
+            prev_digest = _ZERO_DIGEST
+        timestamp = encode_timestamp(block.get("timestamp"))
+        if timestamp is None:
+            extra["timestamp"] = block.get("timestamp")
+            timestamp = 0
+        codes = []
+        for field in ("voter_id", "candidate"):
+            value = block.get(field)
+            if isinstance(value, str):
+                codes.append(self._string_code(value, new_entries))
+            else:
+                extra[field] = value
+                codes.append(NO_CODE)
+        extra_code = self._string_code(extra, new_entries) if extra else NO_CODE
+        return RECORD.pack(index, timestamp, codes[0], codes[1], extra_code, prev_digest, digest)
+
+    @staticmethod
+    def _encode_strings(values: Iterable[Any]) -> bytes:
+        parts = []
+        for value in values:
+            if isinstance(value, str):
+                data, tag = value.encode("utf-8"), _TAG_STR
+            else:
+                data, tag = json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8"), _TAG_JSON
+            parts.append(STRING_ENTRY.pack(tag, len(data)))
+            parts.append(data)
+        return b"".join(parts)
+
+    def _header(self) -> bytes:
+        return HEADER.pack(
+            MAGIC, FORMAT_VERSION, RECORD.size, 0, self._count, self._strings_offset, len(self._strings)
+        )
+
+    def _write_header(self) -> None:
+        self._file.seek(0)
+        self._file.write(self._header())
+
+    def _commit_header(self) -> None:
+        """Fsync data yang sudah ditulis, baru header: header tidak pernah menunjuk byte yang belum ada."""
+        self.sync()
+        self._write_header()
+        self._file.flush()
+
+    # ---------- Antarmuka list ----------
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __bool__(self) -> bool:
+        return self._count > 0
+
+    def _position(self, index: int) -> int:
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("chain index out of range")
+        return index
+
+    def _record(self, position: int) -> tuple:
+        return RECORD.unpack_from(self._map, HEADER.size + position * RECORD.size)
+
+    def block(self, position: int) -> Dict[str, Any]:
+        """Blok di posisi ``position`` sebagai dict (hanya record itu yang dibaca)."""
+        index, timestamp, voter, candidate, extra_code, prev_digest, digest = self._record(position)
+        block = {
+            "index": index,
+            "timestamp": decode_timestamp(timestamp),
+            "voter_id": self._strings[voter] if voter != NO_CODE else None,
+            "candidate": self._strings[candidate] if candidate != NO_CODE else None,
+            "previous_hash": prev_digest.hex(),
+            "hash": digest.hex(),
+        }
+        if extra_code != NO_CODE:
+            block.update(self._strings[extra_code])
+        return block
+
+    def __getitem__(self, key: int | slice) -> Any:
+        if isinstance(key, slice):
+            return [self.block(i) for i in range(*key.indices(self._count))]
+        return self.block(self._position(key))
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for position in range(self._count):
+            yield self.block(position)
+
+    def iter_range(self, start: int = 0, stop: int | None = None) -> Iterator[Dict[str, Any]]:
+        """Blok posisi ``start`` .. ``stop - 1`` (langsung lompat ke record ``start``)."""
+        stop = self._count if stop is None else min(stop, self._count)
+        for position in range(max(0, start), stop):
+            yield self.block(position)
+
+    def digest(self, position: int) -> bytes:
+        """Hash blok sebagai 32 byte mentah."""
+        return self._record(position)[6]
+
+    # ---------- Tulis ----------
+
+    def _append_strings(self, new_entries: List[Any]) -> None:
+        """Tulis entri string baru di ekor tabel (belum terlihat sampai header ditulis)."""
+        data = self._encode_strings(new_entries)
+        self._file.seek(self._strings_end)
+        self._file.write(data)
+        self._strings_end += len(data)
+
+    def __setitem__(self, key: int, block: Dict[str, Any]) -> None:
+        """Tulis ulang satu record di tempat (string baru ditambahkan di ekor tabel lebih dulu)."""
+        position = self._position(key)
+        new_entries: List[Any] = []
+        record = self._encode(position, block, new_entries)
+        if new_entries:
+            self._append_strings(new_entries)
+            self._commit_header()
+        self._file.seek(HEADER.size + position * RECORD.size)
+        self._file.write(record)
+        self._file.flush()
+        self._remap()
+
+    def append_blocks(self, blocks: List[Dict[str, Any]]) -> None:
+        """Tambahkan blok di akhir tanpa menimpa tabel string yang masih ditunjuk header.
+
+        Header (jumlah blok & tabel string baru) ditulis paling akhir setelah fsync.
+        """
+        if not blocks:
+            return
+        try:
+            self._append_records(blocks)
+        except BaseException:
+            # Mis. disk penuh: isi file tetap sesuai header lama, samakan ulang state di memori
+            self._reload()
+            raise
+        self._remap()
+
+    def _append_records(self, blocks: List[Dict[str, Any]]) -> None:
+        new_entries: List[Any] = []
+        records = [self._encode(self._count + i, block, new_entries) for i, block in enumerate(blocks)]
+        records_end = HEADER.size + (self._count + len(records)) * RECORD.size
+        if records_end > self._strings_offset:
+            # Ruang cadangan habis: salin tabel string (lama + baru) ke ekor file dengan
+            # cadangan baru, pindahkan header ke sana, baru tabel lama boleh ditimpa record
+            reserve = max(len(records), self._count // 4, MIN_RESERVE)
+            table = bytes(self._map[self._strings_offset : self._strings_end]) + self._encode_strings(new_entries)
+            offset = max(self._strings_end, records_end + reserve * RECORD.size)
+            self._file.seek(offset)
+            self._file.write(table)
+            self._strings_offset = offset
+            self._strings_end = offset + len(table)
+            self._commit_header()
+        elif new_entries:
+            self._append_strings(new_entries)
+        self._file.seek(HEADER.size + self._count * RECORD.size)
+        self._file.write(b"".join(records))
+        self._count += len(records)
+        self._commit_header()
+
+    def _reload(self) -> None:
+        self._strings = []
+        self._codes = {}
+        self._file.seek(0)
+        self._load()
+
+    def is_stale(self) -> bool:
+        """True jika file di ``path`` sudah diganti atau header-nya diubah proses lain."""
+        try:
+            current = os.stat(self.path)
+        except FileNotFoundError:
+            return True
+        opened = os.fstat(self._file.fileno())
+        if current.st_ino != opened.st_ino:
+            return True
+        # mmap berbagi halaman dengan file: header terbaru terlihat tanpa membaca ulang
+        return bytes(self._map[: HEADER.size]) != self._header()
+
+    def sync(self) -> None:
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self) -> None:
+        self._file.close()
+
+    @classmethod
+    def write(cls, path: str, blocks: Iterable[Dict[str, Any]]) -> None:
+        """Tulis file biner baru dari blok-blok (atomic lewat file sementara)."""
+        tmp_path = _temp_path(path)
+        with open(tmp_path, "wb") as f:
+            f.write(HEADER.pack(MAGIC, FORMAT_VERSION, RECORD.size, 0, 0, HEADER.size, 0))
+        chain = cls(tmp_path)
+        try:
+            records = []
+            new_entries: List[Any] = []
+            for block in blocks:
+                records.append(chain._encode(chain._count + len(records), block, new_entries))
+            chain._file.seek(HEADER.size)
+            chain._file.write(b"".join(records))
+            chain._count = len(records)
+            chain._strings_offset = HEADER.size + chain._count * RECORD.size
+            data = chain._encode_strings(new_entries)
+            chain._file.write(data)
+            chain._strings_end = chain._strings_offset + len(data)
+            chain._write_header()
+            chain.sync()
+        finally:
+            chain.close()
+        os.replace(tmp_path, path)
+
+    # ---------- Validasi & tally langsung pada record ----------
+
+    def find_invalid(self, start: int = 0, hasher: BlockHasher = LEGACY_HASHER) -> int | None:
+        """Sama seperti ``blockchain.find_invalid_block``, langsung pada record biner."""
+        if not self._count:
+            return None
+        if start <= 0:
+            genesis = self.block(0)
+            if genesis.get("index") != 0 or genesis.get("previous_hash") != "0":
+                return 0
+            start = 1
+        strings = self._strings
+        rehash = hasher.digest
+        previous = self._record(start - 1)
+        for i in range(start, self._count):
+            current = self._record(i)
+            index, timestamp, voter, candidate, extra_code, prev_digest, digest = current
+            if extra_code != NO_CODE or previous[4] != NO_CODE or voter == NO_CODE or candidate == NO_CODE:
+                block = self.block(i)
+                if block.get("previous_hash") != self.block(i - 1).get("hash"):
+                    return i
+                recalculated = rehash(
+                    block.get("index"),
+                    block.get("timestamp"),
+                    block.get("voter_id"),
+                    block.get("candidate"),
+                    block.get("previous_hash"),
+                )
+                if recalculated.hex() != block.get("hash"):
+                    return i
+            else:
+                if prev_digest != previous[6]:
+                    return i
+                recalculated = rehash(
+                    index, decode_timestamp(timestamp), strings[voter], strings[candidate], prev_digest.hex()
+                )
+                if recalculated != digest:
+                    return i
+            previous = current
+        return None
+
+    def tally(self) -> Dict[str, int]:
+        """Hitungan suara per kandidat (tanpa genesis)."""
+        raw_counts: Dict[str, int] = {}
+        counts: Counter = Counter()
+        for position in range(self._count):
+            index, _ts, _voter, candidate, extra_code, _prev, _digest = self._record(position)
+            if extra_code != NO_CODE or candidate == NO_CODE:
+                block = self.block(position)
+                if block.get("index") != 0:
+                    raw_counts[block.get("candidate")] = raw_counts.get(block.get("candidate"), 0) + 1
+            elif index != 0:
+                counts[candidate] += 1
+        for code, count in counts.items():
+            name = self._strings[code]
+            raw_counts[name] = raw_counts.get(name, 0) + count
+        return raw_counts
+
+    def find_voter(self, voter_id: Any) -> int | None:
+        """Posisi blok (bukan genesis) pertama milik ``voter_id``, atau None."""
+        code = self._codes.get(voter_id) if isinstance(voter_id, str) else None
+        for position in range(self._count):
+            index, _ts, voter, _candidate, extra_code, _prev, _digest = self._record(position)
+            if extra_code != NO_CODE or voter == NO_CODE:
+                block = self.block(position)
+                if block.get("index") != 0 and block.get("voter_id") == voter_id:
+                    return position
+            elif code is not None and voter == code and index != 0:
+                return position
+        return None
+
+    def voters(self) -> Set[Any]:
+        """Set voter_id yang punya blok (tanpa genesis)."""
+        result: Set[Any] = set()
+        for position in range(self._count):
+            index, _ts, voter, _candidate, extra_code, _prev, _digest = self._record(position)
+            if extra_code != NO_CODE or voter == NO_CODE:
+                block = self.block(position)
+                if block.get("index") != 0:
+                    result.add(block.get("voter_id"))
+            elif index != 0:
+                result.add(self._strings[voter])
+        return result
+
+
+# ---------- Konversi dari / ke struktur events.json ----------
+
+
+def events_to_binary(events: List[Dict[str, Any]], chains_dir: str) -> List[Dict[str, Any]]:
+    """Tulis blockchain tiap event (struktur ``events.json``) ke ``<chains_dir>/<event_id>.cvc``.
+
+    Mengembalikan daftar metadata event (tanpa ``blockchain``) untuk katalog.
+    """
+    os.makedirs(chains_dir, exist_ok=True)
+    metas = []
+    for event in events:
+        ChainFile.write(os.path.join(chains_dir, event["event_id"] + EXTENSION), event.get("blockchain", []))
+        metas.append({k: v for k, v in event.items() if k != "blockchain"})
+    return metas
+
+
+def binary_to_events(metas: List[Dict[str, Any]], chains_dir: str) -> List[Dict[str, Any]]:
+    """Bangun kembali struktur ``events.json`` (metadata + blockchain) dari shard ``.cvc``."""
+    events = []
+    for meta in metas:
+        event = dict(meta)
+        path = os.path.join(chains_dir, meta["event_id"] + EXTENSION)
+        if os.path.exists(path):
+            chain = ChainFile(path)
+            try:
+                event["blockchain"] = list(chain)
+            finally:
+                chain.close()
+        else:
+            event["blockchain"] = []
+        events.append(event)
+    return events
+
+
+def main(argv: list | None = None) -> int:
+    import app as chainvote
+    from storage import JsonlEventStore
+
+    parser = argparse.ArgumentParser(description="Konversi shard blockchain ChainVote ke/dari format biner.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    for name, text in (("pack", "JSON Lines -> biner"), ("unpack", "biner -> JSON Lines")):
+        cmd = sub.add_parser(name, help=text)
+        cmd.add_argument("event_ids", nargs="*", help="event yang dikonversi (default: semua)")
+    cmd = sub.add_parser("import-json", help="events.json lama -> katalog + shard biner")
+    cmd.add_argument("path")
+    cmd = sub.add_parser("export-json", help="katalog + shard -> file berstruktur events.json")
+    cmd.add_argument("path")
+    args = parser.parse_args(argv)
+
+    store = JsonlEventStore(chainvote.EVENTS_META_FILE, chainvote.CHAINS_DIR, archive_dir=chainvote.ARCHIVE_DIR)
+    try:
+        if args.command in ("pack", "unpack"):
+            fmt = "binary" if args.command == "pack" else "jsonl"
+            event_ids = args.event_ids or [m["event_id"] for m in store.list_event_meta()]
+            for event_id in event_ids:
+                store.convert_chain(event_id, fmt)
+            print(f"{len(event_ids)} event dikonversi ke format {fmt}.")
+        elif args.command == "import-json":
+            with open(args.path, "r", encoding="utf-8") as f:
+                events = json.load(f)
+            for meta in events_to_binary(events, chainvote.CHAINS_DIR):
+                store.save_event_meta(meta)
+                jsonl_path = store.chain_path(meta["event_id"])
+                if os.path.exists(jsonl_path):
+                    os.remove(jsonl_path)
+            print(f"{len(events)} event diimpor sebagai shard biner.")
+        else:
+            events = [store.load_event(m["event_id"]) for m in store.list_event_meta()]
+            store._atomic_write_json(args.path, events)
+            print(f"{len(events)} event diekspor ke {args.path}.")
+    finally:
+        store.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
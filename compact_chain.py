@@ -0,0 +1,328 @@
+"""Representasi blockchain yang hemat memori (kolom-kolom array).
+
+Satu blok dict berisi enam key string (dua hash hex 64 karakter + timestamp
+ISO) memakan ratusan byte. ``CompactChain`` menyimpan chain per kolom:
+
+- ``hash`` & ``previous_hash``: digest mentah 32 byte dalam satu ``bytearray``
+- ``timestamp``: integer mikrodetik sejak epoch (``array('q')``)
+- ``voter_id`` & ``candidate``: kode integer ke tabel string (di-intern)
+
+Nilai yang tidak bisa direpresentasikan ulang persis (mis. ``previous_hash``
+genesis ``"0"``, hash hasil tamper yang bukan hex, timestamp dengan format
+lain, field tambahan) disimpan apa adanya di ``_extra`` per posisi, jadi
+konversi bolak-balik ke dict selalu identik dengan blok aslinya.
+
+Untuk template, API JSON dan ekspor CSV, ``chain[i]`` / ``chain[a:b]`` / iterasi
+mengembalikan dict biasa (salinan). Mengubah dict itu tidak mengubah chain;
+tulis kembali dengan ``chain[i] = block``.
+"""
+
+import sys
+from array import array
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, Iterator, List, Set
+
+from hashing import LEGACY_HASHER, BlockHasher
+
+FIELDS = ("index", "timestamp", "voter_id", "candidate", "previous_hash", "hash")
+DIGEST_SIZE = 32
+
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+_ZERO_DIGEST = bytes(DIGEST_SIZE)
+
+
+def encode_hash(value: Any) -> bytes | None:
+    """Hex 64 karakter (huruf kecil) -> 32 byte; None jika tidak bisa persis."""
+    if not isinstance(value, str) or len(value) != DIGEST_SIZE * 2:
+        return None
+    try:
+        digest = bytes.fromhex(value)
+    except ValueError:
+        return None
+    return digest if digest.hex() == value else None
+
+
+def encode_timestamp(value: Any) -> int | None:
+    """Timestamp ISO (naive) -> mikrodetik sejak epoch; None jika tidak bisa persis."""
+    if not isinstance(value, str):
+        return None
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    if parsed.tzinfo is not None or parsed.isoformat() != value:
+        return None
+    return (parsed - _EPOCH) // _MICROSECOND
+
+
+def decode_timestamp(value: int) -> str:
+    """Kebalikan ``encode_timestamp``: mikrodetik sejak epoch -> string ISO."""
+    return (_EPOCH + value * _MICROSECOND).isoformat()
+
+
+class CompactChain:
+    """Container chain kolumnar dengan antarmuka mirip list of dict."""
+
+    __slots__ = ("_hashes", "_prev_hashes", "_timestamps", "_voters", "_candidates", "_extra", "_strings", "_codes")
+
+    def __init__(self, blocks: Iterable[Dict[str, Any]] = ()) -> None:
+        self._hashes = bytearray()
+        self._prev_hashes = bytearray()
+        self._timestamps = array("q")
+        self._voters = array("I")
+        self._candidates = array("I")
+        # posisi -> field yang disimpan apa adanya (tidak bisa dikodekan di kolom)
+        self._extra: Dict[int, Dict[str, Any]] = {}
+        self._strings: List[Any] = []
+        self._codes: Dict[Any, int] = {}
+        self.extend(blocks)
+
+    # ---------- Encoding ----------
+
+    def _code(self, value: Any) -> int:
+        code = self._codes.get(value)
+        if code is None:
+            if isinstance(value, str):
+                value = sys.intern(value)
+            code = self._codes[value] = len(self._strings)
+            self._strings.append(value)
+        return code
+
+    def _encode(self, position: int, block: Dict[str, Any]) -> tuple:
+        extra = {k: v for k, v in block.items() if k not in FIELDS}
+        if block.get("index") != position:
+            extra["index"] = block.get("index")
+
+        digest = encode_hash(block.get("hash"))
+        if digest is None:
+            extra["hash"] = block.get("hash")
+            digest = _ZERO_DIGEST
+        prev_digest = encode_hash(block.get("previous_hash"))
+        if prev_digest is None:
+            extra["previous_hash"] = block.get("previous_hash")
+            prev_digest = _ZERO_DIGEST
+        timestamp = encode_timestamp(block.get("timestamp"))
+        if timestamp is None:
+            extra["timestamp"] = block.get("timestamp")
+            timestamp = 0
+
+        codes = []
+        for field in ("voter_id", "candidate"):
+            try:
+                codes.append(self._code(block.get(field)))
+            except TypeError:  # nilai tidak hashable (bukan string)
+                extra[field] = block.get(field)
+                codes.append(0 if self._strings else self._code(None))
+        return digest, prev_digest, timestamp, codes[0], codes[1], extra
+
+    def _store(self, position: int, encoded: tuple) -> None:
+        digest, prev_digest, timestamp, voter, candidate, extra = encoded
+        if position == len(self._timestamps):
+            self._hashes += digest
+            self._prev_hashes += prev_digest
+            self._timestamps.append(timestamp)
+            self._voters.append(voter)
+            self._candidates.append(candidate)
+        else:
+            offset = position * DIGEST_SIZE
+            self._hashes[offset : offset + DIGEST_SIZE] = digest
+            self._prev_hashes[offset : offset + DIGEST_SIZE] = prev_digest
+            self._timestamps[position] = timestamp
+            self._voters[position] = voter
+            self._candidates[position] = candidate
+        if extra:
+            self._extra[position] = extra
+        else:
+            self._extra.pop(position, None)
+
+    def _field(self, position: int, field: str) -> Any:
+        extra = self._extra.get(position)
+        if extra is not None and field in extra:
+            return extra[field]
+        if field == "index":
+            return position
+        if field == "hash":
+            return self.digest(position).hex()
+        if field == "previous_hash":
+            offset = position * DIGEST_SIZE
+            return bytes(self._prev_hashes[offset : offset + DIGEST_SIZE]).hex()
+        if field == "timestamp":
+            return decode_timestamp(self._timestamps[position])
+        if field == "voter_id":
+            return self._strings[self._voters[position]]
+        if field == "candidate":
+            return self._strings[self._candidates[position]]
+        raise KeyError(field)
+
+    def _position(self, index: int) -> int:
+        length = len(self._timestamps)
+        if index < 0:
+            index += length
+        if not 0 <= index < length:
+            raise IndexError("chain index out of range")
+        return index
+
+    # ---------- Antarmuka list ----------
+
+    def __len__(self) -> int:
+        return len(self._timestamps)
+
+    def __bool__(self) -> bool:
+        return len(self._timestamps) > 0
+
+    def __getitem__(self, key: int | slice) -> Any:
+        if isinstance(key, slice):
+            return [self.block(i) for i in range(*key.indices(len(self)))]
+        return self.block(self._position(key))
+
+    def __setitem__(self, key: int, block: Dict[str, Any]) -> None:
+        position = self._position(key)
+        self._store(position, self._encode(position, block))
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for position in range(len(self)):
+            yield self.block(position)
+
+    def append(self, block: Dict[str, Any]) -> None:
+        position = len(self)
+        self._store(position, self._encode(position, block))
+
+    def extend(self, blocks: Iterable[Dict[str, Any]]) -> None:
+        for block in blocks:
+            self.append(block)
+
+    def block(self, position: int) -> Dict[str, Any]:
+        """Blok di posisi ``position`` sebagai dict baru (urutan key seperti aslinya)."""
+        block = {field: self._field(position, field) for field in FIELDS}
+        extra = self._extra.get(position)
+        if extra:
+            for key, value in extra.items():
+                if key not in FIELDS:
+                    block[key] = value
+        return block
+
+    def digest(self, position: int) -> bytes:
+        """Hash blok sebagai 32 byte mentah (tanpa konversi hex)."""
+        offset = position * DIGEST_SIZE
+        return bytes(self._hashes[offset : offset + DIGEST_SIZE])
+
+    # ---------- Validasi & tally langsung pada bentuk kolom ----------
+
+    def find_invalid(self, start: int = 0, hasher: BlockHasher = LEGACY_HASHER) -> int | None:
+        """Sama seperti ``blockchain.find_invalid_block`` tetapi langsung pada kolom.
+
+        Sambungan ``previous_hash`` dibandingkan sebagai digest mentah dan hash
+        dihitung ulang tanpa membentuk dict per blok.
+        """
+        length = len(self)
+        if not length:
+            return None
+        if start <= 0:
+            if self._field(0, "index") != 0 or self._field(0, "previous_hash") != "0":
+                return 0
+            start = 1
+
+        hashes = self._hashes
+        prev_hashes = self._prev_hashes
+        strings = self._strings
+        extra = self._extra
+        rehash = hasher.digest
+        for i in range(start, length):
+            if i in extra or (i - 1) in extra:
+                current = self.block(i)
+                if current.get("previous_hash") != self._field(i - 1, "hash"):
+                    return i
+                recalculated = rehash(
+                    current.get("index"),
+                    current.get("timestamp"),
+                    current.get("voter_id"),
+                    current.get("candidate"),
+                    current.get("previous_hash"),
+                )
+                if recalculated.hex() != current.get("hash"):
+                    return i
+                continue
+
+            offset = i * DIGEST_SIZE
+            prev_digest = prev_hashes[offset : offset + DIGEST_SIZE]
+            if prev_digest != hashes[offset - DIGEST_SIZE : offset]:
+                return i
+            recalculated = rehash(
+                i,
+                decode_timestamp(self._timestamps[i]),
+                strings[self._voters[i]],
+                strings[self._candidates[i]],
+                prev_digest.hex(),
+            )
+            if recalculated != hashes[offset : offset + DIGEST_SIZE]:
+                return i
+        return None
+
+    def tally(self) -> Dict[str, int]:
+        """Hitungan suara per kandidat (tanpa genesis), dihitung dari kolom kode kandidat."""
+        counts = Counter(self._candidates)
+        raw_counts: Dict[str, int] = {}
+        # Posisi dengan field khusus (termasuk genesis) dihitung lewat nilai aslinya
+        special = set(self._extra)
+        if len(self):
+            special.add(0)
+        for position in special:
+            counts[self._candidates[position]] -= 1
+            if self._field(position, "index") != 0:
+                candidate = self._field(position, "candidate")
+                raw_counts[candidate] = raw_counts.get(candidate, 0) + 1
+        for code, count in counts.items():
+            if count:
+                candidate = self._strings[code]
+                raw_counts[candidate] = raw_counts.get(candidate, 0) + count
+        return raw_counts
+
+    def voters(self) -> Set[Any]:
+        """Set voter_id yang punya blok (tanpa genesis)."""
+        counts = Counter(self._voters)
+        special = set(self._extra)
+        if len(self):
+            special.add(0)
+        for position in special:
+            counts[self._voters[position]] -= 1
+        result = {self._strings[code] for code, count in counts.items() if count > 0}
+        for position in special:
+            if self._field(position, "index") != 0:
+                result.add(self._field(position, "voter_id"))
+        return result
+
+    def find_voter(self, voter_id: Any) -> int | None:
+        """Posisi blok (bukan genesis) pertama milik ``voter_id``, atau None.
+
+        Dicari di kolom kode voter (``array.index``), bukan dengan membentuk dict per blok.
+        """
+        positions = [p for p, extra in self._extra.items() if "voter_id" in extra and extra["voter_id"] == voter_id]
+        try:
+            code = self._codes.get(voter_id)
+        except TypeError:
+            code = None
+        start = 0
+        while code is not None:
+            try:
+                position = self._voters.index(code, start)
+            except ValueError:
+                break
+            extra = self._extra.get(position)
+            if (extra is None or "voter_id" not in extra) and self._field(position, "index") != 0:
+                positions.append(position)
+                break
+            start = position + 1
+        positions = [p for p in positions if self._field(p, "index") != 0]
+        return min(positions) if positions else None
+
+    def nbytes(self) -> int:
+        """Perkiraan ukuran kolom-kolom (byte), tanpa tabel string & field khusus."""
+        return (
+            len(self._hashes)
+            + len(self._prev_hashes)
+            + self._timestamps.itemsize * len(self._timestamps)
+            + self._voters.itemsize * len(self._voters)
+            + self._candidates.itemsize * len(self._candidates)
+        )
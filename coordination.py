@@ -0,0 +1,225 @@
+"""Koordinasi antar proses untuk mode multi-worker (mis. beberapa worker gunicorn).
+
+Setiap worker punya cache, writer vote dan feed SSE sendiri. Agar chain tidak
+bercabang dan cache tidak basi, worker-worker berbagi dua hal lewat folder
+``state_dir``:
+
+- **lock file** (``flock``) per event & per file bersama (katalog, users):
+  append chain suatu event diserialisasi lintas proses, bukan hanya lintas
+  thread. Pemegang lock wajib menyamakan cache-nya dengan storage dulu
+  (``EventCache.refresh``) sebelum merangkai blok baru.
+- **change log** (``changes.log``): setiap perubahan ditulis satu baris
+  ``<pid> <jenis> <event_id>``. Thread poller di tiap worker membaca baris
+  baru milik proses lain lalu memanggil callback (invalidasi cache,
+  notifikasi SSE). Jika log dipotong (rotasi), callback dipanggil dengan
+  jenis ``"all"``.
+
+``LocalCoordinator`` adalah versi satu proses (lock thread biasa, tanpa
+broadcast) dengan antarmuka yang sama; pilih lewat ``open_coordinator``.
+"""
+
+import os
+import threading
+from typing import Callable, Dict, List
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+# Jenis perubahan yang di-broadcast
+BLOCKS = "blocks"  # blok baru di akhir chain
+RESET = "reset"  # chain ditulis ulang / event dihapus
+META = "meta"  # metadata event berubah
+ALL = "all"  # sebagian log hilang (rotasi): anggap semua berubah
+
+ChangeCallback = Callable[[str, str | None], None]
+
+
+class FileLock:
+    """Lock eksklusif lintas proses di atas satu lock file.
+
+    Reentrant dalam satu thread (seperti ``threading.RLock``); antar thread
+    dalam satu proses diserialisasi lewat RLock, antar proses lewat ``flock``.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._thread_lock = threading.RLock()
+        self._depth = 0
+        self._fd: int | None = None
+
+    def acquire(self) -> None:
+        self._thread_lock.acquire()
+        if self._depth == 0:
+            try:
+                fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+                if fcntl is not None:
+                    fcntl.flock(fd, fcntl.LOCK_EX)
+                else:
+                    msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+            except BaseException:
+                self._thread_lock.release()
+                raise
+            self._fd = fd
+        self._depth += 1
+
+    def release(self) -> None:
+        self._depth -= 1
+        if self._depth == 0 and self._fd is not None:
+            if fcntl is not None:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+            else:
+                os.lseek(self._fd, 0, os.SEEK_SET)
+                msvcrt.locking(self._fd, msvcrt.LK_UNLCK, 1)
+            os.close(self._fd)
+            self._fd = None
+        self._thread_lock.release()
+
+    def __enter__(self) -> "FileLock":
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.release()
+
+
+class LocalCoordinator:
+    """Koordinator satu proses: lock thread per nama, tanpa broadcast."""
+
+    shared = False
+
+    def __init__(self) -> None:
+        self._registry_lock = threading.Lock()
+        self._locks: Dict[str, threading.RLock] = {}
+
+    def lock(self, name: str):
+        with self._registry_lock:
+            lock = self._locks.get(name)
+            if lock is None:
+                lock = self._locks[name] = threading.RLock()
+            return lock
+
+    def event_lock(self, event_id: str):
+        """Lock yang menserialisasi perubahan chain satu event."""
+        return self.lock(f"event-{event_id}")
+
+    def publish(self, kind: str, event_id: str | None = None) -> None:
+        """Umumkan perubahan ke worker lain (tidak ada worker lain di mode ini)."""
+
+    def subscribe(self, callback: ChangeCallback) -> None:
+        """Daftarkan callback perubahan dari worker lain."""
+
+    def close(self) -> None:
+        """Hentikan thread poller (jika ada)."""
+
+
+class FileCoordinator(LocalCoordinator):
+    """Koordinator lintas proses lewat lock file & change log di ``state_dir``."""
+
+    shared = True
+
+    def __init__(self, state_dir: str, poll_interval: float = 0.2, max_log_bytes: int = 1 << 20) -> None:
+        super().__init__()
+        self.state_dir = state_dir
+        self.poll_interval = poll_interval
+        self.max_log_bytes = max_log_bytes
+        self.log_path = os.path.join(state_dir, "changes.log")
+        os.makedirs(os.path.join(state_dir, "locks"), exist_ok=True)
+        self._file_locks: Dict[str, FileLock] = {}
+        self._callbacks: List[ChangeCallback] = []
+        self._pid = str(os.getpid())
+        self._log_fd: int | None = None
+        st = os.fstat(self._log_handle())
+        # Riwayat sebelum start diabaikan
+        self._read_ino, self._offset = st.st_ino, st.st_size
+        self._stop = threading.Event()
+        self._poller: threading.Thread | None = None
+
+    def lock(self, name: str) -> FileLock:
+        with self._registry_lock:
+            lock = self._file_locks.get(name)
+            if lock is None:
+                safe_name = "".join(c if c.isalnum() or c in "-_." else "_" for c in name)
+                lock = self._file_locks[name] = FileLock(os.path.join(self.state_dir, "locks", f"{safe_name}.lock"))
+            return lock
+
+    # ---------- Broadcast ----------
+
+    def publish(self, kind: str, event_id: str | None = None) -> None:
+        line = f"{self._pid} {kind} {event_id or '-'}\n".encode("utf-8")
+        with self.lock("changes"):
+            fd = self._log_handle()
+            os.write(fd, line)
+            if os.fstat(fd).st_size > self.max_log_bytes:
+                # Rotasi: ganti dengan file kosong; pembaca melihat inode baru
+                tmp_path = f"{self.log_path}.tmp"
+                open(tmp_path, "wb").close()
+                os.replace(tmp_path, self.log_path)
+
+    def _log_handle(self) -> int:
+        """fd append ke change log terkini (dibuka ulang jika log sudah dirotasi proses lain)."""
+        if self._log_fd is not None:
+            try:
+                if os.stat(self.log_path).st_ino == os.fstat(self._log_fd).st_ino:
+                    return self._log_fd
+            except FileNotFoundError:
+                pass
+            os.close(self._log_fd)
+        self._log_fd = os.open(self.log_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        return self._log_fd
+
+    def subscribe(self, callback: ChangeCallback) -> None:
+        self._callbacks.append(callback)
+        if self._poller is None:
+            self._poller = threading.Thread(target=self._poll, name="change-poller", daemon=True)
+            self._poller.start()
+
+    def _poll(self) -> None:
+        while not self._stop.wait(self.poll_interval):
+            try:
+                changes = self._read_changes()
+            except OSError:
+                continue
+            for kind, event_id in changes:
+                for callback in self._callbacks:
+                    try:
+                        callback(kind, event_id)
+                    except Exception:  # jangan sampai poller mati
+                        pass
+
+    def _read_changes(self) -> List[tuple]:
+        changes: List[tuple] = []
+        with open(self.log_path, "rb") as f:
+            st = os.fstat(f.fileno())
+            if st.st_ino != self._read_ino:
+                # Log dirotasi: baris yang belum terbaca di log lama hilang
+                self._read_ino, self._offset = st.st_ino, 0
+                changes.append((ALL, None))
+            if st.st_size <= self._offset:
+                return changes
+            f.seek(self._offset)
+            data = f.read(st.st_size - self._offset)
+        # Baris terakhir yang belum lengkap dibaca lagi di putaran berikutnya
+        complete = data[: data.rfind(b"\n") + 1]
+        self._offset += len(complete)
+        for line in complete.decode("utf-8", "replace").splitlines():
+            parts = line.split(" ", 2)
+            if len(parts) != 3 or parts[0] == self._pid:
+                continue
+            changes.append((parts[1], None if parts[2] == "-" else parts[2]))
+        return changes
+
+    def close(self) -> None:
+        self._stop.set()
+        if self._log_fd is not None:
+            os.close(self._log_fd)
+            self._log_fd = None
+
+
+def open_coordinator(shared: bool, state_dir: str, poll_interval: float = 0.2) -> LocalCoordinator:
+    """Koordinator lintas proses jika ``shared`` (mode multi-worker), selain itu versi satu proses."""
+    if shared:
+        return FileCoordinator(state_dir, poll_interval=poll_interval)
+    return LocalCoordinator()
@@ -0,0 +1,33 @@
+"""Konfigurasi gunicorn untuk mode multi-worker ChainVote.
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+Jumlah worker diatur lewat ``CHAINVOTE_WORKERS`` (default: jumlah core CPU),
+thread per worker lewat ``CHAINVOTE_THREADS``. Worker ``gthread`` dipakai
+karena stream SSE menahan satu thread selama koneksi terbuka (sampai
+``SSE_MAX_DURATION`` detik). Agar observer tidak menghabiskan semua thread,
+jumlah stream per worker dibatasi ``CHAINVOTE_SSE_MAX_STREAMS`` (default:
+setengah thread); stream berikutnya ditolak 503 dan halaman tetap menampilkan
+hasil statis. Untuk banyak observer, naikkan ``CHAINVOTE_THREADS`` bersama
+batas tersebut, atau jalankan stream di deployment terpisah.
+"""
+
+import multiprocessing
+import os
+
+# Aktifkan lock lintas proses & broadcast perubahan di setiap worker
+os.environ.setdefault("CHAINVOTE_MULTIPROCESS", "1")
+
+bind = os.environ.get("CHAINVOTE_BIND", "0.0.0.0:8000")
+workers = int(os.environ.get("CHAINVOTE_WORKERS", multiprocessing.cpu_count()))
+worker_class = "gthread"
+threads = int(os.environ.get("CHAINVOTE_THREADS", "8"))
+# Sisakan minimal separuh thread untuk request biasa (dibaca app.py di setiap worker)
+os.environ.setdefault("CHAINVOTE_SSE_MAX_STREAMS", str(max(1, threads // 2)))
+# App dibuat per worker (bukan di master sebelum fork): file handle, mmap,
+# thread writer & poller perubahan tidak boleh diwariskan lewat fork
+preload_app = False
+# Stream SSE berumur sampai SSE_MAX_DURATION detik
+timeout = 330
+graceful_timeout = 30
+accesslog = "-"
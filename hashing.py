@@ -0,0 +1,157 @@
+"""Engine hashing blok: encoding kanonik, algoritma per event, dan API batch.
+
+Dua versi skema hash:
+
+- **versi 1** (chain lama): SHA-256 atas gabungan string
+  ``f"{index}{timestamp}{voter_id}{candidate}{previous_hash}"``. Gabungan ini
+  ambigu (``index=1, voter="12"`` sama dengan ``index=11, voter="2"``), tetapi
+  tetap didukung agar chain yang sudah ada bisa diverifikasi.
+- **versi 2**: setiap field dikodekan UTF-8 dengan prefix panjang 4 byte
+  (big-endian) setelah tag domain ``chainvote-block/2``; tidak ada dua blok
+  berbeda yang menghasilkan byte input yang sama. Algoritma bisa dipilih per
+  event: ``sha256`` atau ``blake2b`` (digest 32 byte, sehingga format biner
+  & kolom digest lain tidak berubah).
+
+Skema sebuah event dicatat di metadata-nya (``hash_version``,
+``hash_algorithm``); event tanpa field tersebut adalah chain versi 1.
+``hasher_for(meta)`` mengembalikan ``BlockHasher`` yang sesuai.
+
+``digest_many`` / ``hash_many`` menghitung banyak blok sekaligus (validasi,
+audit, impor massal). Untuk field ASCII (kasus umum) input versi 2 disusun
+sebagai satu string dengan prefix panjang dari tabel yang sudah dihitung,
+lalu di-encode sekali; tidak ada ``struct.pack`` / ``bytes`` per field.
+Buffer ``bytearray`` yang dipakai ulang atau ``hasher.update`` per field
+justru lebih lambat di CPython (setiap field tetap harus di-encode menjadi
+objek ``bytes`` baru, ditambah biaya panggilan per potongan); bandingkan
+lewat ``benchmark.py`` (``hash_many_v2``).
+"""
+
+import hashlib
+import struct
+from functools import lru_cache, partial
+from typing import Any, Callable, Dict, Iterable, List, Sequence
+
+LEGACY_VERSION = 1
+CURRENT_VERSION = 2
+DEFAULT_ALGORITHM = "sha256"
+DIGEST_SIZE = 32
+
+ALGORITHMS: Dict[str, Callable[..., Any]] = {
+    "sha256": hashlib.sha256,
+    "blake2b": partial(hashlib.blake2b, digest_size=DIGEST_SIZE),
+}
+
+_DOMAIN_TAG = b"chainvote-block/2"
+_LENGTH = struct.Struct(">I")
+# Prefix panjang field (4 byte big-endian) sebagai karakter latin-1, untuk jalur ASCII
+_PREFIXES = [_LENGTH.pack(n).decode("latin-1") for n in range(4096)]
+_TAG_TEXT = _DOMAIN_TAG.decode("ascii")
+
+
+def _encode_v2(index: Any, timestamp: Any, voter_id: Any, candidate: Any, previous_hash: Any) -> bytes:
+    fields = a, b, c, d, e = str(index), str(timestamp), str(voter_id), str(candidate), str(previous_hash)
+    try:
+        if a.isascii() and b.isascii() and c.isascii() and d.isascii() and e.isascii():
+            # ASCII: UTF-8 == latin-1, jadi prefix & field bisa digabung sebagai satu string
+            p = _PREFIXES
+            return (
+                f"{_TAG_TEXT}{p[len(a)]}{a}{p[len(b)]}{b}{p[len(c)]}{c}{p[len(d)]}{d}{p[len(e)]}{e}"
+            ).encode("latin-1")
+    except IndexError:  # field sangat panjang: di luar tabel prefix
+        pass
+    parts = [_DOMAIN_TAG]
+    for field in fields:
+        data = field.encode("utf-8")
+        parts.append(_LENGTH.pack(len(data)))
+        parts.append(data)
+    return b"".join(parts)
+
+
+class BlockHasher:
+    """Hash blok menurut satu skema (versi + algoritma)."""
+
+    __slots__ = ("version", "algorithm", "_new")
+
+    def __init__(self, algorithm: str = DEFAULT_ALGORITHM, version: int = CURRENT_VERSION) -> None:
+        if algorithm not in ALGORITHMS:
+            raise ValueError(f"algoritma hash tidak dikenal: {algorithm}")
+        if version not in (LEGACY_VERSION, CURRENT_VERSION):
+            raise ValueError(f"versi skema hash tidak dikenal: {version}")
+        if version == LEGACY_VERSION and algorithm != "sha256":
+            raise ValueError("skema hash versi 1 hanya mendukung sha256")
+        self.version = version
+        self.algorithm = algorithm
+        self._new = ALGORITHMS[algorithm]
+
+    @property
+    def spec(self) -> tuple:
+        """(versi, algoritma): bisa dikirim ke proses lain lalu dibuka dengan ``get_hasher``."""
+        return self.version, self.algorithm
+
+    def __repr__(self) -> str:
+        return f"BlockHasher(algorithm={self.algorithm!r}, version={self.version})"
+
+    # ---------- Satu blok ----------
+
+    def encode(self, index: Any, timestamp: Any, voter_id: Any, candidate: Any, previous_hash: Any) -> bytes:
+        """Byte input hash dari field blok (sesuai versi skema)."""
+        if self.version == LEGACY_VERSION:
+            return f"{index}{timestamp}{voter_id}{candidate}{previous_hash}".encode("utf-8")
+        return _encode_v2(index, timestamp, voter_id, candidate, previous_hash)
+
+    def digest(self, index: Any, timestamp: Any, voter_id: Any, candidate: Any, previous_hash: Any) -> bytes:
+        """Digest mentah (32 byte) dari field blok."""
+        return self._new(self.encode(index, timestamp, voter_id, candidate, previous_hash)).digest()
+
+    def hash(self, index: Any, timestamp: Any, voter_id: Any, candidate: Any, previous_hash: Any) -> str:
+        """Hash hex dari field blok (nilai field ``hash`` pada blok)."""
+        return self.digest(index, timestamp, voter_id, candidate, previous_hash).hex()
+
+    def block_hash(self, block: Dict[str, Any]) -> str:
+        """Hash hex yang seharusnya dimiliki ``block`` (dihitung ulang dari field-nya)."""
+        return self.hash(
+            block.get("index"),
+            block.get("timestamp"),
+            block.get("voter_id"),
+            block.get("candidate"),
+            block.get("previous_hash"),
+        )
+
+    # ---------- Batch ----------
+
+    def digest_many(self, rows: Iterable[Sequence[Any]]) -> List[bytes]:
+        """Digest banyak blok; ``rows`` berisi (index, timestamp, voter_id, candidate, previous_hash).
+
+        Konstruktor hash & encoder diikat sekali untuk seluruh batch.
+        """
+        new = self._new
+        if self.version == LEGACY_VERSION:
+            return [new(f"{r[0]}{r[1]}{r[2]}{r[3]}{r[4]}".encode("utf-8")).digest() for r in rows]
+        encode = _encode_v2
+        return [new(encode(r[0], r[1], r[2], r[3], r[4])).digest() for r in rows]
+
+    def hash_many(self, rows: Iterable[Sequence[Any]]) -> List[str]:
+        """Seperti ``digest_many`` tetapi hasilnya hash hex."""
+        return [digest.hex() for digest in self.digest_many(rows)]
+
+
+@lru_cache(maxsize=None)
+def get_hasher(version: int = CURRENT_VERSION, algorithm: str = DEFAULT_ALGORITHM) -> BlockHasher:
+    """Instance ``BlockHasher`` (dipakai bersama) untuk skema tertentu."""
+    return BlockHasher(algorithm, version)
+
+
+LEGACY_HASHER = get_hasher(LEGACY_VERSION, "sha256")
+
+
+def hasher_for(meta: Dict[str, Any] | None) -> BlockHasher:
+    """Hasher sesuai skema yang tercatat di metadata event (tanpa catatan = versi 1)."""
+    if not meta:
+        return LEGACY_HASHER
+    return get_hasher(meta.get("hash_version", LEGACY_VERSION), meta.get("hash_algorithm", "sha256"))
+
+
+def hash_settings(algorithm: str = DEFAULT_ALGORITHM) -> Dict[str, Any]:
+    """Field metadata untuk event baru: skema terbaru dengan ``algorithm``."""
+    get_hasher(CURRENT_VERSION, algorithm)  # validasi nama algoritma
+    return {"hash_version": CURRENT_VERSION, "hash_algorithm": algorithm}
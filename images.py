@@ -0,0 +1,265 @@
+"""Pipeline gambar kandidat: validasi, resize & thumbnail di worker pool background.
+
+Route admin hanya membaca byte upload lalu mengantrekannya; worker memeriksa
+isi file (bukan sekadar ekstensi), mengecilkan gambar ke ``max_dimension``,
+membuat thumbnail ``thumbnail_size`` untuk halaman voting, lalu menyimpan
+keduanya dengan nama berbasis hash isi (``<sha256[:20]>.<ext>``). File dengan
+nama seperti itu tidak pernah berubah isinya, jadi aman di-cache browser
+selamanya (lihat ``is_content_addressed``), dan upload gambar yang sama
+cukup disimpan sekali.
+
+Resize memakai Pillow jika terpasang. Tanpa Pillow, gambar hanya divalidasi
+lewat signature format-nya dan disimpan apa adanya (gambar penuh dan
+thumbnail menunjuk file yang sama).
+
+Karena satu file bisa dipakai beberapa event, file lama hanya dihapus jika
+tidak lagi dirujuk metadata event mana pun (lihat ``media_references``).
+Aplikasi melakukannya saat gambar kandidat diganti atau event dihapus; sisa
+file dari versi sebelumnya dibersihkan dengan (hanya file bernama hash isi
+yang pernah dibuat pipeline ini; file lain di folder upload dibiarkan):
+
+    python images.py prune [--dry-run]
+"""
+
+import argparse
+import hashlib
+import io
+import os
+import re
+import sys
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Set
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow opsional
+    Image = None
+
+DEFAULT_MAX_BYTES = 5 * 1024 * 1024
+DEFAULT_MAX_DIMENSION = 1024
+DEFAULT_THUMBNAIL_SIZE = 320
+
+# Signature byte awal -> ekstensi file
+_SIGNATURES = (
+    (b"\x89PNG\r\n\x1a\n", "png"),
+    (b"\xff\xd8\xff", "jpg"),
+    (b"GIF87a", "gif"),
+    (b"GIF89a", "gif"),
+)
+_PIL_FORMATS = {"PNG": "png", "JPEG": "jpg", "GIF": "gif"}
+_CONTENT_NAME = re.compile(r"^[0-9a-f]{20}\.(png|jpg|gif)$")
+
+
+class ImageRejected(ValueError):
+    """File upload bukan gambar yang didukung (atau terlalu besar)."""
+
+
+class ProcessedImage(NamedTuple):
+    image: str  # nama file gambar (sudah di-resize) di folder upload
+    thumbnail: str  # nama file thumbnail
+
+
+def sniff_format(data: bytes) -> str | None:
+    """Ekstensi gambar berdasarkan signature isinya, atau None jika bukan PNG/JPEG/GIF."""
+    for signature, ext in _SIGNATURES:
+        if data.startswith(signature):
+            return ext
+    return None
+
+
+def is_content_addressed(filename: str) -> bool:
+    """True jika nama file berasal dari hash isinya (isi file tidak akan pernah berubah)."""
+    return bool(_CONTENT_NAME.match(filename))
+
+
+def media_references(metas: Iterable[Dict[str, Any]]) -> Set[str]:
+    """Nama file gambar & thumbnail kandidat yang dirujuk metadata event."""
+    names: Set[str] = set()
+    for meta in metas:
+        for key in ("candidate_images", "candidate_thumbnails"):
+            names.update(name for name in (meta.get(key) or {}).values() if name)
+    return names
+
+
+class ImagePipeline:
+    """Antrean pemrosesan gambar kandidat di thread pool berukuran tetap."""
+
+    def __init__(
+        self,
+        upload_dir: str,
+        workers: int = 2,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        max_dimension: int = DEFAULT_MAX_DIMENSION,
+        thumbnail_size: int = DEFAULT_THUMBNAIL_SIZE,
+    ) -> None:
+        self.upload_dir = upload_dir
+        self.max_bytes = max_bytes
+        self.max_dimension = max_dimension
+        self.thumbnail_size = thumbnail_size
+        self._pool = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="image-pipeline")
+        self._lock = threading.Lock()
+        # (event_id, kandidat) -> "processing" atau pesan error terakhir
+        self._status: Dict[tuple, str] = {}
+        os.makedirs(upload_dir, exist_ok=True)
+
+    # ---------- Antrean ----------
+
+    def submit(
+        self,
+        event_id: str,
+        candidate: str,
+        data: bytes,
+        on_done: Callable[[ProcessedImage], None],
+    ) -> Future:
+        """Antrekan satu gambar; ``on_done`` dipanggil di thread worker setelah file tersimpan.
+
+        Mengembalikan segera. Gagal validasi / proses dicatat di ``status``.
+        """
+        key = (event_id, candidate)
+        with self._lock:
+            self._status[key] = "processing"
+        return self._pool.submit(self._run, key, data, on_done)
+
+    def _run(self, key: tuple, data: bytes, on_done: Callable[[ProcessedImage], None]) -> ProcessedImage | None:
+        try:
+            result = self.process(data)
+            on_done(result)
+        except Exception as exc:  # jangan sampai worker mati; error ditampilkan di halaman admin
+            with self._lock:
+                self._status[key] = str(exc) or exc.__class__.__name__
+            return None
+        with self._lock:
+            if self._status.get(key) == "processing":
+                del self._status[key]
+        return result
+
+    def status(self, event_id: str) -> Dict[str, str]:
+        """Kandidat event yang gambarnya masih diproses atau gagal: kandidat -> status."""
+        with self._lock:
+            return {cand: state for (eid, cand), state in self._status.items() if eid == event_id}
+
+    # ---------- Proses ----------
+
+    def process(self, data: bytes) -> ProcessedImage:
+        """Validasi lalu simpan gambar ukuran penuh & thumbnail (sinkron)."""
+        if len(data) > self.max_bytes:
+            raise ImageRejected(f"ukuran gambar melebihi {self.max_bytes // 1024} KB")
+        ext = sniff_format(data)
+        if ext is None:
+            raise ImageRejected("file bukan gambar PNG/JPEG/GIF")
+        if Image is None:
+            name = self._store(data, ext)
+            return ProcessedImage(name, name)
+        try:
+            with Image.open(io.BytesIO(data)) as img:
+                img.load()
+                fmt = _PIL_FORMATS.get(img.format)
+                if fmt is None:
+                    raise ImageRejected("format gambar tidak didukung")
+                image = self._store(self._resized(img, self.max_dimension, fmt), fmt)
+                thumbnail = self._store(self._resized(img, self.thumbnail_size, fmt), fmt)
+        except ImageRejected:
+            raise
+        except Exception as exc:  # file rusak, decompression bomb, dsb.
+            raise ImageRejected(f"gambar tidak bisa dibaca ({exc.__class__.__name__})") from exc
+        return ProcessedImage(image, thumbnail)
+
+    def _resized(self, img, size: int, fmt: str) -> bytes:
+        copy = img.copy()
+        copy.thumbnail((size, size))  # menjaga rasio, tidak pernah memperbesar
+        if fmt == "jpg" and copy.mode not in ("RGB", "L"):
+            copy = copy.convert("RGB")
+        out = io.BytesIO()
+        if fmt == "jpg":
+            copy.save(out, format="JPEG", quality=85, optimize=True, progressive=True)
+        elif fmt == "png":
+            copy.save(out, format="PNG", optimize=True)
+        else:
+            copy.save(out, format="GIF")
+        return out.getvalue()
+
+    def _store(self, data: bytes, ext: str) -> str:
+        """Simpan dengan nama hash isi (atomik); file yang sudah ada tidak ditulis ulang."""
+        name = f"{hashlib.sha256(data).hexdigest()[:20]}.{ext}"
+        path = os.path.join(self.upload_dir, name)
+        if not os.path.exists(path):
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        return name
+
+    # ---------- Hapus file ----------
+
+    def exists(self, filename: str) -> bool:
+        return os.path.exists(os.path.join(self.upload_dir, filename))
+
+    def remove(self, filenames: Iterable[str]) -> List[str]:
+        """Hapus file di folder upload (hanya nama file polos, bukan path). Mengembalikan yang terhapus."""
+        removed = []
+        for name in filenames:
+            if not name or os.path.basename(name) != name:
+                continue
+            try:
+                os.remove(os.path.join(self.upload_dir, name))
+            except FileNotFoundError:
+                continue
+            removed.append(name)
+        return removed
+
+    def unreferenced(self, referenced: Set[str]) -> List[str]:
+        """File buatan pipeline ini (nama hash isi) yang tidak ada di ``referenced``.
+
+        File lain di folder upload (upload lama bernama asli, ``.gitkeep``, file
+        yang ditaruh operator, file sementara) tidak pernah disentuh.
+        """
+        return sorted(
+            name
+            for name in os.listdir(self.upload_dir)
+            if is_content_addressed(name)
+            and name not in referenced
+            and os.path.isfile(os.path.join(self.upload_dir, name))
+        )
+
+    def close(self) -> None:
+        self._pool.shutdown(wait=False)
+
+
+def main(argv: list | None = None) -> int:
+    import app as chainvote
+    from storage import open_storage
+
+    parser = argparse.ArgumentParser(description="Kelola file gambar kandidat ChainVote.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    cmd = sub.add_parser("prune", help="hapus gambar hasil pipeline yang tidak dirujuk event mana pun")
+    cmd.add_argument("--dry-run", action="store_true", help="hanya tampilkan file yang akan dihapus")
+    args = parser.parse_args(argv)
+
+    store, user_store = open_storage(
+        chainvote.STORAGE_BACKEND,
+        meta_file=chainvote.EVENTS_META_FILE,
+        chains_dir=chainvote.CHAINS_DIR,
+        users_file=chainvote.USERS_FILE,
+        sqlite_file=chainvote.SQLITE_FILE,
+        archive_dir=chainvote.ARCHIVE_DIR,
+    )
+    pipeline = ImagePipeline(os.path.abspath(chainvote.UPLOAD_FOLDER), workers=1)
+    try:
+        unused = pipeline.unreferenced(media_references(store.list_event_meta()))
+        if args.dry_run:
+            for name in unused:
+                print(name)
+            print(f"{len(unused)} file tidak dirujuk event mana pun.")
+        else:
+            removed = pipeline.remove(unused)
+            print(f"{len(removed)} file gambar dihapus.")
+    finally:
+        pipeline.close()
+        store.close()
+        user_store.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
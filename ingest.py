@@ -0,0 +1,217 @@
+"""Ingest vote ChainVote: satu writer per event dengan group commit.
+
+Thread request tidak pernah menulis blockchain secara langsung. Mereka
+mengirim (event_id, voter_id, candidate) ke antrean event tersebut, lalu satu
+thread writer per event mengambil semua vote yang sedang antre, memeriksanya
+secara berurutan (kandidat valid, voter belum pernah vote), merangkai bloknya
+dan menyimpannya dengan satu penulisan durable. Setiap request baru mendapat
+index bloknya setelah kelompok tersebut benar-benar tersimpan.
+
+Upload massal (mis. dari TPS/kiosk offline) memakai ``submit_many``: semua
+entri divalidasi sekaligus lalu dirangkai dan disimpan dalam satu commit di
+bawah lock event yang sama dengan thread writer.
+
+Di mode multi-worker, ``lock_factory`` memberikan lock lintas proses
+(lihat ``coordination``) sehingga writer di worker berbeda tidak merangkai
+blok dari ujung chain yang sama.
+
+Thread writer sebuah event berhenti sendiri setelah antreannya kosong selama
+``idle_timeout`` detik (event yang sudah ditutup / dihapus tidak menyisakan
+thread); vote berikutnya untuk event itu membuat writer baru.
+"""
+
+import queue
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List
+
+
+class VoteRejected(Exception):
+    """Vote ditolak oleh writer. ``reason`` berisi salah satu konstanta di bawah."""
+
+    ALREADY_VOTED = "already_voted"
+    INVALID_CANDIDATE = "invalid_candidate"
+    EVENT_NOT_FOUND = "event_not_found"
+    EVENT_CLOSED = "event_closed"
+    INVALID_ENTRY = "invalid_entry"
+
+    def __init__(self, reason: str) -> None:
+        super().__init__(reason)
+        self.reason = reason
+
+
+class _PendingVote:
+    __slots__ = ("voter_id", "candidate", "future")
+
+    def __init__(self, voter_id: str, candidate: str) -> None:
+        self.voter_id = voter_id
+        self.candidate = candidate
+        self.future: Future = Future()
+
+
+class VoteWriter:
+    """Writer tunggal per event untuk vote yang masuk dari banyak thread.
+
+    - ``find_event(event_id)`` mengembalikan event terkini (dengan blockchain).
+    - ``has_voted(event, voter_id)`` memeriksa apakah voter sudah punya blok.
+    - ``commit_votes(event, [(voter_id, candidate), ...])`` merangkai blok baru,
+      menyimpannya dalam satu penulisan durable, dan mengembalikan blok-blok itu.
+    - ``lock_factory(event_id)`` (opsional) mengembalikan lock event; default
+      ``threading.RLock`` per event di proses ini.
+    - ``idle_timeout``: detik tanpa vote sebelum thread writer sebuah event berhenti.
+    """
+
+    def __init__(
+        self,
+        find_event: Callable[[str], Dict[str, Any] | None],
+        has_voted: Callable[[Dict[str, Any], str], bool],
+        commit_votes: Callable[[Dict[str, Any], List[tuple]], List[Dict[str, Any]]],
+        max_batch: int = 256,
+        lock_factory: Callable[[str], Any] | None = None,
+        idle_timeout: float = 60.0,
+    ) -> None:
+        self._find_event = find_event
+        self._has_voted = has_voted
+        self._commit_votes = commit_votes
+        self.max_batch = max(1, max_batch)
+        self._lock_factory = lock_factory
+        self.idle_timeout = idle_timeout
+        self._registry_lock = threading.Lock()
+        self._queues: Dict[str, queue.Queue] = {}
+        self._locks: Dict[str, threading.RLock] = {}
+
+    def event_lock(self, event_id: str) -> Any:
+        """Lock per-event yang dipegang writer saat commit.
+
+        Jalur lain yang mengubah chain (mis. tamper) memakai lock yang sama.
+        """
+        if self._lock_factory is not None:
+            return self._lock_factory(event_id)
+        with self._registry_lock:
+            lock = self._locks.get(event_id)
+            if lock is None:
+                lock = self._locks[event_id] = threading.RLock()
+            return lock
+
+    def _queue_for(self, event_id: str) -> queue.Queue:
+        """Antrean event (thread writer dibuat jika belum ada). Dipanggil di bawah ``_registry_lock``."""
+        q = self._queues.get(event_id)
+        if q is None:
+            q = self._queues[event_id] = queue.Queue()
+            thread = threading.Thread(
+                target=self._run,
+                args=(event_id, q),
+                name=f"vote-writer-{event_id}",
+                daemon=True,
+            )
+            thread.start()
+        return q
+
+    def submit_async(self, event_id: str, voter_id: str, candidate: str) -> Future:
+        """Masukkan vote ke antrean event; Future berisi index blok setelah tersimpan."""
+        pending = _PendingVote(voter_id, candidate)
+        # put di bawah lock registry: writer yang sedang berhenti tidak bisa melewatkan vote ini
+        with self._registry_lock:
+            self._queue_for(event_id).put(pending)
+        return pending.future
+
+    def submit(self, event_id: str, voter_id: str, candidate: str, timeout: float | None = None) -> int:
+        """Kirim vote dan tunggu sampai tersimpan. Mengembalikan index blok.
+
+        Melempar ``VoteRejected`` jika vote ditolak.
+        """
+        return self.submit_async(event_id, voter_id, candidate).result(timeout)
+
+    def submit_many(self, event_id: str, entries: List[tuple]) -> List[Dict[str, Any]]:
+        """Validasi & simpan banyak vote sekaligus (satu penulisan durable).
+
+        ``entries`` berisi pasangan (voter_id, candidate). Hasilnya satu dict per
+        entri dengan urutan yang sama: ``{"accepted": True, "index": n}`` atau
+        ``{"accepted": False, "reason": ...}``. Melempar ``VoteRejected`` dengan
+        ``EVENT_NOT_FOUND`` jika event tidak ada atau ``EVENT_CLOSED`` jika sudah ditutup.
+        """
+        with self.event_lock(event_id):
+            event = self._find_event(event_id)
+            if event is None:
+                raise VoteRejected(VoteRejected.EVENT_NOT_FOUND)
+            if event.get("status") == "closed":
+                raise VoteRejected(VoteRejected.EVENT_CLOSED)
+            reasons = self._check_votes(event, entries)
+            accepted = [i for i, reason in enumerate(reasons) if reason is None]
+            blocks = self._commit_votes(event, [entries[i] for i in accepted]) if accepted else []
+
+        results: List[Dict[str, Any]] = [{"accepted": False, "reason": reason} for reason in reasons]
+        for i, block in zip(accepted, blocks):
+            results[i] = {"accepted": True, "index": block["index"]}
+        return results
+
+    def _check_votes(self, event: Dict[str, Any], entries: List[tuple]) -> List[str | None]:
+        """Alasan penolakan per entri (None = diterima), diperiksa berurutan.
+
+        Voter yang muncul dua kali di entri yang sama hanya diterima yang pertama.
+        """
+        candidates = set(event.get("candidates", []))
+        seen_voters = set()
+        reasons: List[str | None] = []
+        for voter_id, candidate in entries:
+            if not isinstance(voter_id, str) or not voter_id or not isinstance(candidate, str):
+                # Nilai JSON selain string (list, dict, angka) tidak bisa dicocokkan dengan kandidat
+                reasons.append(VoteRejected.INVALID_ENTRY)
+            elif candidate not in candidates:
+                reasons.append(VoteRejected.INVALID_CANDIDATE)
+            elif voter_id in seen_voters or self._has_voted(event, voter_id):
+                reasons.append(VoteRejected.ALREADY_VOTED)
+            else:
+                seen_voters.add(voter_id)
+                reasons.append(None)
+        return reasons
+
+    # ---------- Thread writer ----------
+
+    def _run(self, event_id: str, q: queue.Queue) -> None:
+        while True:
+            try:
+                first = q.get(timeout=self.idle_timeout)
+            except queue.Empty:
+                with self._registry_lock:
+                    if q.empty():
+                        # Idle: lepaskan antrean; vote berikutnya membuat writer baru
+                        del self._queues[event_id]
+                        return
+                continue
+            batch = [first]
+            # Ambil semua vote yang sudah antre (group commit), tanpa menunggu
+            while len(batch) < self.max_batch:
+                try:
+                    batch.append(q.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                self._commit_batch(event_id, batch)
+            except Exception as exc:  # jangan sampai thread writer mati
+                for pending in batch:
+                    if not pending.future.done():
+                        pending.future.set_exception(exc)
+
+    def _commit_batch(self, event_id: str, batch: List[_PendingVote]) -> None:
+        with self.event_lock(event_id):
+            event = self._find_event(event_id)
+            if event is None or event.get("status") == "closed":
+                reason = VoteRejected.EVENT_NOT_FOUND if event is None else VoteRejected.EVENT_CLOSED
+                for pending in batch:
+                    pending.future.set_exception(VoteRejected(reason))
+                return
+
+            reasons = self._check_votes(event, [(p.voter_id, p.candidate) for p in batch])
+            accepted: List[_PendingVote] = []
+            for pending, reason in zip(batch, reasons):
+                if reason is None:
+                    accepted.append(pending)
+                else:
+                    pending.future.set_exception(VoteRejected(reason))
+
+            if not accepted:
+                return
+            blocks = self._commit_votes(event, [(p.voter_id, p.candidate) for p in accepted])
+            for pending, block in zip(accepted, blocks):
+                pending.future.set_result(block["index"])
@@ -0,0 +1,195 @@
+"""Push hasil voting real-time lewat Server-Sent Events (SSE).
+
+Setiap kali blok baru di-commit, ``ChainFeed`` membangunkan semua stream yang
+sedang menunggu pada event tersebut. Stream lalu hanya mengirim blok yang
+belum dikirim (header blok + delta tally), jadi biaya per vote O(1) per
+observer, bukan O(panjang chain) seperti reload halaman blockchain.
+
+Format stream:
+
+- ``snapshot``: dikirim saat koneksi baru / setelah chain ditulis ulang;
+  berisi ``chain_length``, ``tally`` lengkap dan header blok terakhir
+- ``block``: satu per blok baru; ``id`` SSE = index blok sehingga browser
+  otomatis mengirim ``Last-Event-ID`` saat reconnect dan stream dilanjutkan
+  dari blok berikutnya
+- komentar ``: heartbeat`` setiap ``heartbeat`` detik saat tidak ada vote
+
+Setiap stream menahan satu thread worker selama terbuka. ``StreamSlots``
+membatasi jumlah stream bersamaan per worker agar thread yang tersisa tetap
+melayani request biasa (vote, login, halaman).
+"""
+
+import json
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, List, Tuple
+
+
+def format_sse(data: Dict[str, Any], event: str | None = None, event_id: int | None = None) -> str:
+    """Satu pesan SSE (``id``/``event``/``data``) diakhiri baris kosong."""
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    if event is not None:
+        lines.append(f"event: {event}")
+    lines.append("data: " + json.dumps(data, ensure_ascii=False, separators=(",", ":")))
+    return "\n".join(lines) + "\n\n"
+
+
+def block_header(block: Dict[str, Any]) -> Dict[str, Any]:
+    """Header blok yang dikirim ke observer (tanpa voter_id)."""
+    return {
+        "index": block.get("index"),
+        "timestamp": block.get("timestamp"),
+        "candidate": block.get("candidate"),
+        "previous_hash": block.get("previous_hash"),
+        "hash": block.get("hash"),
+    }
+
+
+class StreamSlots:
+    """Batas jumlah stream SSE yang terbuka bersamaan di satu proses."""
+
+    def __init__(self, limit: int) -> None:
+        self.limit = max(0, limit)
+        self._lock = threading.Lock()
+        self._active = 0
+
+    @property
+    def active(self) -> int:
+        return self._active
+
+    def acquire(self) -> bool:
+        """Ambil satu slot; False jika semua slot sedang dipakai."""
+        with self._lock:
+            if self._active >= self.limit:
+                return False
+            self._active += 1
+            return True
+
+    def release(self) -> None:
+        """Kembalikan slot (dipanggil saat koneksi stream ditutup)."""
+        with self._lock:
+            self._active = max(0, self._active - 1)
+
+
+class ChainFeed:
+    """Notifikasi perubahan chain per event untuk stream SSE.
+
+    ``version`` naik setiap ada blok baru, ``resets`` naik setiap chain ditulis
+    ulang (mis. tamper) sehingga observer perlu snapshot baru.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._conditions: Dict[str, threading.Condition] = {}
+        self._versions: Dict[str, Tuple[int, int]] = {}
+
+    def _condition(self, event_id: str) -> threading.Condition:
+        with self._lock:
+            cond = self._conditions.get(event_id)
+            if cond is None:
+                cond = self._conditions[event_id] = threading.Condition()
+            return cond
+
+    def state(self, event_id: str) -> Tuple[int, int]:
+        """(version, resets) terkini untuk event."""
+        with self._condition(event_id):
+            return self._versions.get(event_id, (0, 0))
+
+    def notify_blocks(self, event_id: str) -> None:
+        """Dipanggil setelah blok baru tersimpan."""
+        self._bump(event_id, reset=False)
+
+    def notify_reset(self, event_id: str) -> None:
+        """Dipanggil setelah chain ditulis ulang / event dihapus."""
+        self._bump(event_id, reset=True)
+
+    def _bump(self, event_id: str, reset: bool) -> None:
+        cond = self._condition(event_id)
+        with cond:
+            version, resets = self._versions.get(event_id, (0, 0))
+            self._versions[event_id] = (version + 1, resets + 1 if reset else resets)
+            cond.notify_all()
+
+    def wait(self, event_id: str, version: int, timeout: float) -> Tuple[int, int]:
+        """Tunggu sampai version berubah dari ``version`` (atau timeout)."""
+        cond = self._condition(event_id)
+        with cond:
+            cond.wait_for(lambda: self._versions.get(event_id, (0, 0))[0] != version, timeout)
+            return self._versions.get(event_id, (0, 0))
+
+
+def stream_chain(
+    feed: ChainFeed,
+    event_id: str,
+    get_chain: Callable[[str], List[Dict[str, Any]]],
+    get_tally: Callable[[str], Dict[str, int]],
+    last_index: int | None = None,
+    heartbeat: float = 15.0,
+    max_duration: float = 300.0,
+    replay_max: int = 1000,
+    retry_ms: int = 3000,
+) -> Iterator[str]:
+    """Generator pesan SSE untuk satu observer.
+
+    ``last_index`` adalah index blok terakhir yang sudah diterima klien
+    (dari ``Last-Event-ID``); jika negatif, di luar chain atau tertinggal lebih
+    dari ``replay_max`` blok, klien dikirimi snapshot baru. Stream ditutup setelah ``max_duration``
+    detik agar thread tidak tertahan selamanya; browser reconnect otomatis.
+    """
+    version, resets = feed.state(event_id)
+    yield f"retry: {retry_ms}\n\n"
+
+    def snapshot(chain: List[Dict[str, Any]]) -> str:
+        head = chain[-1] if chain else None
+        return format_sse(
+            {
+                "chain_length": len(chain),
+                "tally": dict(get_tally(event_id)),
+                "head": block_header(head) if head else None,
+            },
+            event="snapshot",
+            event_id=len(chain) - 1,
+        )
+
+    chain = get_chain(event_id)
+    if (
+        last_index is None
+        or last_index < 0
+        or last_index >= len(chain)
+        or len(chain) - 1 - last_index > replay_max
+    ):
+        yield snapshot(chain)
+        sent = len(chain) - 1
+    else:
+        sent = last_index
+
+    deadline = time.monotonic() + max_duration
+    while True:
+        chain = get_chain(event_id)
+        if not chain:
+            yield format_sse({"event_id": event_id}, event="closed")
+            return
+        if len(chain) - 1 < sent:
+            yield snapshot(chain)
+            sent = len(chain) - 1
+        # Slice hanya blok baru: O(jumlah blok baru), bukan O(panjang chain)
+        for block in chain[sent + 1 :]:
+            header = block_header(block)
+            header["tally_delta"] = {block.get("candidate"): 1}
+            yield format_sse(header, event="block", event_id=block.get("index"))
+            sent = block.get("index", sent + 1)
+
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return
+        new_version, new_resets = feed.wait(event_id, version, min(heartbeat, remaining))
+        if new_version == version:
+            yield ": heartbeat\n\n"
+        elif new_resets != resets:
+            chain = get_chain(event_id)
+            if chain:
+                yield snapshot(chain)
+                sent = len(chain) - 1
+        version, resets = new_version, new_resets
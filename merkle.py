@@ -0,0 +1,206 @@
+"""Merkle tree per event di atas hash blok (gaya RFC 6962 / Certificate Transparency).
+
+- leaf  = SHA-256(0x00 || hash blok)
+- node  = SHA-256(0x01 || kiri || kanan)
+
+Tree diperbarui secara incremental setiap blok ditambahkan: hash subtree
+sempurna (ukuran 2^k, rata kiri) disimpan per level, sehingga root, bukti
+inklusi dan bukti konsistensi untuk ukuran chain berapa pun cukup
+O(log n) lookup + hashing, tanpa menghitung ulang seluruh chain.
+
+Fungsi ``verify_inclusion`` / ``verify_consistency`` bisa dipakai pemilih atau
+auditor untuk mengecek bukti tanpa mengunduh chain.
+"""
+
+import hashlib
+import threading
+from typing import Iterable, List
+
+from compact_chain import encode_hash
+
+EMPTY_ROOT = hashlib.sha256(b"").digest()
+
+
+def leaf_hash(data: bytes) -> bytes:
+    return hashlib.sha256(b"\x00" + data).digest()
+
+
+def node_hash(left: bytes, right: bytes) -> bytes:
+    return hashlib.sha256(b"\x01" + left + right).digest()
+
+
+def block_leaf(block_hash: str) -> bytes:
+    """Data leaf untuk hash blok: digest mentah jika hex 64 karakter, selain itu byte UTF-8-nya."""
+    digest = encode_hash(block_hash)
+    if digest is not None:
+        return digest
+    return str(block_hash).encode("utf-8")
+
+
+def _split(n: int) -> int:
+    """Pangkat dua terbesar yang < n (n > 1)."""
+    return 1 << ((n - 1).bit_length() - 1)
+
+
+class MerkleTree:
+    """Merkle tree append-only dengan cache hash subtree sempurna per level."""
+
+    def __init__(self, leaves: Iterable[bytes] = ()) -> None:
+        self._lock = threading.RLock()
+        # _levels[k] = hash subtree sempurna berukuran 2^k yang berurutan (32 byte per node)
+        self._levels: List[bytearray] = [bytearray()]
+        self._size = 0
+        self.extend(leaves)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def append(self, data: bytes) -> None:
+        """Tambahkan satu leaf (data mentah, mis. ``block_leaf(block["hash"])``)."""
+        with self._lock:
+            self._levels[0] += leaf_hash(data)
+            position = self._size
+            level = 0
+            # Setiap kali posisi ganjil, dua subtree bersebelahan lengkap -> naik satu level
+            while position & 1:
+                nodes = self._levels[level]
+                offset = (position - 1) * 32
+                parent = node_hash(bytes(nodes[offset : offset + 32]), bytes(nodes[offset + 32 : offset + 64]))
+                level += 1
+                if len(self._levels) == level:
+                    self._levels.append(bytearray())
+                self._levels[level] += parent
+                position >>= 1
+            self._size += 1
+
+    def extend(self, leaves: Iterable[bytes]) -> None:
+        for data in leaves:
+            self.append(data)
+
+    def _subtree(self, start: int, end: int) -> bytes:
+        """MTH(D[start:end])."""
+        n = end - start
+        if n & (n - 1) == 0 and start % n == 0:
+            level = n.bit_length() - 1
+            offset = (start >> level) * 32
+            return bytes(self._levels[level][offset : offset + 32])
+        k = _split(n)
+        return node_hash(self._subtree(start, start + k), self._subtree(start + k, end))
+
+    def _check_size(self, size: int | None) -> int:
+        size = self._size if size is None else size
+        if not 0 <= size <= self._size:
+            raise ValueError(f"ukuran tree harus 0..{self._size}")
+        return size
+
+    def root(self, size: int | None = None) -> bytes:
+        """Root tree untuk ``size`` leaf pertama (default: seluruh chain)."""
+        with self._lock:
+            size = self._check_size(size)
+            return self._subtree(0, size) if size else EMPTY_ROOT
+
+    def leaf(self, index: int) -> bytes:
+        """Hash leaf ke-``index``."""
+        with self._lock:
+            if not 0 <= index < self._size:
+                raise ValueError("index leaf di luar jangkauan")
+            return bytes(self._levels[0][index * 32 : index * 32 + 32])
+
+    def inclusion_proof(self, index: int, size: int | None = None) -> List[bytes]:
+        """Bukti inklusi leaf ``index`` pada tree berukuran ``size`` (PATH RFC 6962)."""
+        with self._lock:
+            size = self._check_size(size)
+            if not 0 <= index < size:
+                raise ValueError("index leaf di luar jangkauan")
+            proof: List[bytes] = []
+            start, end, m = 0, size, index
+            # Turun dari root ke leaf; saudara dikumpulkan lalu dibalik (leaf -> root)
+            while end - start > 1:
+                k = _split(end - start)
+                if m < k:
+                    proof.append(self._subtree(start + k, end))
+                    end = start + k
+                else:
+                    proof.append(self._subtree(start, start + k))
+                    start, m = start + k, m - k
+            proof.reverse()
+            return proof
+
+    def consistency_proof(self, old_size: int, new_size: int | None = None) -> List[bytes]:
+        """Bukti bahwa tree ukuran ``old_size`` adalah prefix tree ukuran ``new_size`` (PROOF RFC 6962)."""
+        with self._lock:
+            new_size = self._check_size(new_size)
+            if not 0 < old_size <= new_size:
+                raise ValueError("old_size harus 1..new_size")
+            proof: List[bytes] = []
+            start, end, m, complete = 0, new_size, old_size, True
+            while m != end - start:
+                k = _split(end - start)
+                if m <= k:
+                    proof.append(self._subtree(start + k, end))
+                    end = start + k
+                else:
+                    proof.append(self._subtree(start, start + k))
+                    start, m, complete = start + k, m - k, False
+            if not complete:
+                proof.append(self._subtree(start, end))
+            proof.reverse()
+            return proof
+
+
+# ---------- Verifikasi di sisi klien (RFC 9162 2.1.3.2 & 2.1.4.2) ----------
+
+
+def verify_inclusion(data: bytes, index: int, size: int, proof: List[bytes], root: bytes) -> bool:
+    """Cek bukti inklusi untuk data leaf ``data`` di posisi ``index``."""
+    if not 0 <= index < size:
+        return False
+    fn, sn = index, size - 1
+    result = leaf_hash(data)
+    for sibling in proof:
+        if sn == 0:
+            return False
+        if fn & 1 or fn == sn:
+            result = node_hash(sibling, result)
+            if not fn & 1:
+                while fn and not fn & 1:
+                    fn >>= 1
+                    sn >>= 1
+        else:
+            result = node_hash(result, sibling)
+        fn >>= 1
+        sn >>= 1
+    return sn == 0 and result == root
+
+
+def verify_consistency(old_size: int, new_size: int, old_root: bytes, new_root: bytes, proof: List[bytes]) -> bool:
+    """Cek bukti konsistensi antara dua ukuran tree."""
+    if not 0 < old_size <= new_size:
+        return False
+    if old_size == new_size:
+        return not proof and old_root == new_root
+    path = list(proof)
+    if old_size & (old_size - 1) == 0:
+        path.insert(0, old_root)
+    if not path:
+        return False
+    fn, sn = old_size - 1, new_size - 1
+    while fn & 1:
+        fn >>= 1
+        sn >>= 1
+    fr = sr = path[0]
+    for c in path[1:]:
+        if sn == 0:
+            return False
+        if fn & 1 or fn == sn:
+            fr = node_hash(c, fr)
+            sr = node_hash(c, sr)
+            if not fn & 1:
+                while fn and not fn & 1:
+                    fn >>= 1
+                    sn >>= 1
+        else:
+            sr = node_hash(sr, c)
+        fn >>= 1
+        sn >>= 1
+    return sn == 0 and fr == old_root and sr == new_root
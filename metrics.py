@@ -0,0 +1,137 @@
+"""Instrumentasi ringan ChainVote (format teks Prometheus).
+
+Satu registry global ``METRICS`` dipakai bersama oleh route, cache, storage
+dan validasi chain. Metrik yang tersedia:
+
+- histogram: latensi (detik) dengan bucket kumulatif, ``_sum`` dan ``_count``
+- counter: nilai yang hanya naik (mis. byte yang dibaca/ditulis)
+- gauge: nilai sesaat (mis. panjang chain per event)
+
+Tidak butuh dependency tambahan; ``render()`` menghasilkan teks yang bisa
+langsung di-scrape oleh Prometheus.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Tuple
+
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Dict[str, object]) -> LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _format_labels(key: LabelKey, extra: Tuple[Tuple[str, str], ...] = ()) -> str:
+    pairs = key + extra
+    if not pairs:
+        return ""
+    escaped = (
+        (k, v.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")) for k, v in pairs
+    )
+    return "{" + ",".join(f'{k}="{v}"' for k, v in escaped) + "}"
+
+
+class _Histogram:
+    __slots__ = ("bucket_counts", "total", "count")
+
+    def __init__(self, buckets: Tuple[float, ...]) -> None:
+        self.bucket_counts = [0] * len(buckets)
+        self.total = 0.0
+        self.count = 0
+
+
+class MetricsRegistry:
+    """Registry metrik thread-safe."""
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._help: Dict[str, Tuple[str, str]] = {}
+        self._histograms: Dict[str, Dict[LabelKey, _Histogram]] = {}
+        self._counters: Dict[str, Dict[LabelKey, float]] = {}
+        self._gauges: Dict[str, Dict[LabelKey, float]] = {}
+
+    def describe(self, name: str, kind: str, help_text: str) -> None:
+        """Daftarkan tipe & deskripsi metrik (untuk baris ``# HELP`` / ``# TYPE``)."""
+        self._help[name] = (kind, help_text)
+
+    def observe(self, name: str, value: float, **labels: object) -> None:
+        """Catat satu nilai ke histogram ``name``."""
+        key = _label_key(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            hist = series.get(key)
+            if hist is None:
+                hist = series[key] = _Histogram(self.buckets)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    hist.bucket_counts[i] += 1
+            hist.total += value
+            hist.count += 1
+
+    def inc(self, name: str, amount: float = 1.0, **labels: object) -> None:
+        """Naikkan counter ``name``."""
+        key = _label_key(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0.0) + amount
+
+    def set_gauge(self, name: str, value: float, **labels: object) -> None:
+        """Set nilai gauge ``name``."""
+        key = _label_key(labels)
+        with self._lock:
+            self._gauges.setdefault(name, {})[key] = value
+
+    def clear_gauge(self, name: str) -> None:
+        """Hapus semua seri gauge ``name`` (mis. sebelum diisi ulang)."""
+        with self._lock:
+            self._gauges.pop(name, None)
+
+    @contextmanager
+    def timer(self, name: str, **labels: object) -> Iterator[None]:
+        """Context manager: ukur durasi blok kode ke histogram ``name``."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def render(self) -> str:
+        """Semua metrik dalam format teks Prometheus (exposition format 0.0.4)."""
+        lines: List[str] = []
+        with self._lock:
+            for kind, store in (("histogram", self._histograms), ("counter", self._counters), ("gauge", self._gauges)):
+                for name in sorted(store):
+                    help_text = self._help.get(name, (kind, name))[1]
+                    lines.append(f"# HELP {name} {help_text}")
+                    lines.append(f"# TYPE {name} {kind}")
+                    for key, value in sorted(store[name].items()):
+                        if kind == "histogram":
+                            for bound, bucket_count in zip(self.buckets, value.bucket_counts):
+                                lines.append(f"{name}_bucket{_format_labels(key, (('le', repr(bound)),))} {bucket_count}")
+                            lines.append(f"{name}_bucket{_format_labels(key, (('le', '+Inf'),))} {value.count}")
+                            lines.append(f"{name}_sum{_format_labels(key)} {value.total}")
+                            lines.append(f"{name}_count{_format_labels(key)} {value.count}")
+                        else:
+                            lines.append(f"{name}{_format_labels(key)} {value}")
+        return "\n".join(lines) + "\n"
+
+
+METRICS = MetricsRegistry()
+
+METRICS.describe("chainvote_http_request_duration_seconds", "histogram", "Latensi request HTTP per route.")
+METRICS.describe("chainvote_template_render_duration_seconds", "histogram", "Waktu render template Jinja.")
+METRICS.describe("chainvote_storage_operation_duration_seconds", "histogram", "Durasi operasi storage (load/save).")
+METRICS.describe("chainvote_chain_validation_duration_seconds", "histogram", "Durasi validasi chain.")
+METRICS.describe("chainvote_storage_bytes_read_total", "counter", "Byte yang dibaca dari storage.")
+METRICS.describe("chainvote_storage_bytes_written_total", "counter", "Byte yang ditulis ke storage.")
+METRICS.describe("chainvote_chain_length", "gauge", "Jumlah blok per event (event yang ada di cache).")
+METRICS.describe("chainvote_http_not_modified_total", "counter", "Respons 304 (ETag/Last-Modified cocok) per route.")
+METRICS.describe("chainvote_render_cache_hits_total", "counter", "Halaman yang diambil dari cache hasil render.")
+METRICS.describe("chainvote_sse_streams", "gauge", "Stream SSE yang sedang terbuka di worker ini.")
+METRICS.describe("chainvote_sse_rejected_total", "counter", "Stream SSE yang ditolak karena batas SSE_MAX_STREAMS.")
+METRICS.describe("chainvote_warmup_duration_seconds", "histogram", "Durasi warm-up cache setelah start.")
@@ -0,0 +1,1232 @@
+"""Storage engine untuk event, blockchain & user ChainVote.
+
+Backend bisa dipilih (lihat ``open_storage``):
+
+- ``json``: metadata event disimpan terpisah di satu file JSON kecil,
+  sedangkan blockchain tiap event ditulis sebagai log append-only berformat
+  JSON Lines (satu blok per baris) di folder ``chains/``. Menambah satu vote
+  cukup menambahkan satu baris ke log event tersebut, tanpa menulis ulang
+  data event lain. User disimpan di ``users.json``.
+- ``sqlite``: tabel events, blocks & users dengan index (lihat ``storage_sqlite``).
+
+Event yang sudah ditutup hanya menyisakan ringkasan di katalog; chain-nya
+dipindah ke arsip terkompresi di ``archive_dir`` (lihat ``archive``).
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from contextlib import nullcontext
+from typing import Any, Dict, Iterable, Iterator, List
+
+from archive import ChainArchive, archive_paths
+from blockchain import find_invalid_block
+from chainfile import EXTENSION as BINARY_EXTENSION, RECORD as BINARY_RECORD, ChainFile
+from compact_chain import CompactChain
+from hashing import hasher_for
+from merkle import MerkleTree, block_leaf
+from metrics import METRICS
+
+
+BACKENDS = ("json", "sqlite")
+
+
+class EventStore:
+    """Interface backend penyimpanan event & blockchain.
+
+    ``meta_signature`` / ``chain_signature`` mengembalikan nilai yang berubah
+    setiap kali katalog / chain event berubah (dipakai ``EventCache``).
+    """
+
+    # Folder arsip chain event yang sudah ditutup (None = fitur arsip tidak tersedia)
+    archive_dir: str | None = None
+
+    def list_event_meta(self) -> List[Dict[str, Any]]:
+        raise NotImplementedError
+
+    def get_event_meta(self, event_id: str) -> Dict[str, Any] | None:
+        raise NotImplementedError
+
+    def save_event_meta(self, event: Dict[str, Any]) -> None:
+        raise NotImplementedError
+
+    def meta_signature(self) -> Any:
+        raise NotImplementedError
+
+    def chain_signature(self, event_id: str) -> Any:
+        raise NotImplementedError
+
+    def load_chain(self, event_id: str) -> List[Dict[str, Any]]:
+        raise NotImplementedError
+
+    def iter_blocks(self, event_id: str, start: int = 0, stop: int | None = None) -> Iterator[Dict[str, Any]]:
+        raise NotImplementedError
+
+    def create_event(self, event: Dict[str, Any]) -> None:
+        raise NotImplementedError
+
+    def create_events(self, events: List[Dict[str, Any]]) -> None:
+        """Membuat banyak event sekaligus (backend bisa menyimpannya dalam satu write)."""
+        for event in events:
+            self.create_event(event)
+
+    def append_blocks(self, event_id: str, blocks: List[Dict[str, Any]], durable: bool = False) -> None:
+        raise NotImplementedError
+
+    def replace_chain(self, event_id: str, chain: List[Dict[str, Any]]) -> None:
+        raise NotImplementedError
+
+    def delete_event(self, event_id: str) -> bool:
+        raise NotImplementedError
+
+    def read_appended(self, event_id: str, start: int, since: Any) -> List[Dict[str, Any]] | None:
+        """Blok mulai posisi ``start`` yang ditambahkan sejak signature ``since``.
+
+        None jika backend tidak bisa memastikan chain hanya bertambah di akhir
+        sejak ``since`` (mis. ditulis ulang); pemanggil lalu memuat ulang seluruh chain.
+        """
+        return None
+
+    def open_chain(self, event_id: str) -> Any:
+        """Chain dengan akses acak langsung dari storage (mis. file biner mmap), atau None.
+
+        Jika bukan None, objek ini dipakai cache apa adanya tanpa memuat ulang blok.
+        """
+        return None
+
+    def open_archive(self, event_id: str) -> ChainArchive | None:
+        """Arsip chain event yang sudah ditutup, atau None."""
+        if self.archive_dir is None:
+            return None
+        return ChainArchive.open(self.archive_dir, event_id)
+
+    def write_archive(self, event_id: str, summary: Dict[str, Any]) -> Dict[str, Any]:
+        """Tulis chain event ke arsip terkompresi (chain panas belum dihapus). Mengembalikan manifest."""
+        if self.archive_dir is None:
+            raise ValueError("storage ini tidak punya folder arsip")
+        return ChainArchive.write(self.archive_dir, event_id, self.iter_blocks(event_id), summary)
+
+    def drop_chain(self, event_id: str) -> None:
+        """Hapus chain panas event (dipanggil setelah chain diarsipkan)."""
+        raise NotImplementedError
+
+    def load_event(self, event_id: str) -> Dict[str, Any] | None:
+        """Metadata event + blockchain lengkapnya."""
+        meta = self.get_event_meta(event_id)
+        if meta is None:
+            return None
+        event = dict(meta)
+        event["blockchain"] = self.load_chain(event_id)
+        return event
+
+    def append_block(self, event_id: str, block: Dict[str, Any]) -> None:
+        """Menambahkan satu blok ke akhir chain event."""
+        self.append_blocks(event_id, [block])
+
+    def sync(self) -> None:
+        """Memaksa data tertunda ke disk (default: tidak ada yang tertunda)."""
+
+    def close(self) -> None:
+        """Menutup resource backend."""
+
+    def migrate_legacy(self, events_file: str) -> int:
+        """Migrasi sekali jalan dari format lama ``events.json`` (semua event + blockchain).
+
+        File lama di-rename menjadi ``<events_file>.migrated`` agar tidak dimigrasi ulang.
+        Mengembalikan jumlah event yang dimigrasi.
+        """
+        legacy_events = _read_legacy_events(events_file)
+        if legacy_events is None:
+            return 0
+        existing_ids = {m.get("event_id") for m in self.list_event_meta()}
+        migrated = 0
+        for event in legacy_events:
+            if event.get("event_id") in existing_ids:
+                continue
+            self.create_event(event)
+            migrated += 1
+        os.replace(events_file, f"{events_file}.migrated")
+        return migrated
+
+
+class UserStore:
+    """Interface backend penyimpanan user."""
+
+    def load_users(self) -> List[Dict[str, Any]]:
+        raise NotImplementedError
+
+    def save_users(self, users: List[Dict[str, Any]]) -> None:
+        """Menyimpan ulang seluruh daftar user."""
+        raise NotImplementedError
+
+    def find_user(self, username: str) -> Dict[str, Any] | None:
+        raise NotImplementedError
+
+    def add_user(self, user: Dict[str, Any]) -> bool:
+        """Menambahkan satu user; False jika username sudah terdaftar."""
+        return self.add_users([user]) == 1
+
+    def add_users(self, users: List[Dict[str, Any]]) -> int:
+        """Menambahkan banyak user dalam satu penulisan; username yang sudah ada dilewati.
+
+        Mengembalikan jumlah user yang benar-benar ditambahkan.
+        """
+        raise NotImplementedError
+
+    def update_user(self, user: Dict[str, Any]) -> bool:
+        """Mengganti data user dengan username yang sama; False jika tidak ada."""
+        raise NotImplementedError
+
+    def migrate_legacy(self, users_file: str) -> int:
+        """Impor user dari ``users.json`` milik backend json saat backend lain dipakai pertama kali.
+
+        Default: tidak ada yang diimpor (backend json memakai file itu sendiri).
+        Mengembalikan jumlah user yang diimpor.
+        """
+        return 0
+
+    def close(self) -> None:
+        """Menutup resource backend."""
+
+
+def _shared_lock(locks: Any, name: str) -> Any:
+    """Lock lintas proses bernama ``name`` dari koordinator (lihat ``coordination``), jika ada."""
+    return locks.lock(name) if locks is not None else nullcontext()
+
+
+def _temp_path(path: str) -> str:
+    """Nama file sementara unik per proses & thread (beberapa worker bisa menulis file yang sama)."""
+    return f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+
+
+def _read_legacy_events(events_file: str) -> List[Dict[str, Any]] | None:
+    if not os.path.exists(events_file):
+        return None
+    with open(events_file, "r", encoding="utf-8") as f:
+        try:
+            return json.load(f)
+        except json.JSONDecodeError:
+            return []
+
+
+class JsonlEventStore(EventStore):
+    """Penyimpanan event: katalog metadata + log blok per-event (JSON Lines).
+
+    Setiap append langsung di-``flush`` ke OS, sedangkan ``fsync`` dilakukan
+    secara batch: setelah ``fsync_batch_size`` blok atau ``fsync_interval``
+    detik sejak fsync terakhir, mana yang lebih dulu. ``sync()`` memaksa fsync
+    untuk semua log yang masih tertunda (dipanggil saat aplikasi berhenti).
+
+    ``locks`` (koordinator, opsional) dipakai di mode multi-worker agar
+    read-modify-write katalog tidak saling menimpa antar proses.
+    """
+
+    def __init__(
+        self,
+        meta_file: str,
+        chains_dir: str,
+        fsync_batch_size: int = 32,
+        fsync_interval: float = 1.0,
+        locks: Any = None,
+        archive_dir: str | None = None,
+    ) -> None:
+        self.meta_file = meta_file
+        self.chains_dir = chains_dir
+        self.archive_dir = archive_dir
+        self.fsync_batch_size = max(1, fsync_batch_size)
+        self.fsync_interval = fsync_interval
+        self._locks = locks
+        self._lock = threading.RLock()
+        # event_id -> file handle log yang sedang terbuka untuk append
+        self._handles: Dict[str, Any] = {}
+        # event_id -> jumlah blok yang belum di-fsync
+        self._pending: Dict[str, int] = {}
+        # event_id -> shard biner (mmap) yang sedang terbuka
+        self._binary: Dict[str, ChainFile] = {}
+        # event_id -> arsip chain event yang sudah ditutup
+        self._archives: Dict[str, ChainArchive] = {}
+        self._last_sync = time.monotonic()
+
+        os.makedirs(self.chains_dir, exist_ok=True)
+        if not os.path.exists(self.meta_file):
+            # Worker lain mungkin membuat (atau sudah memigrasi) katalog selagi menunggu lock
+            with _shared_lock(self._locks, "catalog"):
+                if not os.path.exists(self.meta_file):
+                    self._write_meta([])
+
+    # ---------- Path & util ----------
+
+    def chain_path(self, event_id: str) -> str:
+        """Path file log blockchain untuk sebuah event."""
+        return os.path.join(self.chains_dir, f"{event_id}.jsonl")
+
+    def binary_path(self, event_id: str) -> str:
+        """Path shard biner opsional (lihat ``chainfile.py``) untuk sebuah event."""
+        return os.path.join(self.chains_dir, f"{event_id}{BINARY_EXTENSION}")
+
+    @staticmethod
+    def _atomic_write_json(path: str, data: Any) -> None:
+        """Menulis JSON ke file sementara lalu me-rename agar tidak pernah setengah jadi."""
+        tmp_path = _temp_path(path)
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+            METRICS.inc("chainvote_storage_bytes_written_total", f.tell(), backend="json")
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def _file_signature(path: str) -> tuple | None:
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            return None
+        return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+    # ---------- Metadata event ----------
+
+    def _read_meta(self) -> List[Dict[str, Any]]:
+        if not os.path.exists(self.meta_file):
+            return []
+        with open(self.meta_file, "r", encoding="utf-8") as f:
+            METRICS.inc("chainvote_storage_bytes_read_total", os.fstat(f.fileno()).st_size, backend="json")
+            try:
+                return json.load(f)
+            except json.JSONDecodeError:
+                return []
+
+    def _write_meta(self, metas: List[Dict[str, Any]]) -> None:
+        self._atomic_write_json(self.meta_file, metas)
+
+    def list_event_meta(self) -> List[Dict[str, Any]]:
+        """Daftar metadata semua event (tanpa blockchain)."""
+        return self._read_meta()
+
+    def get_event_meta(self, event_id: str) -> Dict[str, Any] | None:
+        """Metadata satu event, atau None jika tidak ada."""
+        for meta in self._read_meta():
+            if meta.get("event_id") == event_id:
+                return meta
+        return None
+
+    def save_event_meta(self, event: Dict[str, Any]) -> None:
+        """Menyimpan (insert/update) metadata event. Field ``blockchain`` diabaikan."""
+        meta = {k: v for k, v in event.items() if k != "blockchain"}
+        with self._lock, _shared_lock(self._locks, "catalog"):
+            metas = self._read_meta()
+            for i, m in enumerate(metas):
+                if m.get("event_id") == meta.get("event_id"):
+                    metas[i] = meta
+                    break
+            else:
+                metas.append(meta)
+            self._write_meta(metas)
+
+    def meta_signature(self) -> tuple | None:
+        """Tanda versi file katalog (mtime_ns, size, inode) untuk invalidasi cache."""
+        return self._file_signature(self.meta_file)
+
+    # ---------- Blockchain ----------
+
+    def chain_signature(self, event_id: str) -> tuple | None:
+        """Tanda versi log blockchain event (mtime_ns, size, inode) untuk invalidasi cache."""
+        if os.path.exists(self.binary_path(event_id)):
+            return self._file_signature(self.binary_path(event_id))
+        signature = self._file_signature(self.chain_path(event_id))
+        if signature is None and self.archive_dir is not None:
+            return self._file_signature(archive_paths(self.archive_dir, event_id)[0])
+        return signature
+
+    def open_chain(self, event_id: str) -> ChainFile | ChainArchive | None:
+        """Shard biner event (dibaca lewat mmap) jika event memakai format biner.
+
+        Jika file sudah diganti / ditambah proses lain, shard dibuka ulang.
+        Event tanpa chain panas yang sudah diarsipkan dibaca dari arsipnya.
+        """
+        with self._lock:
+            chain = self._binary.get(event_id)
+            if not os.path.exists(self.binary_path(event_id)):
+                self._binary.pop(event_id, None)
+                if os.path.exists(self.chain_path(event_id)):
+                    return None
+                return self._archived(event_id)
+            if chain is not None and chain.is_stale():
+                chain.close()  # mmap lama tetap bisa dibaca pemegangnya
+                chain = None
+            if chain is None:
+                chain = self._binary[event_id] = ChainFile(self.binary_path(event_id))
+            return chain
+
+    def _archived(self, event_id: str) -> ChainArchive | None:
+        archive = self._archives.get(event_id)
+        if archive is None:
+            archive = self.open_archive(event_id)
+            if archive is not None:
+                self._archives[event_id] = archive
+        return archive
+
+    def load_chain(self, event_id: str) -> List[Dict[str, Any]]:
+        """Membaca seluruh blok dari log event.
+
+        Baris terakhir yang terpotong (mis. proses mati saat menulis) dilewati.
+        """
+        binary = self.open_chain(event_id)
+        if binary is not None:
+            return list(binary)
+        path = self.chain_path(event_id)
+        if not os.path.exists(path):
+            return []
+        chain: List[Dict[str, Any]] = []
+        with open(path, "r", encoding="utf-8") as f:
+            METRICS.inc("chainvote_storage_bytes_read_total", os.fstat(f.fileno()).st_size, backend="json")
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    chain.append(json.loads(line))
+                except json.JSONDecodeError:
+                    break
+        return chain
+
+    def iter_blocks(self, event_id: str, start: int = 0, stop: int | None = None) -> Iterator[Dict[str, Any]]:
+        """Membaca blok posisi ``start`` .. ``stop - 1`` langsung dari log, satu per satu.
+
+        Baris sebelum ``start`` tidak di-parse, dan memori yang dipakai konstan
+        berapapun panjang chain-nya. Shard biner langsung lompat ke record ``start``.
+        """
+        binary = self.open_chain(event_id)
+        if binary is not None:
+            yield from binary.iter_range(start, stop)
+            return
+        path = self.chain_path(event_id)
+        if not os.path.exists(path):
+            return
+        # Byte dihitung lokal lalu dilaporkan sekali (juga jika pemanggil berhenti di tengah)
+        bytes_read = 0
+        with open(path, "rb") as f:
+            try:
+                position = 0
+                for line in f:
+                    bytes_read += len(line)
+                    if not line.strip():
+                        continue
+                    if stop is not None and position >= stop:
+                        return
+                    if position >= start:
+                        try:
+                            yield json.loads(line)
+                        except json.JSONDecodeError:
+                            return
+                    position += 1
+            finally:
+                METRICS.inc("chainvote_storage_bytes_read_total", bytes_read, backend="json")
+
+    def read_appended(self, event_id: str, start: int, since: Any) -> List[Dict[str, Any]] | None:
+        """Baca hanya ekor log sejak ``since`` (seek ke ukuran file lama, tanpa scan dari awal).
+
+        Blok dengan index < ``start`` (sudah dimiliki pemanggil) dilewati.
+        None jika log sudah diganti (inode berbeda / menyusut) atau event memakai shard biner.
+        """
+        path = self.chain_path(event_id)
+        current = self._file_signature(path)
+        if since is None or current is None or os.path.exists(self.binary_path(event_id)):
+            return None
+        if current[2] != since[2] or current[1] < since[1]:
+            return None
+        blocks: List[Dict[str, Any]] = []
+        with open(path, "rb") as f:
+            f.seek(since[1])
+            try:
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break  # baris yang sedang ditulis proses lain
+                    if not line.strip():
+                        continue
+                    try:
+                        block = json.loads(line)
+                    except json.JSONDecodeError:
+                        return None
+                    if isinstance(block.get("index"), int) and block["index"] < start:
+                        continue
+                    blocks.append(block)
+            finally:
+                METRICS.inc("chainvote_storage_bytes_read_total", f.tell() - since[1], backend="json")
+        return blocks
+
+    def create_event(self, event: Dict[str, Any]) -> None:
+        """Membuat event baru: simpan metadata lalu tulis blok awal (genesis) ke log."""
+        with self._lock:
+            self.replace_chain(event["event_id"], event.get("blockchain", []))
+            self.save_event_meta(event)
+
+    def create_events(self, events: List[Dict[str, Any]]) -> None:
+        """Membuat banyak event: tulis shard genesis masing-masing, lalu katalog sekali saja."""
+        with self._lock:
+            for event in events:
+                self.replace_chain(event["event_id"], event.get("blockchain", []))
+            new_metas = {e["event_id"]: {k: v for k, v in e.items() if k != "blockchain"} for e in events}
+            with _shared_lock(self._locks, "catalog"):
+                metas = [new_metas.pop(m.get("event_id"), m) for m in self._read_meta()]
+                metas.extend(new_metas.values())
+                self._write_meta(metas)
+
+    def append_blocks(self, event_id: str, blocks: List[Dict[str, Any]], durable: bool = False) -> None:
+        """Menambahkan beberapa blok sekaligus dengan satu kali write.
+
+        Jika ``durable`` True, log langsung di-fsync (group commit: satu fsync
+        untuk seluruh kelompok blok). Jika tidak, fsync mengikuti batching biasa.
+        """
+        if not blocks:
+            return
+        binary = self.open_chain(event_id)
+        if binary is not None:
+            with self._lock:
+                binary.append_blocks(blocks)
+                METRICS.inc("chainvote_storage_bytes_written_total", len(blocks) * BINARY_RECORD.size, backend="json")
+                if durable:
+                    binary.sync()
+            return
+        data = "".join(json.dumps(b, ensure_ascii=False, separators=(",", ":")) + "\n" for b in blocks)
+        with self._lock:
+            handle = self._handles.get(event_id)
+            if handle is not None and self._handle_replaced(event_id, handle):
+                self._close_handle(event_id)
+                handle = None
+            if handle is None:
+                handle = open(self.chain_path(event_id), "a", encoding="utf-8")
+                self._handles[event_id] = handle
+            handle.write(data)
+            handle.flush()
+            METRICS.inc("chainvote_storage_bytes_written_total", len(data.encode("utf-8")), backend="json")
+            if durable:
+                os.fsync(handle.fileno())
+                self._pending.pop(event_id, None)
+                return
+            self._pending[event_id] = self._pending.get(event_id, 0) + len(blocks)
+            if (
+                self._pending[event_id] >= self.fsync_batch_size
+                or time.monotonic() - self._last_sync >= self.fsync_interval
+            ):
+                self.sync()
+
+    def replace_chain(self, event_id: str, chain: List[Dict[str, Any]]) -> None:
+        """Menulis ulang seluruh log event (dipakai saat blok lama dimodifikasi).
+
+        Untuk shard biner yang sudah diubah di tempat (``chain[i] = block``),
+        cukup di-fsync tanpa menulis ulang seluruh file.
+        """
+        with self._lock:
+            binary = self.open_chain(event_id)
+            if binary is not None:
+                if chain is binary:
+                    binary.sync()
+                else:
+                    self._binary.pop(event_id, None)
+                    ChainFile.write(self.binary_path(event_id), chain)
+                return
+            self._write_jsonl(event_id, chain)
+
+    def _write_jsonl(self, event_id: str, chain: Iterable[Dict[str, Any]]) -> None:
+        path = self.chain_path(event_id)
+        tmp_path = _temp_path(path)
+        with self._lock:
+            self._close_handle(event_id)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                for block in chain:
+                    f.write(json.dumps(block, ensure_ascii=False, separators=(",", ":")) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+                METRICS.inc("chainvote_storage_bytes_written_total", f.tell(), backend="json")
+            os.replace(tmp_path, path)
+
+    def delete_event(self, event_id: str) -> bool:
+        """Menghapus metadata dan log blockchain event. True jika event ditemukan."""
+        with self._lock, _shared_lock(self._locks, "catalog"):
+            metas = self._read_meta()
+            remaining = [m for m in metas if m.get("event_id") != event_id]
+            if len(remaining) == len(metas):
+                return False
+            self._write_meta(remaining)
+            self.drop_chain(event_id)
+            if self.archive_dir is not None:
+                ChainArchive.remove(self.archive_dir, event_id)
+                self._archives.pop(event_id, None)
+            return True
+
+    def drop_chain(self, event_id: str) -> None:
+        """Hapus shard chain panas (JSON Lines / biner) event."""
+        with self._lock:
+            self._close_handle(event_id)
+            self._binary.pop(event_id, None)
+            for path in (self.chain_path(event_id), self.binary_path(event_id)):
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+
+    def convert_chain(self, event_id: str, fmt: str) -> None:
+        """Ubah format shard chain event: ``"binary"`` (.cvc, mmap) atau ``"jsonl"``.
+
+        Event yang sudah diarsipkan dilewati (chain-nya tetap di arsip).
+        """
+        with self._lock:
+            binary = self.open_chain(event_id)
+            if isinstance(binary, ChainArchive):
+                return
+            if fmt == "binary" and binary is None:
+                ChainFile.write(self.binary_path(event_id), self.load_chain(event_id))
+                self._close_handle(event_id)
+                if os.path.exists(self.chain_path(event_id)):
+                    os.remove(self.chain_path(event_id))
+            elif fmt == "jsonl" and binary is not None:
+                self._write_jsonl(event_id, binary)
+                self._binary.pop(event_id, None)
+                os.remove(self.binary_path(event_id))
+            elif fmt not in ("binary", "jsonl"):
+                raise ValueError(f"format chain tidak dikenal: {fmt}")
+
+    # ---------- Durability ----------
+
+    def _handle_replaced(self, event_id: str, handle: Any) -> bool:
+        """True jika log sudah diganti (mis. ditulis ulang proses lain) sejak handle dibuka."""
+        try:
+            return os.stat(self.chain_path(event_id)).st_ino != os.fstat(handle.fileno()).st_ino
+        except FileNotFoundError:
+            return True
+
+    def _close_handle(self, event_id: str) -> None:
+        handle = self._handles.pop(event_id, None)
+        if handle is not None:
+            if self._pending.pop(event_id, 0):
+                os.fsync(handle.fileno())
+            handle.close()
+
+    def sync(self) -> None:
+        """Memaksa fsync untuk semua log yang masih punya blok tertunda."""
+        with self._lock:
+            for event_id, count in list(self._pending.items()):
+                if count:
+                    os.fsync(self._handles[event_id].fileno())
+            self._pending.clear()
+            self._last_sync = time.monotonic()
+
+    def close(self) -> None:
+        """Fsync lalu tutup semua file log yang terbuka."""
+        with self._lock:
+            for event_id in list(self._handles):
+                self._close_handle(event_id)
+            for chain in self._binary.values():
+                chain.close()
+            self._binary.clear()
+
+    # ---------- Migrasi ----------
+
+    def migrate_legacy(self, events_file: str) -> int:
+        """Migrasi dari ``events.json`` lama: chain ke log per-event, metadata ke katalog.
+
+        Katalog hanya ditulis sekali untuk semua event yang dimigrasi.
+        """
+        with self._lock, _shared_lock(self._locks, "catalog"):
+            legacy_events = _read_legacy_events(events_file)
+            if legacy_events is None:
+                return 0
+            metas = self._read_meta()
+            existing_ids = {m.get("event_id") for m in metas}
+            migrated = 0
+            for event in legacy_events:
+                if event.get("event_id") in existing_ids:
+                    continue
+                self.replace_chain(event["event_id"], event.get("blockchain", []))
+                metas.append({k: v for k, v in event.items() if k != "blockchain"})
+                migrated += 1
+            self._write_meta(metas)
+            os.replace(events_file, f"{events_file}.migrated")
+        return migrated
+
+
+class JsonUserStore(UserStore):
+    """Penyimpanan user di satu file JSON (``users.json``).
+
+    Isi file disimpan di memori beserta index ``username -> user`` sehingga
+    login tidak mem-parse file & scan linear setiap request. Index dimuat
+    ulang hanya jika signature file (mtime, ukuran & inode) berubah dari luar
+    proses; semua penulisan lewat store ini bersifat write-through di bawah
+    satu lock (cek duplikat + tulis atomik tidak bisa saling balapan). Dengan
+    ``locks`` (koordinator) lock tersebut juga berlaku lintas proses.
+    """
+
+    def __init__(self, users_file: str, locks: Any = None) -> None:
+        self.users_file = users_file
+        self._locks = locks
+        self._lock = threading.RLock()
+        self._users: List[Dict[str, Any]] = []
+        self._by_name: Dict[str, Dict[str, Any]] = {}
+        self._signature: Any = None
+        if not os.path.exists(self.users_file):
+            with self._lock, _shared_lock(self._locks, "users"):
+                if not os.path.exists(self.users_file):
+                    self.save_users([])
+
+    def _file_signature(self) -> Any:
+        try:
+            st = os.stat(self.users_file)
+        except FileNotFoundError:
+            return None
+        return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+    def _read_file(self) -> List[Dict[str, Any]]:
+        if not os.path.exists(self.users_file):
+            return []
+        with open(self.users_file, "r", encoding="utf-8") as f:
+            METRICS.inc("chainvote_storage_bytes_read_total", os.fstat(f.fileno()).st_size, backend="json")
+            try:
+                return json.load(f)
+            except json.JSONDecodeError:
+                return []
+
+    def _index(self) -> Dict[str, Dict[str, Any]]:
+        """Index username -> user, dimuat ulang jika file berubah di luar store ini."""
+        with self._lock:
+            signature = self._file_signature()
+            if signature != self._signature:
+                self._set_users(self._read_file(), signature)
+            return self._by_name
+
+    def _set_users(self, users: List[Dict[str, Any]], signature: Any) -> None:
+        self._users = users
+        self._by_name = {u.get("username"): u for u in users}
+        self._signature = signature
+
+    def _write(self, users: List[Dict[str, Any]]) -> None:
+        JsonlEventStore._atomic_write_json(self.users_file, users)
+        self._set_users(users, self._file_signature())
+
+    def load_users(self) -> List[Dict[str, Any]]:
+        """Semua user (salinan, urutan seperti di file)."""
+        with self._lock:
+            self._index()
+            return [dict(u) for u in self._users]
+
+    def save_users(self, users: List[Dict[str, Any]]) -> None:
+        """Menyimpan semua user ke file JSON."""
+        with self._lock, _shared_lock(self._locks, "users"):
+            self._write([dict(u) for u in users])
+
+    def find_user(self, username: str) -> Dict[str, Any] | None:
+        """Mencari user berdasarkan username (lookup dict di memori)."""
+        user = self._index().get(username)
+        return dict(user) if user is not None else None
+
+    def add_users(self, users: List[Dict[str, Any]]) -> int:
+        """Menambahkan banyak user dengan satu kali tulis file."""
+        with self._lock, _shared_lock(self._locks, "users"):
+            index = self._index()
+            added = []
+            seen = set()
+            for user in users:
+                username = user.get("username")
+                if username in index or username in seen:
+                    continue
+                seen.add(username)
+                added.append(dict(user))
+            if added:
+                self._write(self._users + added)
+            return len(added)
+
+    def update_user(self, user: Dict[str, Any]) -> bool:
+        with self._lock, _shared_lock(self._locks, "users"):
+            username = user.get("username")
+            if username not in self._index():
+                return False
+            self._write([dict(user) if u.get("username") == username else u for u in self._users])
+            return True
+
+
+def open_storage(
+    backend: str,
+    meta_file: str,
+    chains_dir: str,
+    users_file: str,
+    sqlite_file: str,
+    fsync_batch_size: int = 32,
+    fsync_interval: float = 1.0,
+    locks: Any = None,
+    archive_dir: str | None = None,
+) -> tuple:
+    """Membuka backend storage yang dipilih. Mengembalikan (event_store, user_store).
+
+    ``locks`` (koordinator dari ``coordination``) hanya dipakai backend ``json``;
+    SQLite sudah menserialisasi penulisan antar proses lewat transaksinya.
+    """
+    if backend == "json":
+        event_store = JsonlEventStore(
+            meta_file,
+            chains_dir,
+            fsync_batch_size=fsync_batch_size,
+            fsync_interval=fsync_interval,
+            locks=locks,
+            archive_dir=archive_dir,
+        )
+        return event_store, JsonUserStore(users_file, locks=locks)
+    if backend == "sqlite":
+        from storage_sqlite import SqliteEventStore, SqliteUserStore
+
+        return SqliteEventStore(sqlite_file, archive_dir=archive_dir), SqliteUserStore(sqlite_file)
+    raise ValueError(f"Backend storage tidak dikenal: {backend!r} (pilihan: {', '.join(BACKENDS)})")
+
+
+# Container chain yang punya find_invalid/tally/voters sendiri
+_COLUMNAR_CHAINS = (CompactChain, ChainFile, ChainArchive)
+
+
+class _CachedChain:
+    """Entri cache blockchain satu event beserta index turunannya.
+
+    ``voters`` adalah set voter_id yang sudah punya blok (tanpa genesis) dan
+    ``tally`` hitungan suara per kandidat. Keduanya dibangun sekali saat chain
+    dimuat (atau ditulis ulang, mis. setelah tamper) lalu diperbarui setiap
+    ada append.
+
+    Checkpoint validasi: ``verified_upto`` blok pertama sudah terverifikasi
+    valid dan blok terakhirnya ber-hash ``verified_hash``. Jika ditemukan blok
+    rusak, index-nya disimpan di ``first_invalid``.
+
+    ``merkle`` (Merkle tree atas hash blok) dibangun saat pertama kali
+    dibutuhkan lalu diperbarui incremental setiap append.
+    """
+
+    __slots__ = (
+        "chain",
+        "signature",
+        "checked_at",
+        "voters",
+        "tally",
+        "verified_upto",
+        "verified_hash",
+        "first_invalid",
+        "merkle",
+    )
+
+    def __init__(self, chain: List[Dict[str, Any]], signature: Any, checked_at: float) -> None:
+        self.chain = chain
+        self.signature = signature
+        self.checked_at = checked_at
+        self.merkle: MerkleTree | None = None
+        if isinstance(chain, _COLUMNAR_CHAINS):
+            # Index dibangun langsung dari kolom kode voter/kandidat
+            self.voters: set = chain.voters()
+            self.tally: Dict[str, int] = chain.tally()
+        else:
+            self.voters = set()
+            self.tally = {}
+            self.index_blocks(chain)
+        self.reset_checkpoint(0)
+
+    def reset_checkpoint(self, upto: int) -> None:
+        """Mundurkan checkpoint validasi ke ``upto`` blok pertama."""
+        upto = max(0, min(upto, len(self.chain)))
+        self.verified_upto = upto
+        self.verified_hash = self.chain[upto - 1].get("hash") if upto else None
+        self.first_invalid = None
+
+    def index_blocks(self, blocks: List[Dict[str, Any]]) -> None:
+        """Masukkan blok-blok (baru) ke index turunan."""
+        for block in blocks:
+            if block.get("index") == 0:
+                continue
+            self.voters.add(block.get("voter_id"))
+            candidate = block.get("candidate")
+            self.tally[candidate] = self.tally.get(candidate, 0) + 1
+
+
+class EventCache:
+    """Cache in-process di depan storage event.
+
+    Metadata dan blockchain yang sudah di-parse disimpan di memori, per
+    event_id. Penulisan lewat cache ini (write-through) langsung memperbarui
+    entri cache, jadi tidak perlu membaca ulang file. Perubahan dari luar proses dideteksi lewat signature file
+    (mtime/size/inode) yang dicek paling sering sekali per ``revalidate_interval``
+    detik; hanya event yang berubah yang dibaca ulang. Jika log hanya
+    bertambah di akhir (mis. vote dari worker lain), cukup ekornya yang dibaca.
+
+    Katalog metadata dan shard chain per event dimuat terpisah: daftar event
+    tidak pernah memuat chain, dan shard chain baru dimuat saat route benar-benar
+    membutuhkannya. Jika ``max_chains`` diisi, hanya sejumlah itu shard yang
+    disimpan di memori (yang paling lama tidak dipakai dibuang lebih dulu).
+
+    Dengan ``compact=True`` chain disimpan sebagai ``CompactChain`` (kolom
+    digest mentah, timestamp integer, kode voter/kandidat); pembacanya tetap
+    menerima dict per blok.
+    """
+
+    def __init__(
+        self,
+        store: EventStore,
+        revalidate_interval: float = 1.0,
+        max_chains: int | None = None,
+        compact: bool = True,
+    ) -> None:
+        self.store = store
+        self.revalidate_interval = revalidate_interval
+        self.max_chains = max_chains
+        self.compact = compact
+        self._lock = threading.RLock()
+        self._metas: Dict[str, Dict[str, Any]] | None = None
+        self._meta_signature: Any = None
+        self._meta_checked_at = 0.0
+        self._chains: "OrderedDict[str, _CachedChain]" = OrderedDict()
+
+    def _is_fresh(self, checked_at: float) -> bool:
+        return time.monotonic() - checked_at < self.revalidate_interval
+
+    # ---------- Baca ----------
+
+    def _ensure_metas(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            if self._metas is not None and self._is_fresh(self._meta_checked_at):
+                return self._metas
+            signature = self.store.meta_signature()
+            if self._metas is None or signature != self._meta_signature:
+                with METRICS.timer("chainvote_storage_operation_duration_seconds", op="load_meta"):
+                    metas = self.store.list_event_meta()
+                self._metas = {m["event_id"]: m for m in metas}
+                self._meta_signature = signature
+                # Event yang sudah dihapus dari katalog ikut dibuang dari cache chain
+                for event_id in list(self._chains):
+                    if event_id not in self._metas:
+                        del self._chains[event_id]
+            self._meta_checked_at = time.monotonic()
+            return self._metas
+
+    def list_event_meta(self) -> List[Dict[str, Any]]:
+        """Daftar metadata semua event (urutan sesuai katalog)."""
+        return list(self._ensure_metas().values())
+
+    def get_event_meta(self, event_id: str) -> Dict[str, Any] | None:
+        """Metadata satu event dari cache."""
+        return self._ensure_metas().get(event_id)
+
+    def get_chain(self, event_id: str) -> List[Dict[str, Any]]:
+        """Blockchain event dari cache; dibaca ulang hanya jika log-nya berubah."""
+        return self._get_entry(event_id).chain
+
+    def get_voters(self, event_id: str) -> set:
+        """Set voter_id yang sudah vote pada event (index, tanpa scan chain)."""
+        return self._get_entry(event_id).voters
+
+    def get_tally(self, event_id: str) -> Dict[str, int]:
+        """Hitungan suara per kandidat (berjalan, tanpa menghitung ulang chain)."""
+        return self._get_entry(event_id).tally
+
+    def get_version(self, event_id: str) -> tuple | None:
+        """Penanda versi event untuk HTTP caching: (token, timestamp blok terakhir), atau None.
+
+        Token diturunkan dari metadata event, panjang chain, hash blok terakhir dan
+        signature storage chain-nya, jadi berubah saat ada vote baru, metadata
+        diubah, atau blok lama dimodifikasi (head sama, tetapi chain ditulis ulang).
+        Tidak membaca blok selain head dari entri cache.
+        """
+        with self._lock:
+            meta = self.get_event_meta(event_id)
+            if meta is None:
+                return None
+            entry = self._get_entry(event_id)
+            head = entry.chain[-1] if entry.chain else {}
+            state = (len(entry.chain), head.get("hash"), entry.signature)
+        digest = hashlib.sha256(json.dumps(meta, sort_keys=True, ensure_ascii=False, default=str).encode("utf-8"))
+        digest.update(repr(state).encode("utf-8"))
+        return digest.hexdigest()[:32], head.get("timestamp")
+
+    def _get_entry(self, event_id: str) -> _CachedChain:
+        with self._lock:
+            entry = self._chains.get(event_id)
+            if entry is not None and self._is_fresh(entry.checked_at):
+                self._chains.move_to_end(event_id)
+                return entry
+            signature = self.store.chain_signature(event_id)
+            if entry is not None and signature != entry.signature and self._catch_up(event_id, entry, signature):
+                self._chains.move_to_end(event_id)
+            elif entry is None or signature != entry.signature:
+                with METRICS.timer("chainvote_storage_operation_duration_seconds", op="load_chain"):
+                    # Shard biner dibaca langsung lewat mmap (tidak dimuat ke memori)
+                    chain = self.store.open_chain(event_id)
+                    if chain is None and self.compact:
+                        chain = CompactChain(self.store.iter_blocks(event_id))
+                    elif chain is None:
+                        chain = self.store.load_chain(event_id)
+                entry = _CachedChain(chain, signature, time.monotonic())
+                self._remember(event_id, entry)
+            else:
+                entry.checked_at = time.monotonic()
+                self._chains.move_to_end(event_id)
+            return entry
+
+    def _catch_up(self, event_id: str, entry: _CachedChain, signature: Any) -> bool:
+        """Tambahkan blok yang di-append proses lain ke entri cache tanpa memuat ulang chain.
+
+        Hanya berhasil jika storage bisa membaca ekor log sejak signature lama dan
+        blok pertamanya tersambung ke blok terakhir di cache. False -> muat ulang penuh.
+        """
+        chain = entry.chain
+        if isinstance(chain, ChainFile) or not chain:
+            return False
+        with METRICS.timer("chainvote_storage_operation_duration_seconds", op="catch_up"):
+            blocks = self.store.read_appended(event_id, len(chain), entry.signature)
+        if blocks is None:
+            return False
+        expected = len(chain)
+        previous_hash = chain[-1].get("hash")
+        for block in blocks:
+            if block.get("index") != expected or block.get("previous_hash") != previous_hash:
+                return False
+            expected += 1
+            previous_hash = block.get("hash")
+        self._apply_blocks(entry, blocks)
+        entry.signature = signature
+        entry.checked_at = time.monotonic()
+        return True
+
+    def _apply_blocks(self, entry: _CachedChain, blocks: List[Dict[str, Any]]) -> None:
+        """Perbarui chain, index turunan & Merkle tree entri dengan blok-blok baru.
+
+        Shard biner sudah berisi blok-bloknya (ditulis store), jadi tidak di-extend.
+        """
+        if not isinstance(entry.chain, ChainFile):
+            entry.chain.extend(blocks)
+        entry.index_blocks(blocks)
+        if entry.merkle is not None:
+            entry.merkle.extend(block_leaf(b.get("hash")) for b in blocks)
+
+    def refresh(self, event_id: str) -> None:
+        """Samakan entri cache event dengan storage sekarang (abaikan ``revalidate_interval``).
+
+        Dipanggil di bawah lock event sebelum merangkai blok baru di mode
+        multi-worker, dan saat worker lain mengumumkan perubahan.
+        """
+        with self._lock:
+            self._meta_checked_at = 0.0
+            entry = self._chains.get(event_id)
+            if entry is not None:
+                entry.checked_at = 0.0
+                self._get_entry(event_id)
+
+    def _remember(self, event_id: str, entry: _CachedChain) -> None:
+        """Simpan shard chain di cache; buang shard yang paling lama tidak dipakai."""
+        self._chains[event_id] = entry
+        self._chains.move_to_end(event_id)
+        if self.max_chains is not None:
+            while len(self._chains) > max(1, self.max_chains):
+                self._chains.popitem(last=False)
+
+    def get_event(self, event_id: str) -> Dict[str, Any] | None:
+        """Metadata + blockchain event. List ``blockchain`` adalah milik cache (jangan disalin)."""
+        meta = self.get_event_meta(event_id)
+        if meta is None:
+            return None
+        event = dict(meta)
+        event["blockchain"] = self.get_chain(event_id)
+        return event
+
+    # ---------- Tulis (write-through) ----------
+
+    def _refresh_meta_signature(self) -> None:
+        self._meta_signature = self.store.meta_signature()
+        self._meta_checked_at = time.monotonic()
+
+    def _set_chain(self, event_id: str, chain: List[Dict[str, Any]]) -> None:
+        opened = self.store.open_chain(event_id)
+        if opened is not None:
+            chain = opened
+        elif self.compact and not isinstance(chain, CompactChain):
+            chain = CompactChain(chain)
+        self._remember(event_id, _CachedChain(chain, self.store.chain_signature(event_id), time.monotonic()))
+
+    def create_event(self, event: Dict[str, Any]) -> None:
+        with self._lock, METRICS.timer("chainvote_storage_operation_duration_seconds", op="create_event"):
+            self.store.create_event(event)
+            metas = self._ensure_metas()
+            metas[event["event_id"]] = {k: v for k, v in event.items() if k != "blockchain"}
+            self._refresh_meta_signature()
+            self._set_chain(event["event_id"], event.get("blockchain", []))
+
+    def create_events(self, events: List[Dict[str, Any]]) -> None:
+        """Membuat banyak event dengan satu write katalog (provisioning massal)."""
+        with self._lock, METRICS.timer("chainvote_storage_operation_duration_seconds", op="create_events"):
+            self.store.create_events(events)
+            metas = self._ensure_metas()
+            for event in events:
+                metas[event["event_id"]] = {k: v for k, v in event.items() if k != "blockchain"}
+                self._set_chain(event["event_id"], event.get("blockchain", []))
+            self._refresh_meta_signature()
+
+    def save_event_meta(self, event: Dict[str, Any]) -> None:
+        with self._lock, METRICS.timer("chainvote_storage_operation_duration_seconds", op="save_meta"):
+            self.store.save_event_meta(event)
+            metas = self._ensure_metas()
+            metas[event["event_id"]] = {k: v for k, v in event.items() if k != "blockchain"}
+            self._refresh_meta_signature()
+
+    def append_blocks(self, event_id: str, blocks: List[Dict[str, Any]], durable: bool = True) -> None:
+        """Persist blok-blok baru dan perbarui chain di cache tanpa membaca ulang log.
+
+        Pemanggil tidak perlu (dan tidak boleh) menambahkan blok ke chain milik cache sendiri.
+        """
+        if not blocks:
+            return
+        with self._lock:
+            with METRICS.timer("chainvote_storage_operation_duration_seconds", op="append_blocks"):
+                self.store.append_blocks(event_id, blocks, durable=durable)
+            entry = self._chains.get(event_id)
+            if entry is None:
+                return
+            if isinstance(entry.chain, ChainFile) and entry.chain is not self.store.open_chain(event_id):
+                # Store membuka ulang shard biner (diubah proses lain) dan menambahkan blok ke
+                # instance baru: entri lama dibuang tanpa diubah, dimuat ulang saat dibutuhkan
+                del self._chains[event_id]
+                return
+            self._apply_blocks(entry, blocks)
+            entry.signature = self.store.chain_signature(event_id)
+            entry.checked_at = time.monotonic()
+
+    def replace_chain(self, event_id: str, chain: List[Dict[str, Any]], modified_index: int = 0) -> None:
+        """Tulis ulang chain. Checkpoint validasi dimundurkan ke ``modified_index``."""
+        with self._lock:
+            old_entry = self._chains.get(event_id)
+            with METRICS.timer("chainvote_storage_operation_duration_seconds", op="replace_chain"):
+                self.store.replace_chain(event_id, chain)
+            self._set_chain(event_id, chain)
+            if old_entry is not None and old_entry.first_invalid is None:
+                self._chains[event_id].reset_checkpoint(min(old_entry.verified_upto, modified_index))
+
+    # ---------- Validasi incremental ----------
+
+    def check_chain(self, event_id: str, full: bool = False) -> int | None:
+        """Validasi chain event memakai checkpoint.
+
+        Hanya blok setelah checkpoint terakhir yang di-hash ulang (dengan skema
+        hash yang tercatat di metadata event). ``full=True``
+        membuang checkpoint dan memverifikasi ulang dari genesis. Mengembalikan
+        index blok pertama yang rusak, atau None jika chain valid.
+        """
+        with self._lock:
+            entry = self._get_entry(event_id)
+            chain = entry.chain
+            hasher = hasher_for(self.get_event_meta(event_id))
+            if full:
+                entry.reset_checkpoint(0)
+            elif entry.verified_upto and chain[entry.verified_upto - 1].get("hash") != entry.verified_hash:
+                # Prefix berubah tanpa lewat cache: jangan percaya checkpoint
+                entry.reset_checkpoint(0)
+
+            if entry.first_invalid is None and entry.verified_upto < len(chain):
+                with METRICS.timer("chainvote_chain_validation_duration_seconds", mode="incremental"):
+                    if isinstance(chain, _COLUMNAR_CHAINS):
+                        bad_index = chain.find_invalid(entry.verified_upto, hasher)
+                    else:
+                        bad_index = find_invalid_block(chain, entry.verified_upto, hasher)
+                if bad_index is None:
+                    entry.verified_upto = len(chain)
+                    entry.verified_hash = chain[-1].get("hash")
+                else:
+                    entry.verified_upto = bad_index
+                    entry.verified_hash = chain[bad_index - 1].get("hash") if bad_index else None
+                    entry.first_invalid = bad_index
+            return entry.first_invalid
+
+    def record_verification(self, event_id: str, length: int, first_invalid: int | None) -> None:
+        """Simpan hasil verifikasi penuh dari luar (mis. engine audit paralel) sebagai checkpoint."""
+        with self._lock:
+            entry = self._get_entry(event_id)
+            entry.reset_checkpoint(length if first_invalid is None else first_invalid)
+            entry.first_invalid = first_invalid
+
+    def archive_event(self, event_id: str, summary: Dict[str, Any]) -> Dict[str, Any]:
+        """Tutup event: arsipkan chain, simpan ringkasan di katalog, lalu hapus chain panas.
+
+        ``summary`` (tally akhir, checkpoint hash/Merkle, dst.) ikut disimpan di
+        metadata event bersama ``status = "closed"``. Urutannya aman jika proses
+        mati di tengah: arsip selesai ditulis sebelum katalog diubah, dan chain
+        panas baru dihapus setelah katalog menandai event ditutup.
+        Mengembalikan metadata event yang baru.
+        """
+        with self._lock:
+            meta = self.get_event_meta(event_id)
+            if meta is None:
+                raise KeyError(event_id)
+            with METRICS.timer("chainvote_storage_operation_duration_seconds", op="archive_chain"):
+                self.store.write_archive(event_id, summary)
+            closed = dict(meta)
+            closed.update(summary)
+            closed["status"] = "closed"
+            self.save_event_meta(closed)
+            self.store.drop_chain(event_id)
+            self._chains.pop(event_id, None)
+            return closed
+
+    def delete_event(self, event_id: str) -> bool:
+        with self._lock:
+            deleted = self.store.delete_event(event_id)
+            if deleted:
+                self._ensure_metas().pop(event_id, None)
+                self._refresh_meta_signature()
+                self._chains.pop(event_id, None)
+            return deleted
+
+    def get_merkle(self, event_id: str) -> MerkleTree:
+        """Merkle tree event (dibangun sekali dari hash blok, lalu diperbarui setiap append)."""
+        with self._lock:
+            entry = self._get_entry(event_id)
+            if entry.merkle is None:
+                entry.merkle = MerkleTree(block_leaf(block.get("hash")) for block in entry.chain)
+            return entry.merkle
+
+    def find_voter_block(self, event_id: str, voter_id: str) -> int | None:
+        """Posisi blok milik ``voter_id`` pada chain event, atau None jika belum vote."""
+        with self._lock:
+            entry = self._get_entry(event_id)
+            if voter_id not in entry.voters:
+                return None
+            chain = entry.chain
+            if isinstance(chain, _COLUMNAR_CHAINS):
+                return chain.find_voter(voter_id)
+            for position, block in enumerate(chain):
+                if block.get("index") != 0 and block.get("voter_id") == voter_id:
+                    return position
+            return None
+
+    def warm(self, limit: int | None = None) -> int:
+        """Muat katalog lalu chain event yang masih terbuka (terbaru dulu) beserta index-nya.
+
+        Paling banyak ``limit`` chain (default ``max_chains``, agar warm-up tidak
+        saling mengusir di LRU). Lock cache dilepas di antara event, jadi request
+        yang masuk selama warm-up tidak menunggu seluruh proses. Mengembalikan
+        jumlah chain yang dimuat.
+        """
+        limit = self.max_chains if limit is None else limit
+        open_ids = [m["event_id"] for m in self.list_event_meta() if m.get("status") != "closed"]
+        warmed = 0
+        for event_id in reversed(open_ids):
+            if limit is not None and warmed >= limit:
+                break
+            self.get_voters(event_id)
+            warmed += 1
+        return warmed
+
+    def cached_chain_lengths(self) -> Dict[str, int]:
+        """Panjang chain untuk event yang sedang ada di cache (tanpa memuat yang lain)."""
+        with self._lock:
+            return {event_id: len(entry.chain) for event_id, entry in self._chains.items()}
+
+    def invalidate(self, event_id: str | None = None) -> None:
+        """Buang entri cache satu event (atau semuanya) agar dibaca ulang dari storage."""
+        with self._lock:
+            if event_id is None:
+                self._metas = None
+                self._chains.clear()
+            else:
+                self._chains.pop(event_id, None)
+                self._meta_checked_at = 0.0
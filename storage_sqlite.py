@@ -0,0 +1,344 @@
+"""Backend storage SQLite untuk ChainVote.
+
+Tabel:
+- ``events``: metadata event (JSON) + ``chain_version`` yang naik setiap chain berubah
+- ``blocks``: satu baris per blok, primary key (event_id, idx) dan index (event_id, voter_id)
+- ``users``: primary key username
+- ``store_info``: counter versi katalog event & penanda impor ``users.json``
+
+Database memakai WAL mode sehingga banyak pembaca bisa jalan bersamaan dengan
+satu penulis; setiap penulisan berjalan dalam satu transaksi.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List
+
+from archive import ChainArchive
+from storage import EventStore, UserStore
+
+BLOCK_COLUMNS = ("index", "timestamp", "voter_id", "candidate", "previous_hash", "hash")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    event_id TEXT PRIMARY KEY,
+    meta TEXT NOT NULL,
+    chain_version INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS blocks (
+    event_id TEXT NOT NULL,
+    idx INTEGER NOT NULL,
+    timestamp TEXT,
+    voter_id TEXT,
+    candidate TEXT,
+    previous_hash TEXT,
+    hash TEXT,
+    extra TEXT,
+    PRIMARY KEY (event_id, idx)
+);
+CREATE INDEX IF NOT EXISTS blocks_event_voter ON blocks (event_id, voter_id);
+CREATE TABLE IF NOT EXISTS users (
+    username TEXT PRIMARY KEY,
+    password TEXT NOT NULL,
+    role TEXT NOT NULL DEFAULT 'user',
+    extra TEXT
+);
+CREATE TABLE IF NOT EXISTS store_info (
+    key TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO store_info (key, value) VALUES ('catalog_version', 0);
+"""
+
+
+class _SqliteBase:
+    """Koneksi SQLite per-thread (WAL) + helper transaksi tulis."""
+
+    def __init__(self, db_path: str) -> None:
+        self.db_path = db_path
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+        with self._write_lock:
+            self._conn().executescript(SCHEMA)
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=FULL")
+            self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        conn = self._conn()
+        with self._write_lock:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+    def close(self) -> None:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+def _block_to_row(event_id: str, block: Dict[str, Any]) -> tuple:
+    extra = {k: v for k, v in block.items() if k not in BLOCK_COLUMNS}
+    return (
+        event_id,
+        block.get("index"),
+        block.get("timestamp"),
+        block.get("voter_id"),
+        block.get("candidate"),
+        block.get("previous_hash"),
+        block.get("hash"),
+        json.dumps(extra, ensure_ascii=False) if extra else None,
+    )
+
+
+def _row_to_block(row: sqlite3.Row) -> Dict[str, Any]:
+    block = {
+        "index": row["idx"],
+        "timestamp": row["timestamp"],
+        "voter_id": row["voter_id"],
+        "candidate": row["candidate"],
+        "previous_hash": row["previous_hash"],
+        "hash": row["hash"],
+    }
+    if row["extra"]:
+        block.update(json.loads(row["extra"]))
+    return block
+
+
+class SqliteEventStore(_SqliteBase, EventStore):
+    """Penyimpanan event & blockchain di SQLite.
+
+    Chain event yang sudah ditutup dihapus dari tabel ``blocks`` dan dibaca
+    dari arsipnya di ``archive_dir``.
+    """
+
+    _INSERT_BLOCK = (
+        "INSERT INTO blocks (event_id, idx, timestamp, voter_id, candidate, previous_hash, hash, extra) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+    )
+    _SELECT_BLOCKS = "SELECT idx, timestamp, voter_id, candidate, previous_hash, hash, extra FROM blocks"
+
+    def __init__(self, db_path: str, archive_dir: str | None = None) -> None:
+        super().__init__(db_path)
+        self.archive_dir = archive_dir
+        self._archives: Dict[str, ChainArchive] = {}
+
+    # ---------- Metadata event ----------
+
+    def list_event_meta(self) -> List[Dict[str, Any]]:
+        rows = self._conn().execute("SELECT meta FROM events ORDER BY rowid").fetchall()
+        return [json.loads(r["meta"]) for r in rows]
+
+    def get_event_meta(self, event_id: str) -> Dict[str, Any] | None:
+        row = self._conn().execute("SELECT meta FROM events WHERE event_id = ?", (event_id,)).fetchone()
+        return json.loads(row["meta"]) if row else None
+
+    def _upsert_meta(self, conn: sqlite3.Connection, event: Dict[str, Any]) -> None:
+        meta = {k: v for k, v in event.items() if k != "blockchain"}
+        conn.execute(
+            "INSERT INTO events (event_id, meta) VALUES (?, ?) "
+            "ON CONFLICT(event_id) DO UPDATE SET meta = excluded.meta",
+            (meta["event_id"], json.dumps(meta, ensure_ascii=False)),
+        )
+        conn.execute("UPDATE store_info SET value = value + 1 WHERE key = 'catalog_version'")
+
+    def save_event_meta(self, event: Dict[str, Any]) -> None:
+        with self._transaction() as conn:
+            self._upsert_meta(conn, event)
+
+    def meta_signature(self) -> int:
+        row = self._conn().execute("SELECT value FROM store_info WHERE key = 'catalog_version'").fetchone()
+        return row["value"]
+
+    def chain_signature(self, event_id: str) -> int | None:
+        row = self._conn().execute("SELECT chain_version FROM events WHERE event_id = ?", (event_id,)).fetchone()
+        return row["chain_version"] if row else None
+
+    # ---------- Blockchain ----------
+
+    def open_chain(self, event_id: str) -> ChainArchive | None:
+        """Arsip chain jika event sudah ditutup (blok tidak lagi ada di tabel)."""
+        archive = self._archives.get(event_id)
+        if archive is None:
+            archive = self.open_archive(event_id)
+            if archive is not None:
+                self._archives[event_id] = archive
+        return archive
+
+    def load_chain(self, event_id: str) -> List[Dict[str, Any]]:
+        archive = self.open_chain(event_id)
+        if archive is not None:
+            return list(archive)
+        rows = self._conn().execute(f"{self._SELECT_BLOCKS} WHERE event_id = ? ORDER BY idx", (event_id,))
+        return [_row_to_block(r) for r in rows]
+
+    def iter_blocks(self, event_id: str, start: int = 0, stop: int | None = None) -> Iterator[Dict[str, Any]]:
+        """Streaming blok lewat cursor (index-backed pada (event_id, idx))."""
+        archive = self.open_chain(event_id)
+        if archive is not None:
+            yield from archive.iter_range(start, stop)
+            return
+        if stop is None:
+            cursor = self._conn().execute(
+                f"{self._SELECT_BLOCKS} WHERE event_id = ? AND idx >= ? ORDER BY idx", (event_id, start)
+            )
+        else:
+            cursor = self._conn().execute(
+                f"{self._SELECT_BLOCKS} WHERE event_id = ? AND idx >= ? AND idx < ? ORDER BY idx",
+                (event_id, start, stop),
+            )
+        while True:
+            rows = cursor.fetchmany(500)
+            if not rows:
+                return
+            for row in rows:
+                yield _row_to_block(row)
+
+    def create_event(self, event: Dict[str, Any]) -> None:
+        with self._transaction() as conn:
+            self._upsert_meta(conn, event)
+            event_id = event["event_id"]
+            conn.execute("DELETE FROM blocks WHERE event_id = ?", (event_id,))
+            conn.executemany(self._INSERT_BLOCK, [_block_to_row(event_id, b) for b in event.get("blockchain", [])])
+            conn.execute("UPDATE events SET chain_version = chain_version + 1 WHERE event_id = ?", (event_id,))
+
+    def create_events(self, events: List[Dict[str, Any]]) -> None:
+        """Membuat banyak event dalam satu transaksi."""
+        with self._transaction() as conn:
+            for event in events:
+                self._upsert_meta(conn, event)
+                event_id = event["event_id"]
+                conn.execute("DELETE FROM blocks WHERE event_id = ?", (event_id,))
+                conn.executemany(self._INSERT_BLOCK, [_block_to_row(event_id, b) for b in event.get("blockchain", [])])
+                conn.execute("UPDATE events SET chain_version = chain_version + 1 WHERE event_id = ?", (event_id,))
+
+    def append_blocks(self, event_id: str, blocks: List[Dict[str, Any]], durable: bool = False) -> None:
+        """Menambahkan blok dalam satu transaksi (selalu durable: synchronous=FULL)."""
+        if not blocks:
+            return
+        with self._transaction() as conn:
+            conn.executemany(self._INSERT_BLOCK, [_block_to_row(event_id, b) for b in blocks])
+            conn.execute("UPDATE events SET chain_version = chain_version + 1 WHERE event_id = ?", (event_id,))
+
+    def replace_chain(self, event_id: str, chain: List[Dict[str, Any]]) -> None:
+        with self._transaction() as conn:
+            conn.execute("DELETE FROM blocks WHERE event_id = ?", (event_id,))
+            conn.executemany(self._INSERT_BLOCK, [_block_to_row(event_id, b) for b in chain])
+            conn.execute("UPDATE events SET chain_version = chain_version + 1 WHERE event_id = ?", (event_id,))
+
+    def delete_event(self, event_id: str) -> bool:
+        with self._transaction() as conn:
+            deleted = conn.execute("DELETE FROM events WHERE event_id = ?", (event_id,)).rowcount
+            if not deleted:
+                return False
+            conn.execute("DELETE FROM blocks WHERE event_id = ?", (event_id,))
+            conn.execute("UPDATE store_info SET value = value + 1 WHERE key = 'catalog_version'")
+        if self.archive_dir is not None:
+            ChainArchive.remove(self.archive_dir, event_id)
+            self._archives.pop(event_id, None)
+        return True
+
+    def drop_chain(self, event_id: str) -> None:
+        with self._transaction() as conn:
+            conn.execute("DELETE FROM blocks WHERE event_id = ?", (event_id,))
+            conn.execute("UPDATE events SET chain_version = chain_version + 1 WHERE event_id = ?", (event_id,))
+
+
+class SqliteUserStore(_SqliteBase, UserStore):
+    """Penyimpanan user di SQLite (lookup lewat primary key username)."""
+
+    @staticmethod
+    def _row_to_user(row: sqlite3.Row) -> Dict[str, Any]:
+        user = {"username": row["username"], "password": row["password"], "role": row["role"]}
+        if row["extra"]:
+            user.update(json.loads(row["extra"]))
+        return user
+
+    @staticmethod
+    def _user_to_row(user: Dict[str, Any]) -> tuple:
+        extra = {k: v for k, v in user.items() if k not in ("username", "password", "role")}
+        return (
+            user.get("username"),
+            user.get("password", ""),
+            user.get("role", "user"),
+            json.dumps(extra, ensure_ascii=False) if extra else None,
+        )
+
+    def load_users(self) -> List[Dict[str, Any]]:
+        rows = self._conn().execute("SELECT * FROM users ORDER BY rowid").fetchall()
+        return [self._row_to_user(r) for r in rows]
+
+    def save_users(self, users: List[Dict[str, Any]]) -> None:
+        with self._transaction() as conn:
+            conn.execute("DELETE FROM users")
+            conn.executemany(
+                "INSERT INTO users (username, password, role, extra) VALUES (?, ?, ?, ?)",
+                [self._user_to_row(u) for u in users],
+            )
+
+    def find_user(self, username: str) -> Dict[str, Any] | None:
+        row = self._conn().execute("SELECT * FROM users WHERE username = ?", (username,)).fetchone()
+        return self._row_to_user(row) if row else None
+
+    def add_users(self, users: List[Dict[str, Any]]) -> int:
+        with self._transaction() as conn:
+            before = conn.total_changes
+            conn.executemany(
+                "INSERT OR IGNORE INTO users (username, password, role, extra) VALUES (?, ?, ?, ?)",
+                [self._user_to_row(u) for u in users],
+            )
+            return conn.total_changes - before
+
+    def migrate_legacy(self, users_file: str) -> int:
+        """Impor ``users.json`` sekali (saat database pertama kali dipakai setelah backend json).
+
+        File tidak diubah, jadi backend json tetap bisa dipakai lagi. Username yang
+        sudah ada di database tidak ditimpa. Impor ditandai di ``store_info`` sehingga
+        start berikutnya cukup satu SELECT.
+        """
+        marker = "SELECT value FROM store_info WHERE key = 'users_imported'"
+        if self._conn().execute(marker).fetchone():
+            return 0
+        users: List[Dict[str, Any]] = []
+        if os.path.exists(users_file):
+            with open(users_file, "r", encoding="utf-8") as f:
+                try:
+                    users = json.load(f)
+                except json.JSONDecodeError:
+                    users = []
+        with self._transaction() as conn:
+            if conn.execute(marker).fetchone():
+                return 0
+            before = conn.total_changes
+            conn.executemany(
+                "INSERT OR IGNORE INTO users (username, password, role, extra) VALUES (?, ?, ?, ?)",
+                [self._user_to_row(u) for u in users if isinstance(u, dict) and u.get("username")],
+            )
+            imported = conn.total_changes - before
+            conn.execute("INSERT INTO store_info (key, value) VALUES ('users_imported', 1)")
+        return imported
+
+    def update_user(self, user: Dict[str, Any]) -> bool:
+        username, password, role, extra = self._user_to_row(user)
+        with self._transaction() as conn:
+            updated = conn.execute(
+                "UPDATE users SET password = ?, role = ?, extra = ? WHERE username = ?",
+                (password, role, extra, username),
+            ).rowcount
+            return updated > 0
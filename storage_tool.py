@@ -0,0 +1,103 @@
+"""Tool import/export data ChainVote antar backend storage (json <-> sqlite).
+
+Contoh:
+
+    python storage_tool.py json sqlite     # salin events_meta.json + chains/ + users.json ke chainvote.db
+    python storage_tool.py sqlite json     # kebalikannya
+
+Event yang event_id-nya sudah ada di tujuan dilewati (kecuali ``--overwrite``),
+user yang username-nya sudah ada di tujuan juga dilewati. Path file mengikuti
+konstanta di ``app.py``.
+"""
+
+import argparse
+import sys
+from typing import Dict
+
+import app as chainvote
+from storage import BACKENDS, EventStore, UserStore, open_storage
+
+
+def open_backend(backend: str) -> tuple:
+    """Membuka (event_store, user_store) untuk backend dengan path default aplikasi."""
+    return open_storage(
+        backend,
+        meta_file=chainvote.EVENTS_META_FILE,
+        chains_dir=chainvote.CHAINS_DIR,
+        users_file=chainvote.USERS_FILE,
+        sqlite_file=chainvote.SQLITE_FILE,
+        archive_dir=chainvote.ARCHIVE_DIR,
+    )
+
+
+def copy_storage(
+    src_events: EventStore,
+    src_users: UserStore,
+    dst_events: EventStore,
+    dst_users: UserStore,
+    overwrite: bool = False,
+) -> Dict[str, int]:
+    """Salin semua event (beserta blockchain) dan user dari sumber ke tujuan."""
+    stats = {"events": 0, "blocks": 0, "users": 0, "skipped_events": 0, "archived_events": 0}
+    existing_ids = {m.get("event_id") for m in dst_events.list_event_meta()}
+    for meta in src_events.list_event_meta():
+        event_id = meta["event_id"]
+        if event_id in existing_ids and not overwrite:
+            stats["skipped_events"] += 1
+            continue
+        if src_events.open_archive(event_id) is not None:
+            # Event tertutup: folder arsip dipakai bersama kedua backend, cukup salin ringkasannya
+            dst_events.save_event_meta(meta)
+            dst_events.drop_chain(event_id)
+            stats["events"] += 1
+            stats["archived_events"] += 1
+            continue
+        event = dict(meta)
+        event["blockchain"] = src_events.load_chain(event_id)
+        dst_events.create_event(event)
+        stats["events"] += 1
+        stats["blocks"] += len(event["blockchain"])
+
+    dst_user_list = dst_users.load_users()
+    known = {u.get("username") for u in dst_user_list}
+    for user in src_users.load_users():
+        if user.get("username") in known:
+            continue
+        dst_user_list.append(user)
+        known.add(user.get("username"))
+        stats["users"] += 1
+    if stats["users"]:
+        dst_users.save_users(dst_user_list)
+
+    dst_events.sync()
+    return stats
+
+
+def main(argv: list | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Import/export data ChainVote antar backend storage.")
+    parser.add_argument("source", choices=BACKENDS, help="backend sumber")
+    parser.add_argument("target", choices=BACKENDS, help="backend tujuan")
+    parser.add_argument("--overwrite", action="store_true", help="timpa event yang sudah ada di tujuan")
+    args = parser.parse_args(argv)
+
+    if args.source == args.target:
+        parser.error("backend sumber dan tujuan harus berbeda")
+
+    src_events, src_users = open_backend(args.source)
+    dst_events, dst_users = open_backend(args.target)
+    try:
+        stats = copy_storage(src_events, src_users, dst_events, dst_users, overwrite=args.overwrite)
+    finally:
+        for store in (src_events, src_users, dst_events, dst_users):
+            store.close()
+
+    print(
+        f"Selesai: {stats['events']} event ({stats['blocks']} blok), {stats['users']} user disalin; "
+        f"{stats['skipped_events']} event dilewati karena sudah ada, "
+        f"{stats['archived_events']} event tertutup memakai arsip yang sama."
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
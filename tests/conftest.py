@@ -0,0 +1,54 @@
+import os
+import sys
+
+import pytest
+
+# Modul aplikasi berada di root repo (bukan package)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    """App Flask dengan direktori data sementara (semua path data relatif ke cwd)."""
+    import app as app_module
+
+    monkeypatch.chdir(tmp_path)
+    # Hash password murah & tanpa warm-up background agar test cepat dan deterministik
+    monkeypatch.setattr(app_module, "PASSWORD_HASH_ITERATIONS", 1000)
+    monkeypatch.setattr(app_module, "WARMUP_ENABLED", False)
+    flask_app = app_module.create_app()
+    flask_app.config["TESTING"] = True
+    yield flask_app
+    flask_app.extensions["image_pipeline"].close()
+    flask_app.extensions["event_store"].close()
+    flask_app.extensions["user_store"].close()
+    flask_app.extensions["coordinator"].close()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def login_as(client):
+    """``login_as(username, role)``: isi session langsung (tanpa form login)."""
+
+    def login(username, role="user"):
+        with client.session_transaction() as sess:
+            sess["user"] = {"username": username, "role": role}
+
+    return login
+
+
+@pytest.fixture
+def create_event(client, login_as):
+    """``create_event(name, candidates)``: buat event lewat API bulk sebagai admin, kembalikan event_id."""
+
+    def create(name="Pemilu", candidates=("A", "B")):
+        login_as("admin", "admin")
+        response = client.post("/admin/events/bulk", json={"events": [{"name": name, "candidates": list(candidates)}]})
+        assert response.status_code == 201, response.get_json()
+        return response.get_json()["created"][0]["event_id"]
+
+    return create
@@ -0,0 +1,119 @@
+"""Arsip event tertutup: gzip per potongan, baca acak, validasi, dan penutupan lewat app."""
+
+import gzip
+import json
+import os
+import threading
+
+import pytest
+
+import app as app_module
+from archive import ChainArchive, ChainArchiveError, archive_paths
+from blockchain import create_genesis_block, find_invalid_block, make_block
+from ingest import VoteRejected
+
+
+def _chain(length):
+    chain = [create_genesis_block()]
+    for i in range(1, length):
+        chain.append(make_block(chain[-1], f"pemilih-{i}", "AB"[i % 2]))
+    return chain
+
+
+def _write(archive_dir, chain, chunk_blocks=4):
+    return ChainArchive.write(str(archive_dir), "e1", chain, {"final_tally": {"A": 1}}, chunk_blocks=chunk_blocks)
+
+
+def test_round_trip(tmp_path):
+    chain = _chain(11)
+    manifest = _write(tmp_path, chain)
+    assert manifest["chain_length"] == 11 and len(manifest["offsets"]) == 3
+    archive = ChainArchive.open(str(tmp_path), "e1")
+    assert len(archive) == 11 and archive.summary == {"final_tally": {"A": 1}}
+    assert list(archive) == chain
+    assert archive[5] == chain[5] and archive[-1] == chain[-1]
+    assert archive[3:9] == chain[3:9] and archive[::5] == chain[::5]
+    assert list(archive.iter_range(7, 100)) == chain[7:]
+    with pytest.raises(IndexError):
+        archive[11]
+    # File data tetap gzip biasa (multi-member)
+    data_path, _ = archive_paths(str(tmp_path), "e1")
+    with gzip.open(data_path, "rt", encoding="utf-8") as f:
+        assert [json.loads(line) for line in f] == chain
+    assert ChainArchive.open(str(tmp_path), "tidak-ada") is None
+
+
+def test_index_and_validation(tmp_path):
+    chain = _chain(10)
+    _write(tmp_path, chain, chunk_blocks=3)
+    archive = ChainArchive.open(str(tmp_path), "e1")
+    assert archive.tally() == {"A": 4, "B": 5}
+    assert archive.voters() == {f"pemilih-{i}" for i in range(1, 10)}
+    assert archive.find_voter("pemilih-7") == 7 and archive.find_voter("x") is None
+    assert archive.find_invalid() is None
+
+    tampered = [dict(b) for b in chain]
+    tampered[6]["candidate"] = "Z"
+    _write(tmp_path, tampered, chunk_blocks=3)
+    archive = ChainArchive.open(str(tmp_path), "e1")
+    assert archive.find_invalid() == 6 == find_invalid_block(tampered)
+    assert archive.find_invalid(start=7) is None  # link setelah blok rusak tetap tersambung
+
+
+def test_read_only_and_remove(tmp_path):
+    _write(tmp_path, _chain(3))
+    archive = ChainArchive.open(str(tmp_path), "e1")
+    with pytest.raises(ChainArchiveError):
+        archive[1] = {}
+    with pytest.raises(ChainArchiveError):
+        archive.append_blocks([{}])
+    ChainArchive.remove(str(tmp_path), "e1")
+    assert os.listdir(tmp_path) == []
+
+
+def test_concurrent_writes_use_separate_temp_files(tmp_path):
+    chains = [_chain(50 + i) for i in range(4)]
+    errors = []
+
+    def write(chain):
+        try:
+            for _ in range(5):
+                _write(tmp_path, chain)
+        except Exception as exc:  # pragma: no cover - hanya muncul jika file sementara bentrok
+            errors.append(exc)
+
+    threads = [threading.Thread(target=write, args=(chain,)) for chain in chains]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert errors == []
+    assert sorted(os.listdir(tmp_path)) == ["e1.json", "e1.jsonl.gz"]
+    assert list(ChainArchive.open(str(tmp_path), "e1")) in chains
+
+
+def test_close_event_moves_chain_to_archive(app, client, create_event, login_as):
+    event_id = create_event()
+    votes = [(f"pemilih-{i}", "AB"[i % 3 == 0]) for i in range(12)]
+    app.extensions["vote_writer"].submit_many(event_id, votes)
+    chain = list(app.extensions["events_cache"].get_chain(event_id))
+    store = app.extensions["event_store"]
+
+    login_as("admin", "admin")
+    client.post(f"/event/{event_id}/close")
+    meta = store.get_event_meta(event_id)
+    assert meta["status"] == "closed" and meta["chain_length"] == 13
+    assert meta["final_tally"] == {"A": 8, "B": 4} and meta["chain_valid"]
+    assert meta["head_hash"] == chain[-1]["hash"]
+    assert not os.path.exists(store.chain_path(event_id))
+    data_path, manifest_path = archive_paths(app_module.ARCHIVE_DIR, event_id)
+    assert os.path.exists(data_path) and os.path.exists(manifest_path)
+
+    # Viewer, API blok dan ekspor membaca dari arsip; vote baru ditolak
+    assert list(store.load_chain(event_id)) == chain
+    blocks = client.get(f"/event/{event_id}/blocks?start=10&limit=5").get_json()["blocks"]
+    assert [b["hash"] for b in blocks] == [b["hash"] for b in chain[10:]]
+    with pytest.raises(VoteRejected) as excinfo:
+        app.extensions["vote_writer"].submit_many(event_id, [("baru", "A")])
+    assert excinfo.value.reason == VoteRejected.EVENT_CLOSED
+    assert client.get(f"/event/{event_id}/blockchain/audit").get_json()["valid"]
@@ -0,0 +1,132 @@
+"""Upload vote massal: hasil per entri, entri tidak valid ditolak tanpa 500."""
+
+import pytest
+
+from ingest import VoteRejected, VoteWriter
+
+
+def _writer(event, voted=()):
+    committed = []
+
+    def commit(evt, votes):
+        blocks = [{"index": len(committed) + i + 1, "voter_id": v, "candidate": c} for i, (v, c) in enumerate(votes)]
+        committed.extend(blocks)
+        return blocks
+
+    writer = VoteWriter(lambda event_id: event, lambda evt, voter: voter in voted, commit)
+    return writer, committed
+
+
+def test_check_votes_edge_cases():
+    writer, _ = _writer({"event_id": "e", "candidates": ["A", "B"]}, voted={"lama"})
+    reasons = writer._check_votes(
+        {"candidates": ["A", "B"]},
+        [
+            ("v1", "A"),
+            ("v1", "B"),  # voter ganda dalam satu upload
+            ("lama", "A"),  # sudah vote sebelumnya
+            ("v2", "Z"),
+            ("v3", ["A"]),  # list tidak bisa di-hash
+            ("v4", {"A": 1}),
+            ("v5", None),
+            ("", "A"),
+            (None, "A"),
+            (7, "A"),
+        ],
+    )
+    assert reasons == [
+        None,
+        VoteRejected.ALREADY_VOTED,
+        VoteRejected.ALREADY_VOTED,
+        VoteRejected.INVALID_CANDIDATE,
+        VoteRejected.INVALID_ENTRY,
+        VoteRejected.INVALID_ENTRY,
+        VoteRejected.INVALID_ENTRY,
+        VoteRejected.INVALID_ENTRY,
+        VoteRejected.INVALID_ENTRY,
+        VoteRejected.INVALID_ENTRY,
+    ]
+
+
+def test_submit_many_commits_accepted_in_order():
+    writer, committed = _writer({"event_id": "e", "candidates": ["A", "B"]})
+    results = writer.submit_many("e", [("v1", "A"), ("v2", ["x"]), ("v3", "B")])
+    assert results == [
+        {"accepted": True, "index": 1},
+        {"accepted": False, "reason": VoteRejected.INVALID_ENTRY},
+        {"accepted": True, "index": 2},
+    ]
+    assert [(b["voter_id"], b["candidate"]) for b in committed] == [("v1", "A"), ("v3", "B")]
+
+
+def test_submit_many_without_accepted_entries_does_not_commit():
+    writer, committed = _writer({"event_id": "e", "candidates": ["A"]})
+    results = writer.submit_many("e", [("v1", "Z")])
+    assert results == [{"accepted": False, "reason": VoteRejected.INVALID_CANDIDATE}]
+    assert committed == []
+
+
+@pytest.mark.parametrize(
+    "event, reason",
+    [(None, VoteRejected.EVENT_NOT_FOUND), ({"candidates": ["A"], "status": "closed"}, VoteRejected.EVENT_CLOSED)],
+)
+def test_submit_many_rejects_whole_upload(event, reason):
+    writer, committed = _writer(event)
+    with pytest.raises(VoteRejected) as info:
+        writer.submit_many("e", [("v1", "A")])
+    assert info.value.reason == reason
+    assert committed == []
+
+
+def test_batch_endpoint_rejects_invalid_entries(app, client, create_event):
+    event_id = create_event(candidates=("A", "B"))
+    votes = [
+        {"voter_id": "v1", "candidate": "A"},
+        {"voter_id": "v2", "candidate": ["x"]},
+        {"voter_id": "v3", "candidate": {"A": 1}},
+        {"voter_id": "v1", "candidate": "B"},
+        {"voter_id": "v4", "candidate": "Z"},
+        "bukan objek",
+        {"voter_id": "v5", "candidate": "B"},
+    ]
+    response = client.post(f"/event/{event_id}/votes/batch", json={"votes": votes})
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body["accepted"] == 2 and body["rejected"] == 5
+    assert [r["accepted"] for r in body["results"]] == [True, False, False, False, False, False, True]
+    assert [r.get("reason") for r in body["results"][1:6]] == [
+        VoteRejected.INVALID_ENTRY,
+        VoteRejected.INVALID_ENTRY,
+        VoteRejected.ALREADY_VOTED,
+        VoteRejected.INVALID_CANDIDATE,
+        VoteRejected.INVALID_ENTRY,
+    ]
+    chain = app.extensions["events_cache"].get_chain(event_id)
+    assert [(b["voter_id"], b["candidate"]) for b in list(chain)[1:]] == [("v1", "A"), ("v5", "B")]
+    assert [r["index"] for r in body["results"] if r["accepted"]] == [1, 2]
+
+
+def test_batch_endpoint_errors(client, create_event, login_as):
+    event_id = create_event()
+    assert client.post(f"/event/{event_id}/votes/batch", json={"votes": {}}).status_code == 400
+    assert client.post("/event/tidak-ada/votes/batch", json={"votes": []}).status_code == 404
+    assert client.post(f"/event/{event_id}/close").status_code == 302
+    assert client.post(f"/event/{event_id}/votes/batch", json={"votes": []}).status_code == 409
+    login_as("user")
+    assert client.post(f"/event/{event_id}/votes/batch", json={"votes": []}).status_code == 403
+
+
+def test_single_vote_invalid_entry_stays_on_event(app, client, create_event, login_as, monkeypatch):
+    event_id = create_event()
+    writer = app.extensions["vote_writer"]
+
+    def reject(*args, **kwargs):
+        raise VoteRejected(VoteRejected.INVALID_ENTRY)
+
+    monkeypatch.setattr(writer, "submit", reject)
+    login_as("user")
+    response = client.post(f"/event/{event_id}", data={"candidate": "A"})
+    assert response.status_code == 302
+    assert response.headers["Location"].endswith(f"/event/{event_id}")
+    with client.session_transaction() as sess:
+        assert sess["_flashes"] == [("danger", "Data vote tidak valid.")]
@@ -0,0 +1,38 @@
+"""Smoke test benchmark: run kecil harus selesai tanpa vote hilang."""
+
+import json
+
+import pytest
+
+import app as app_module
+import benchmark
+
+
+def test_percentile_and_summary():
+    values = [0.001 * i for i in range(1, 101)]
+    assert benchmark.percentile(values, 50) == pytest.approx(0.050)
+    assert benchmark.percentile(values, 99) == pytest.approx(0.099)
+    assert benchmark.percentile([], 95) == 0.0
+    summary = benchmark.summarize_timings([0.002, 0.001], wall_time=0.5)
+    assert summary["count"] == 2 and summary["throughput_per_s"] == 4.0
+
+
+@pytest.mark.parametrize("backend", ["json", "sqlite"])
+def test_small_run(tmp_path, monkeypatch, backend):
+    # run_benchmarks mengubah global modul app; kembalikan setelah test
+    monkeypatch.setattr(app_module, "STORAGE_BACKEND", app_module.STORAGE_BACKEND)
+    monkeypatch.setattr(app_module, "PASSWORD_HASH_ITERATIONS", 1000)
+    monkeypatch.setattr(app_module, "WARMUP_ENABLED", False)
+    output = tmp_path / "bench.json"
+    argv = [
+        "--events", "2", "--chain-length", "20", "--users", "30", "--iterations", "5",
+        "--concurrency", "2", "--votes-per-thread", "3", "--backend", backend, "--json", str(output),
+    ]
+    assert benchmark.main(argv) == 0
+    report = json.loads(output.read_text(encoding="utf-8"))
+    assert report["config"]["backend"] == backend
+    assert {"http_vote_post", "check_chain_full", "check_chain_incremental", "hash_many_v2"} <= set(report["results"])
+    concurrency = report["concurrency"]
+    assert concurrency["votes_recorded"] == concurrency["votes_submitted"] == 6
+    assert concurrency["lost_votes"] == 0 and concurrency["duplicated_voters"] == 0
+    assert concurrency["chain_valid"]
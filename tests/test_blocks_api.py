@@ -0,0 +1,43 @@
+"""Viewer blockchain berhalaman & API blok bertahap."""
+
+import app as app_module
+
+
+def _fill(app, event_id, count):
+    votes = [(f"pemilih-{i:02d}", "AB"[i % 2]) for i in range(count)]
+    results = app.extensions["vote_writer"].submit_many(event_id, votes)
+    assert all(r["accepted"] for r in results)
+
+
+def test_blocks_api_pages(app, client, create_event):
+    event_id = create_event()
+    _fill(app, event_id, 24)
+    body = client.get(f"/event/{event_id}/blocks?start=5&limit=10").get_json()
+    assert body["chain_length"] == 25
+    assert [b["index"] for b in body["blocks"]] == list(range(5, 15))
+    assert body["next_start"] == 15
+    last = client.get(f"/event/{event_id}/blocks?start=20&limit=10").get_json()
+    assert [b["index"] for b in last["blocks"]] == list(range(20, 25))
+    assert last["next_start"] is None
+
+
+def test_blocks_api_clamps_parameters(app, client, create_event, monkeypatch):
+    monkeypatch.setattr(app_module, "BLOCKS_API_MAX_LIMIT", 7)
+    event_id = create_event()
+    _fill(app, event_id, 10)
+    body = client.get(f"/event/{event_id}/blocks?start=-3&limit=1000").get_json()
+    assert body["start"] == 0 and body["limit"] == 7 and len(body["blocks"]) == 7
+    assert client.get(f"/event/{event_id}/blocks?limit=0").get_json()["limit"] == 1
+    assert client.get("/event/tidak-ada/blocks").status_code == 404
+
+
+def test_blockchain_page_renders_one_page(app, client, create_event, monkeypatch):
+    monkeypatch.setattr(app_module, "BLOCKS_PAGE_SIZE", 4)
+    event_id = create_event()
+    _fill(app, event_id, 9)
+    first = client.get(f"/event/{event_id}/blockchain").data.decode()
+    assert "pemilih-02" in first and "pemilih-03" not in first
+    assert 'data-next-start="4"' in first
+    last = client.get(f"/event/{event_id}/blockchain?page=3").data.decode()
+    assert "pemilih-08" in last and "pemilih-02" not in last
+    assert "data-next-start" not in last
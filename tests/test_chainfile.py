@@ -0,0 +1,163 @@
+"""ChainFile: append berulang, tamper di tempat, dan crash saat commit header."""
+
+import threading
+
+import pytest
+
+from blockchain import create_genesis_block, find_invalid_block, make_block
+from chainfile import MIN_RESERVE, ChainFile
+
+
+def _extend(chain, count, prefix="voter"):
+    blocks = []
+    tail = chain[-1]
+    for i in range(count):
+        tail = make_block(tail, f"{prefix}-{len(chain) + i}", "AB"[i % 2])
+        blocks.append(tail)
+    return blocks
+
+
+def _write(tmp_path, length=10):
+    path = str(tmp_path / "event.cvc")
+    chain = [create_genesis_block()]
+    chain += _extend(chain, length - 1)
+    ChainFile.write(path, chain)
+    return path, chain
+
+
+def test_write_and_reopen(tmp_path):
+    path, chain = _write(tmp_path)
+    cf = ChainFile(path)
+    try:
+        assert len(cf) == len(chain)
+        assert list(cf) == chain
+        assert cf[-1] == chain[-1] and cf[2:5] == chain[2:5]
+        assert cf.find_invalid() is None
+    finally:
+        cf.close()
+
+
+def test_append_blocks_across_relocation(tmp_path):
+    path, chain = _write(tmp_path, length=3)
+    cf = ChainFile(path)
+    try:
+        # Cukup banyak append kecil & besar agar tabel string dipindahkan beberapa kali
+        for size in (1, 5, MIN_RESERVE, 2 * MIN_RESERVE, 3):
+            blocks = _extend(chain, size, prefix=f"batch{size}")
+            cf.append_blocks(blocks)
+            chain.extend(blocks)
+            assert list(cf) == chain
+    finally:
+        cf.close()
+    reopened = ChainFile(path)
+    try:
+        assert list(reopened) == chain
+        assert reopened.find_invalid() is None
+        assert reopened.voters() == {b["voter_id"] for b in chain[1:]}
+    finally:
+        reopened.close()
+
+
+def test_setitem_tamper_is_detected(tmp_path):
+    path, chain = _write(tmp_path)
+    cf = ChainFile(path)
+    try:
+        tampered = dict(chain[4], candidate="kandidat-baru", catatan="diubah")
+        cf[4] = tampered
+        assert cf[4] == tampered
+        assert cf[5] == chain[5]
+        expected = find_invalid_block(chain[:4] + [tampered] + chain[5:])
+        assert expected is not None
+        assert cf.find_invalid() == expected
+    finally:
+        cf.close()
+    reopened = ChainFile(path)
+    try:
+        assert reopened[4] == tampered
+        assert reopened.find_invalid() == expected
+    finally:
+        reopened.close()
+
+
+@pytest.mark.parametrize("fail_on_call", [1, 2])
+def test_failed_commit_keeps_old_blocks(tmp_path, monkeypatch, fail_on_call):
+    path, chain = _write(tmp_path, length=3)
+    cf = ChainFile(path)
+    original = ChainFile._commit_header
+    calls = []
+
+    def flaky_commit(self):
+        calls.append(1)
+        if len(calls) == fail_on_call:
+            raise OSError("disk penuh")
+        original(self)
+
+    # Append besar memaksa relokasi tabel string: commit ke-1 = relokasi, ke-2 = jumlah blok
+    blocks = _extend(chain, MIN_RESERVE + 1, prefix="gagal")
+    monkeypatch.setattr(ChainFile, "_commit_header", flaky_commit)
+    try:
+        with pytest.raises(OSError):
+            cf.append_blocks(blocks)
+        assert list(cf) == chain
+    finally:
+        cf.close()
+    monkeypatch.setattr(ChainFile, "_commit_header", original)
+    reopened = ChainFile(path)
+    try:
+        assert list(reopened) == chain
+        more = _extend(chain, 4, prefix="lanjut")
+        reopened.append_blocks(more)
+        assert list(reopened) == chain + more
+    finally:
+        reopened.close()
+
+
+def test_is_stale_after_other_handle_appends(tmp_path):
+    path, chain = _write(tmp_path)
+    reader = ChainFile(path)
+    writer = ChainFile(path)
+    try:
+        assert not reader.is_stale()
+        writer.append_blocks(_extend(chain, 2, prefix="lain"))
+        assert reader.is_stale()
+        assert not writer.is_stale()
+    finally:
+        reader.close()
+        writer.close()
+    ChainFile.write(path, chain)
+    reader = ChainFile(path)
+    try:
+        assert not reader.is_stale()
+        ChainFile.write(path, chain)
+        assert reader.is_stale()
+    finally:
+        reader.close()
+
+
+def test_concurrent_writes_use_separate_temp_files(tmp_path):
+    path = str(tmp_path / "event.cvc")
+    chains = []
+    for t in range(4):
+        chain = [create_genesis_block()]
+        chains.append(chain + _extend(chain, 200, prefix=f"t{t}"))
+    errors = []
+
+    def write(chain):
+        try:
+            for _ in range(5):
+                ChainFile.write(path, chain)
+        except Exception as exc:  # pragma: no cover - hanya muncul jika file sementara bentrok
+            errors.append(exc)
+
+    threads = [threading.Thread(target=write, args=(chain,)) for chain in chains]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert errors == []
+    cf = ChainFile(path)
+    try:
+        assert list(cf) in chains
+    finally:
+        cf.close()
+    assert [p.name for p in tmp_path.iterdir()] == ["event.cvc"]
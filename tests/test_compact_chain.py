@@ -0,0 +1,68 @@
+"""CompactChain: blok apa pun harus kembali persis sama seperti saat dimasukkan."""
+
+from blockchain import create_genesis_block, find_invalid_block, make_block
+from compact_chain import CompactChain, decode_timestamp, encode_timestamp
+
+
+def _chain(length=20):
+    chain = [create_genesis_block()]
+    for i in range(1, length):
+        chain.append(make_block(chain[-1], f"voter-{i}", "AB"[i % 2]))
+    return chain
+
+
+def _odd_blocks(chain):
+    """Blok yang tidak bisa dikodekan kolom biasa (disimpan sebagai field khusus)."""
+    tail = chain[-1]["hash"]
+    return chain + [
+        {"index": "7", "timestamp": "bukan waktu", "voter_id": None, "candidate": 3, "previous_hash": tail, "hash": "x"},
+        {"index": len(chain) + 1, "timestamp": "2024-01-01T00:00:00", "voter_id": "v", "candidate": "Ω",
+         "previous_hash": "ABC", "hash": "0" * 64, "catatan": {"tamper": True}},
+    ]
+
+
+def test_round_trip():
+    chain = _odd_blocks(_chain())
+    compact = CompactChain(chain)
+    assert len(compact) == len(chain)
+    assert list(compact) == chain
+    assert compact[3] == chain[3] and compact[-1] == chain[-1]
+    assert compact[2:5] == chain[2:5]
+
+
+def test_setitem_and_append():
+    chain = _chain()
+    compact = CompactChain(chain)
+    tampered = dict(chain[4], candidate="Z", extra="x")
+    compact[4] = tampered
+    assert compact[4] == tampered
+    block = make_block(chain[-1], "baru", "A")
+    compact.append(block)
+    assert compact[-1] == block and len(compact) == len(chain) + 1
+
+
+def test_find_invalid_matches_list_validation():
+    chain = _chain(50)
+    assert CompactChain(chain).find_invalid() is None
+    chain[17] = dict(chain[17], candidate="B" if chain[17]["candidate"] == "A" else "A")
+    assert find_invalid_block(chain) == 17
+    assert CompactChain(chain).find_invalid() == 17
+    assert CompactChain(chain).find_invalid(20) is None
+
+
+def test_tally_and_voters():
+    chain = _chain(11)
+    compact = CompactChain(chain)
+    assert compact.tally() == {"A": 5, "B": 5}
+    assert compact.voters() == {f"voter-{i}" for i in range(1, 11)}
+    assert compact.find_voter("voter-3") == 3
+    assert compact.find_voter("GENESIS") is None
+
+
+def test_timestamp_encoding_round_trip():
+    value = "2024-02-29T23:59:59.123456"
+    assert decode_timestamp(encode_timestamp(value)) == value
+    assert decode_timestamp(encode_timestamp("2024-02-29T23:59:59")) == "2024-02-29T23:59:59"
+    # Bentuk lain yang tidak kembali persis disimpan apa adanya (field khusus)
+    assert encode_timestamp("2024-02-29 23:59:59") is None
+    assert encode_timestamp("2024-02-29T23:59:59+00:00") is None
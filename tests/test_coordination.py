@@ -0,0 +1,146 @@
+"""Mode multi-worker: lock file lintas proses & broadcast perubahan lewat change log."""
+
+import os
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+
+import app as app_module
+from blockchain import make_block
+from coordination import ALL, BLOCKS, FileCoordinator, FileLock
+from hashing import hasher_for
+from storage import JsonlEventStore
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture(autouse=True)
+def multiprocess_mode(monkeypatch):
+    """App memakai FileCoordinator; cache tidak revalidasi sendiri, jadi hanya broadcast yang menyegarkan."""
+    monkeypatch.setattr(app_module, "MULTIPROCESS", True)
+    monkeypatch.setattr(app_module, "CHANGE_POLL_INTERVAL", 0.02)
+    monkeypatch.setattr(app_module, "CACHE_REVALIDATE_INTERVAL", 3600)
+
+
+def _run_child(code, *args):
+    """Jalankan ``code`` di proses Python lain (pid berbeda), cwd = root repo."""
+    return subprocess.Popen(
+        [sys.executable, "-c", code, *args],
+        cwd=REPO_DIR,
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+
+
+def _wait_for(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def test_lock_excludes_other_process(tmp_path):
+    lock_path = str(tmp_path / "event.lock")
+    marker = tmp_path / "marker"
+    child = _run_child(
+        "import sys, time\n"
+        "from coordination import FileLock\n"
+        "with FileLock(sys.argv[1]):\n"
+        "    print('locked', flush=True)\n"
+        "    time.sleep(0.3)\n"
+        "    open(sys.argv[2], 'w').close()\n",
+        lock_path,
+        str(marker),
+    )
+    try:
+        assert child.stdout.readline().strip() == "locked"
+        with FileLock(lock_path):
+            # Lock baru didapat setelah proses lain selesai di dalam critical section
+            assert marker.exists()
+    finally:
+        child.wait(5)
+
+
+def test_lock_reentrant_and_exclusive_between_threads(tmp_path):
+    lock = FileLock(str(tmp_path / "x.lock"))
+    acquired = threading.Event()
+
+    def other():
+        with lock:
+            acquired.set()
+
+    with lock:
+        with lock:
+            thread = threading.Thread(target=other)
+            thread.start()
+        assert not acquired.wait(0.1)
+    assert acquired.wait(5)
+    thread.join()
+
+
+def test_publish_reaches_other_process_only(tmp_path):
+    state_dir = str(tmp_path / "coordination")
+    coordinator = FileCoordinator(state_dir, poll_interval=0.01)
+    received = []
+    coordinator.subscribe(lambda kind, event_id: received.append((kind, event_id)))
+    try:
+        coordinator.publish(BLOCKS, "sendiri")  # perubahan milik proses ini tidak dikirim balik
+        child = _run_child(
+            "import sys\n"
+            "from coordination import FileCoordinator\n"
+            "c = FileCoordinator(sys.argv[1])\n"
+            "c.publish('blocks', 'e1')\n"
+            "c.publish('meta')\n"
+            "c.close()\n",
+            state_dir,
+        )
+        assert child.wait(10) == 0
+        assert _wait_for(lambda: len(received) == 2)
+        assert received == [(BLOCKS, "e1"), ("meta", None)]
+    finally:
+        coordinator.close()
+
+
+def test_rotated_log_reports_all(tmp_path):
+    state_dir = str(tmp_path / "coordination")
+    reader = FileCoordinator(state_dir, poll_interval=0.01)
+    writer = FileCoordinator(state_dir, max_log_bytes=1)
+    received = []
+    reader.subscribe(lambda kind, event_id: received.append((kind, event_id)))
+    try:
+        writer.publish(BLOCKS, "e1")
+        assert _wait_for(lambda: (ALL, None) in received)
+        assert os.path.getsize(writer.log_path) == 0
+    finally:
+        reader.close()
+        writer.close()
+
+
+def test_app_applies_blocks_from_other_worker(app, client, create_event):
+    event_id = create_event()
+    events_cache = app.extensions["events_cache"]
+    chain_feed = app.extensions["chain_feed"]
+    assert len(events_cache.get_chain(event_id)) == 1
+    version = chain_feed.state(event_id)[0]
+
+    # Worker lain: tulis blok ke storage bersama lalu umumkan lewat change log (pid lain)
+    other = JsonlEventStore(app_module.EVENTS_META_FILE, app_module.CHAINS_DIR)
+    try:
+        genesis = other.load_chain(event_id)[0]
+        block = make_block(genesis, "pemilih-lain", "A", hasher=hasher_for(other.get_event_meta(event_id)))
+        other.append_blocks(event_id, [block], durable=True)
+    finally:
+        other.close()
+    assert len(events_cache.get_chain(event_id)) == 1  # belum ada broadcast: cache masih lama
+    with open(os.path.join(app_module.COORDINATION_DIR, "changes.log"), "a", encoding="utf-8") as f:
+        f.write(f"{os.getpid() + 1} {BLOCKS} {event_id}\n")
+
+    assert _wait_for(lambda: len(events_cache.get_chain(event_id)) == 2)
+    assert chain_feed.state(event_id)[0] > version
+    assert "pemilih-lain" in events_cache.get_voters(event_id)
+    assert events_cache.check_chain(event_id) is None
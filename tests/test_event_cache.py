@@ -0,0 +1,143 @@
+"""EventCache: write-through, revalidasi perubahan dari proses lain, index voter & tally."""
+
+import pytest
+
+from blockchain import create_genesis_block, make_block
+from storage import EventCache, JsonlEventStore
+
+
+def _event(event_id, votes=0):
+    chain = [create_genesis_block()]
+    for i in range(votes):
+        chain.append(make_block(chain[-1], f"voter-{i}", "AB"[i % 2]))
+    return {"event_id": event_id, "name": event_id, "candidates": ["A", "B"], "blockchain": chain}
+
+
+@pytest.fixture
+def stores(tmp_path):
+    """Dua instance store pada folder yang sama (seperti dua worker)."""
+    opened = [
+        JsonlEventStore(str(tmp_path / "events_meta.json"), str(tmp_path / "chains"), fsync_batch_size=1)
+        for _ in range(2)
+    ]
+    yield opened
+    for store in opened:
+        store.close()
+
+
+def _next(cache, event_id, voter, candidate="A"):
+    return make_block(cache.get_chain(event_id)[-1], voter, candidate)
+
+
+def test_write_through_updates_indexes(stores):
+    cache = EventCache(stores[0], revalidate_interval=3600)
+    cache.create_event(_event("e1", votes=2))
+    cache.append_blocks("e1", [_next(cache, "e1", "baru", "B")])
+    assert len(cache.get_chain("e1")) == 4
+    assert cache.get_voters("e1") == {"voter-0", "voter-1", "baru"}
+    assert cache.get_tally("e1") == {"A": 1, "B": 2}
+    assert cache.find_voter_block("e1", "baru") == 3
+    assert cache.find_voter_block("e1", "belum") is None
+
+
+def test_other_instance_changes_wait_for_revalidation(stores):
+    writer = EventCache(stores[0], revalidate_interval=3600)
+    reader = EventCache(stores[1], revalidate_interval=3600)
+    writer.create_event(_event("e1", votes=1))
+    assert len(reader.get_chain("e1")) == 2
+    assert reader.get_event_meta("e1")["name"] == "e1"
+
+    writer.append_blocks("e1", [_next(writer, "e1", "v-lain")])
+    writer.save_event_meta(dict(writer.get_event_meta("e1"), name="Nama baru"))
+    # Masih dalam revalidate_interval: reader memakai salinan lama tanpa menyentuh file
+    assert len(reader.get_chain("e1")) == 2
+    assert reader.get_event_meta("e1")["name"] == "e1"
+
+    reader.refresh("e1")
+    assert len(reader.get_chain("e1")) == 3
+    assert "v-lain" in reader.get_voters("e1")
+    assert reader.get_event_meta("e1")["name"] == "Nama baru"
+
+
+def test_append_from_other_instance_is_caught_up_in_place(stores):
+    writer = EventCache(stores[0], revalidate_interval=0)
+    reader = EventCache(stores[1], revalidate_interval=0)
+    writer.create_event(_event("e1", votes=3))
+    chain = reader.get_chain("e1")
+    reader.get_merkle("e1")
+    writer.append_blocks("e1", [_next(writer, "e1", "v4")])
+    # Hanya ekor log yang dibaca: objek chain yang sama diperpanjang
+    assert reader.get_chain("e1") is chain
+    assert len(chain) == 5 and chain[-1]["voter_id"] == "v4"
+    assert reader.get_merkle("e1").root() == writer.get_merkle("e1").root()
+    assert reader.check_chain("e1") is None
+
+
+def test_rewritten_chain_is_reloaded(stores):
+    writer = EventCache(stores[0], revalidate_interval=0)
+    reader = EventCache(stores[1], revalidate_interval=0)
+    writer.create_event(_event("e1", votes=3))
+    assert reader.check_chain("e1") is None
+    tampered = list(writer.get_chain("e1"))
+    tampered[1] = dict(tampered[1], candidate="B")
+    writer.replace_chain("e1", tampered, modified_index=1)
+    assert reader.get_chain("e1")[1]["candidate"] == "B"
+    assert reader.get_tally("e1") == {"A": 1, "B": 2}
+    assert reader.check_chain("e1") == 1
+
+
+def test_deleted_event_disappears(stores):
+    writer = EventCache(stores[0], revalidate_interval=0)
+    reader = EventCache(stores[1], revalidate_interval=0)
+    writer.create_events([_event("e1"), _event("e2")])
+    assert [m["event_id"] for m in reader.list_event_meta()] == ["e1", "e2"]
+    reader.get_chain("e1")
+    assert writer.delete_event("e1")
+    assert [m["event_id"] for m in reader.list_event_meta()] == ["e2"]
+    assert reader.get_event("e1") is None
+
+
+def test_invalidate_forces_reload(stores):
+    cache = EventCache(stores[0], revalidate_interval=3600)
+    cache.create_event(_event("e1", votes=1))
+    chain = cache.get_chain("e1")
+    cache.invalidate("e1")
+    assert cache.get_chain("e1") is not chain
+    assert list(cache.get_chain("e1")) == list(chain)
+
+
+def test_version_changes_on_append_and_meta(stores):
+    cache = EventCache(stores[0], revalidate_interval=3600)
+    cache.create_event(_event("e1"))
+    first = cache.get_version("e1")
+    cache.append_blocks("e1", [_next(cache, "e1", "v")])
+    second = cache.get_version("e1")
+    cache.save_event_meta(dict(cache.get_event_meta("e1"), name="lain"))
+    assert len({first[0], second[0], cache.get_version("e1")[0]}) == 3
+    assert cache.get_version("tidak-ada") is None
+
+
+def test_lru_keeps_at_most_max_chains(stores):
+    cache = EventCache(stores[0], revalidate_interval=3600, max_chains=2)
+    cache.create_events([_event(f"e{i}") for i in range(4)])
+    for i in range(4):
+        cache.get_chain(f"e{i}")
+    assert sorted(cache.cached_chain_lengths()) == ["e2", "e3"]
+
+
+def test_stale_binary_entry_is_evicted_not_mutated(stores):
+    writer = EventCache(stores[0], revalidate_interval=3600)
+    reader = EventCache(stores[1], revalidate_interval=3600)
+    writer.create_event(_event("e1", votes=2))
+    stores[0].convert_chain("e1", "binary")
+    writer.invalidate("e1")
+
+    old_voters = set(reader.get_voters("e1"))
+    old_entry = reader._chains["e1"]
+    writer.append_blocks("e1", [_next(writer, "e1", "dari-writer")])
+    # Shard milik reader kini basi; store-nya membuka ulang shard sebelum append
+    reader.append_blocks("e1", [_next(writer, "e1", "dari-reader")])
+    assert old_entry.voters == old_voters
+    assert "e1" not in reader.cached_chain_lengths()
+    assert reader.get_voters("e1") == old_voters | {"dari-writer", "dari-reader"}
+    assert len(reader.get_chain("e1")) == 5
@@ -0,0 +1,48 @@
+"""Halaman utama hanya membaca katalog event; shard chain dimuat saat dibutuhkan."""
+
+import os
+
+import pytest
+
+
+def _forbid_chain_reads(monkeypatch, store):
+    def fail(*args, **kwargs):
+        raise AssertionError("shard chain tidak boleh dibaca")
+
+    for name in ("load_chain", "open_chain", "iter_blocks", "read_appended"):
+        monkeypatch.setattr(store, name, fail)
+
+
+@pytest.fixture
+def events(app, create_event):
+    event_ids = [create_event(name=f"Pemilu {i}") for i in range(3)]
+    votes = [(f"pemilih-{i}", "A") for i in range(20)]
+    app.extensions["vote_writer"].submit_many(event_ids[0], votes)
+    app.extensions["events_cache"].invalidate()
+    return event_ids
+
+
+def test_index_does_not_load_chains(app, client, events, login_as, monkeypatch):
+    _forbid_chain_reads(monkeypatch, app.extensions["event_store"])
+    login_as("budi")
+    page = client.get("/").get_data(as_text=True)
+    assert all(f"Pemilu {i}" in page for i in range(3))
+    assert app.extensions["events_cache"].cached_chain_lengths() == {}
+
+
+def test_chain_loaded_lazily_per_event(app, client, events, login_as):
+    login_as("budi")
+    client.get(f"/event/{events[0]}")
+    assert app.extensions["events_cache"].cached_chain_lengths() == {events[0]: 21}
+
+
+def test_delete_drops_only_the_shard(app, client, events, login_as, monkeypatch):
+    store = app.extensions["event_store"]
+    path = store.chain_path(events[0])
+    other = store.chain_path(events[1])
+    assert os.path.exists(path)
+    _forbid_chain_reads(monkeypatch, store)
+    login_as("admin", "admin")
+    client.post(f"/event/{events[0]}/delete")
+    assert not os.path.exists(path) and os.path.exists(other)
+    assert [m["event_id"] for m in store.list_event_meta()] == events[1:]
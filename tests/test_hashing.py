@@ -0,0 +1,151 @@
+"""Skema hash blok: stabilitas v1 (chain lama), encoding & digest v2, API batch."""
+
+import hashlib
+import struct
+
+import pytest
+
+from blockchain import find_invalid_block, is_chain_valid, make_block
+from compact_chain import CompactChain
+from hashing import (
+    CURRENT_VERSION,
+    LEGACY_HASHER,
+    LEGACY_VERSION,
+    BlockHasher,
+    get_hasher,
+    hash_settings,
+    hasher_for,
+)
+from verify import verify_chain
+
+FIELDS = (1, "2024-01-01T00:00:00.000000", "alice", "Kandidat A", "0" * 64)
+
+# Chain versi 1 seperti yang tersimpan di data lama; hash-nya tidak boleh berubah
+LEGACY_CHAIN = [
+    {
+        "index": 0,
+        "timestamp": "2024-01-01T00:00:00",
+        "voter_id": "GENESIS",
+        "candidate": "-",
+        "previous_hash": "0",
+        "hash": "75edb83f38aacb0005088c58ba4a606d036ba9cf77afc02b78c859c1cd824331",
+    },
+    {
+        "index": 1,
+        "timestamp": "2024-01-01T00:01:00",
+        "voter_id": "alice",
+        "candidate": "A",
+        "previous_hash": "75edb83f38aacb0005088c58ba4a606d036ba9cf77afc02b78c859c1cd824331",
+        "hash": "70036a4527a9b0f55b90d68485b8c78b66b300d7ed92e3b3252374839da277ec",
+    },
+    {
+        "index": 2,
+        "timestamp": "2024-01-01T00:02:00",
+        "voter_id": "bob",
+        "candidate": "B",
+        "previous_hash": "70036a4527a9b0f55b90d68485b8c78b66b300d7ed92e3b3252374839da277ec",
+        "hash": "fc67ce7c05a9c29ec6dc095cc0f51a5f49cb0571322d3a0ad1e7532e1d86adfa",
+    },
+]
+
+
+def _reference_v2(fields) -> bytes:
+    """Encoding v2 ditulis ulang apa adanya dari spesifikasinya (tanpa jalur cepat)."""
+    parts = [b"chainvote-block/2"]
+    for field in fields:
+        data = str(field).encode("utf-8")
+        parts.append(struct.pack(">I", len(data)) + data)
+    return b"".join(parts)
+
+
+# ---------- Versi 1 ----------
+
+
+def test_v1_known_answer():
+    expected = "6f79de6f3035fb31b4975d5ab5a9afca012e6cffd1ea18a9aca13b6bdefc78a3"
+    assert LEGACY_HASHER.hash(*FIELDS) == expected
+    assert hashlib.sha256("".join(str(f) for f in FIELDS).encode("utf-8")).hexdigest() == expected
+
+
+def test_v1_legacy_chain_still_valid():
+    assert is_chain_valid(LEGACY_CHAIN)
+    assert find_invalid_block(LEGACY_CHAIN) is None
+    assert CompactChain(LEGACY_CHAIN).find_invalid() is None
+    for block in LEGACY_CHAIN:
+        assert LEGACY_HASHER.block_hash(block) == block["hash"]
+    report = verify_chain(LEGACY_CHAIN)
+    assert report["valid"] and report["hash_scheme"] == {"version": 1, "algorithm": "sha256"}
+
+
+def test_v1_only_supports_sha256():
+    with pytest.raises(ValueError):
+        BlockHasher("blake2b", LEGACY_VERSION)
+
+
+# ---------- Versi 2 ----------
+
+
+def test_v2_encoding_is_length_prefixed():
+    encoded = get_hasher(CURRENT_VERSION, "sha256").encode(*FIELDS)
+    assert encoded == _reference_v2(FIELDS)
+    assert encoded.startswith(b"chainvote-block/2\x00\x00\x00\x011")
+
+
+@pytest.mark.parametrize(
+    "algorithm, expected",
+    [
+        ("sha256", "8c92b16307d78edd7542dbd4ff49ba9b8f6f0c89fa3a4d3391b3995c190ef212"),
+        ("blake2b", "6930f0ad47638b12e25321a0af66a7a7f3cf217e0613fdbebc1844d31ec6964f"),
+    ],
+)
+def test_v2_known_answer(algorithm, expected):
+    assert get_hasher(CURRENT_VERSION, algorithm).hash(*FIELDS) == expected
+
+
+@pytest.mark.parametrize(
+    "fields",
+    [
+        (7, "2024-01-01T00:00:00", "pemilih-ü", "Kandidat Ω", "ab" * 32),
+        (7, "t", "v" * 5000, "c", "0"),  # di luar tabel prefix jalur ASCII
+        (0, "", "", "", ""),
+    ],
+)
+def test_v2_fast_path_matches_reference(fields):
+    assert get_hasher(CURRENT_VERSION, "sha256").encode(*fields) == _reference_v2(fields)
+
+
+def test_v2_field_boundaries_are_unambiguous():
+    v1 = LEGACY_HASHER
+    v2 = get_hasher(CURRENT_VERSION, "sha256")
+    assert v1.hash(1, "t", "ab", "c", "0") == v1.hash(1, "t", "a", "bc", "0")
+    assert v2.hash(1, "t", "ab", "c", "0") != v2.hash(1, "t", "a", "bc", "0")
+
+
+@pytest.mark.parametrize("hasher", [LEGACY_HASHER, get_hasher(2, "sha256"), get_hasher(2, "blake2b")])
+def test_batch_matches_single(hasher):
+    rows = [(i, f"2024-01-01T00:00:{i:02d}", f"voter-{i}", "AB"[i % 2], "0" * 64) for i in range(50)]
+    assert hasher.hash_many(rows) == [hasher.hash(*row) for row in rows]
+    assert hasher.digest_many(rows) == [hasher.digest(*row) for row in rows]
+
+
+# ---------- Skema per event ----------
+
+
+def test_hasher_for_metadata():
+    assert hasher_for(None) is LEGACY_HASHER
+    assert hasher_for({"event_id": "lama"}) is LEGACY_HASHER
+    meta = {"event_id": "baru", **hash_settings("blake2b")}
+    assert hasher_for(meta).spec == (CURRENT_VERSION, "blake2b")
+    with pytest.raises(ValueError):
+        hash_settings("md5")
+
+
+def test_chain_validates_only_with_its_scheme():
+    hasher = get_hasher(CURRENT_VERSION, "blake2b")
+    chain = [dict(LEGACY_CHAIN[0], hash=hasher.block_hash(LEGACY_CHAIN[0]))]
+    for i in range(5):
+        chain.append(make_block(chain[-1], f"voter-{i}", "A", hasher))
+    assert is_chain_valid(chain, hasher=hasher)
+    assert not is_chain_valid(chain)
+    assert CompactChain(chain).find_invalid(0, hasher) is None
+    assert verify_chain(chain, hasher=hasher)["valid"]
@@ -0,0 +1,77 @@
+"""ETag/Last-Modified berbasis head chain dan cache hasil render halaman."""
+
+import app as app_module
+from metrics import METRICS
+
+
+def _vote(app, event_id, voter, candidate="A"):
+    assert app.extensions["vote_writer"].submit_many(event_id, [(voter, candidate)])[0]["accepted"]
+
+
+def _render_cache_hits():
+    prefix = 'chainvote_render_cache_hits_total{template="blockchain.html"} '
+    lines = [line for line in METRICS.render().splitlines() if line.startswith(prefix)]
+    return float(lines[0][len(prefix):]) if lines else 0.0
+
+
+def test_blockchain_page_revalidates_on_head(app, client, create_event, login_as):
+    event_id = create_event()
+    _vote(app, event_id, "pemilih-1")
+    login_as("budi")
+    url = f"/event/{event_id}/blockchain"
+    first = client.get(url)
+    etag = first.headers["ETag"]
+    assert first.status_code == 200 and first.headers["Last-Modified"]
+    assert "no-cache" in first.headers["Cache-Control"] and "private" in first.headers["Cache-Control"]
+
+    again = client.get(url, headers={"If-None-Match": etag})
+    assert again.status_code == 304 and again.data == b""
+
+    _vote(app, event_id, "pemilih-2")
+    changed = client.get(url, headers={"If-None-Match": etag})
+    assert changed.status_code == 200 and changed.headers["ETag"] != etag
+    assert b"pemilih-2" in changed.data
+
+
+def test_etag_depends_on_user_and_page(app, client, create_event, login_as):
+    event_id = create_event()
+    url = f"/event/{event_id}/blockchain"
+    login_as("budi")
+    etag = client.get(url).headers["ETag"]
+    assert client.get(f"{url}?page=2").headers["ETag"] != etag
+    login_as("siti")
+    assert client.get(url, headers={"If-None-Match": etag}).status_code == 200
+
+
+def test_pending_flash_skips_304(app, client, create_event, login_as):
+    event_id = create_event()
+    login_as("budi")
+    url = f"/event/{event_id}"
+    etag = client.get(url).headers["ETag"]
+    client.post(url, data={"candidate": "Z"})  # chain tidak berubah, tapi ada flash tertunda
+    response = client.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == 200 and "Kandidat tidak valid." in response.get_data(as_text=True)
+    assert client.get(url, headers={"If-None-Match": etag}).status_code == 304
+
+
+def test_render_cache_reuses_html(app, client, create_event, login_as, monkeypatch):
+    monkeypatch.setattr(app_module, "RENDER_CACHE_PAGES", 4)
+    event_id = create_event()
+    login_as("budi")
+    url = f"/event/{event_id}/blockchain"
+    before = _render_cache_hits()
+    first = client.get(url).data
+    assert client.get(url).data == first
+    assert _render_cache_hits() == before + 1
+    _vote(app, event_id, "pemilih-1")
+    assert b"pemilih-1" in client.get(url).data
+    assert _render_cache_hits() == before + 1
+
+
+def test_csv_export_not_modified(app, client, create_event):
+    event_id = create_event()
+    _vote(app, event_id, "pemilih-1")
+    url = f"/event/{event_id}/blockchain/export_csv"
+    etag = client.get(url).headers["ETag"]
+    assert client.get(url, headers={"If-None-Match": etag}).status_code == 304
+    assert client.get(f"{url}?compress=gzip", headers={"If-None-Match": etag}).status_code == 200
@@ -0,0 +1,123 @@
+"""Pipeline gambar kandidat: nama hash isi, pembersihan file tidak terpakai, metadata kandidat."""
+
+import base64
+import io
+import os
+import struct
+import time
+import zlib
+
+import pytest
+
+from images import ImagePipeline, ImageRejected, is_content_addressed, media_references
+
+
+def _png(rgb=(255, 0, 0)):
+    """PNG 1x1 valid (bisa dibaca dengan maupun tanpa Pillow)."""
+
+    def chunk(tag, data):
+        return struct.pack(">I", len(data)) + tag + data + struct.pack(">I", zlib.crc32(tag + data) & 0xFFFFFFFF)
+
+    header = struct.pack(">IIBBBBB", 1, 1, 8, 2, 0, 0, 0)
+    pixels = zlib.compress(b"\x00" + bytes(rgb))
+    return b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header) + chunk(b"IDAT", pixels) + chunk(b"IEND", b"")
+
+
+@pytest.fixture
+def pipeline(tmp_path):
+    pipeline = ImagePipeline(str(tmp_path / "uploads"), workers=1)
+    yield pipeline
+    pipeline.close()
+
+
+def _wait_for(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "pipeline gambar tidak selesai"
+        time.sleep(0.01)
+
+
+def test_process_stores_content_addressed_files_once(pipeline):
+    first = pipeline.process(_png())
+    again = pipeline.process(_png())
+    assert first == again
+    assert is_content_addressed(first.image) and is_content_addressed(first.thumbnail)
+    assert pipeline.exists(first.image) and pipeline.exists(first.thumbnail)
+    assert pipeline.process(_png((0, 0, 255))).image != first.image
+
+
+def test_process_rejects_non_images(pipeline):
+    with pytest.raises(ImageRejected):
+        pipeline.process(b"GIF? bukan gambar")
+    small = ImagePipeline(pipeline.upload_dir, workers=1, max_bytes=10)
+    try:
+        with pytest.raises(ImageRejected):
+            small.process(_png())
+    finally:
+        small.close()
+
+
+def test_unreferenced_only_lists_pipeline_files(pipeline):
+    used = pipeline.process(_png())
+    unused = pipeline.process(_png((0, 255, 0)))
+    for name in ("Kandidat_A.png", ".gitkeep", "catatan-operator.txt", f"{unused.image}.123.tmp"):
+        with open(os.path.join(pipeline.upload_dir, name), "wb") as f:
+            f.write(b"x")
+    metas = [{"candidate_images": {"A": used.image, "B": "Kandidat_A.png"}, "candidate_thumbnails": {"A": used.thumbnail}}]
+    referenced = media_references(metas)
+    assert referenced == {used.image, used.thumbnail, "Kandidat_A.png"}
+    assert pipeline.unreferenced(referenced) == sorted({unused.image, unused.thumbnail})
+    assert pipeline.unreferenced(set()) == sorted({used.image, used.thumbnail, unused.image, unused.thumbnail})
+
+
+def test_remove_ignores_paths_and_missing_files(pipeline):
+    stored = pipeline.process(_png())
+    outside = os.path.join(os.path.dirname(pipeline.upload_dir), "luar.png")
+    with open(outside, "wb") as f:
+        f.write(b"x")
+    assert pipeline.remove([stored.image, "../luar.png", "tidak-ada.png"]) == [stored.image]
+    assert os.path.exists(outside)
+
+
+def test_provisioned_image_is_recorded_and_released_on_delete(app, client, login_as):
+    login_as("admin", "admin")
+    image = _png((1, 2, 3))
+    response = client.post(
+        "/admin/events/bulk",
+        json={"events": [{"name": "Foto", "candidates": ["A", "B"], "candidate_images": {"A": base64.b64encode(image).decode()}}]},
+    )
+    assert response.status_code == 202
+    event_id = response.get_json()["created"][0]["event_id"]
+    store = app.extensions["event_store"]
+    _wait_for(lambda: (store.get_event_meta(event_id).get("candidate_images") or {}).get("A"))
+    name = store.get_event_meta(event_id)["candidate_images"]["A"]
+    pipeline = app.extensions["image_pipeline"]
+    assert pipeline.exists(name)
+
+    assert client.post(f"/event/{event_id}/delete").status_code == 302
+    assert not pipeline.exists(name)
+
+
+def test_candidate_form_does_not_overwrite_newer_metadata(app, client, create_event):
+    event_id = create_event(candidates=("A", "B"))
+    cache = app.extensions["events_cache"]
+    store = app.extensions["event_store"]
+    cache.revalidate_interval = 3600  # cache worker ini dipastikan tertinggal
+    cache.get_event_meta(event_id)
+
+    # Worker lain baru saja mencatat gambar kandidat A (langsung ke storage)
+    newer = store.get_event_meta(event_id)
+    newer["candidate_images"] = {"A": "0123456789abcdef0123.png"}
+    store.save_event_meta(newer)
+
+    response = client.post(
+        f"/event/{event_id}/candidates",
+        data={"desc_0": "Deskripsi A", "desc_1": "", "img_1": (io.BytesIO(b""), "")},
+        content_type="multipart/form-data",
+    )
+    assert response.status_code == 302
+    saved = store.get_event_meta(event_id)
+    assert saved["candidate_images"] == {"A": "0123456789abcdef0123.png"}
+    assert saved["candidate_descriptions"] == {"A": "Deskripsi A"}
+    # Cache worker ini ikut diperbarui (write-through)
+    assert cache.get_event_meta(event_id)["candidate_descriptions"] == {"A": "Deskripsi A"}
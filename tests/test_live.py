@@ -0,0 +1,110 @@
+"""Stream SSE hasil real-time: snapshot, replay saat reconnect, batas stream per worker."""
+
+import json
+
+from blockchain import create_genesis_block, make_block
+from live import ChainFeed, StreamSlots, stream_chain
+
+
+class _Chain:
+    """Chain di memori + tally, untuk menggerakkan ``stream_chain`` langsung."""
+
+    def __init__(self, votes):
+        self.blocks = [create_genesis_block()]
+        for i in range(votes):
+            self.add(f"v{i}")
+
+    def add(self, voter, candidate="A"):
+        self.blocks.append(make_block(self.blocks[-1], voter, candidate))
+
+    def get_chain(self, event_id):
+        return self.blocks
+
+    def get_tally(self, event_id):
+        tally = {}
+        for block in self.blocks[1:]:
+            tally[block["candidate"]] = tally.get(block["candidate"], 0) + 1
+        return tally
+
+
+def _stream(feed, chain, **kwargs):
+    kwargs.setdefault("heartbeat", 0.01)
+    kwargs.setdefault("max_duration", 5)
+    stream = stream_chain(feed, "e", chain.get_chain, chain.get_tally, **kwargs)
+    assert next(stream).startswith("retry:")
+    return stream
+
+
+def _parse(message):
+    fields = dict(line.split(": ", 1) for line in message.strip().split("\n"))
+    return fields["event"], int(fields["id"]), json.loads(fields["data"])
+
+
+def test_new_observer_gets_snapshot_then_blocks():
+    feed, chain = ChainFeed(), _Chain(votes=3)
+    stream = _stream(feed, chain)
+    event, event_id, data = _parse(next(stream))
+    assert (event, event_id) == ("snapshot", 3)
+    assert data["tally"] == {"A": 3} and data["head"]["index"] == 3
+    assert "voter_id" not in data["head"]
+    assert next(stream) == ": heartbeat\n\n"
+    chain.add("baru", "B")
+    feed.notify_blocks("e")
+    event, event_id, data = _parse(next(stream))
+    assert (event, event_id, data["tally_delta"]) == ("block", 4, {"B": 1})
+
+
+def test_reconnect_replays_missed_blocks():
+    feed, chain = ChainFeed(), _Chain(votes=5)
+    stream = _stream(feed, chain, last_index=3)
+    assert [_parse(next(stream))[:2] for _ in range(2)] == [("block", 4), ("block", 5)]
+
+
+def test_negative_or_stale_last_index_sends_snapshot():
+    feed, chain = ChainFeed(), _Chain(votes=5)
+    for last_index in (-1, -3, 99):
+        assert _parse(next(_stream(feed, chain, last_index=last_index)))[:2] == ("snapshot", 5)
+    # Tertinggal lebih dari replay_max blok: snapshot, bukan replay
+    assert _parse(next(_stream(feed, chain, last_index=1, replay_max=2)))[:2] == ("snapshot", 5)
+
+
+def test_reset_sends_new_snapshot_and_delete_closes():
+    feed, chain = ChainFeed(), _Chain(votes=3)
+    stream = _stream(feed, chain)
+    next(stream)
+    chain.blocks = chain.blocks[:2]
+    feed.notify_reset("e")
+    assert _parse(next(stream))[:2] == ("snapshot", 1)
+    chain.blocks = []
+    feed.notify_reset("e")
+    assert next(stream).startswith("event: closed")
+
+
+def test_stream_slots():
+    slots = StreamSlots(2)
+    assert slots.acquire() and slots.acquire() and not slots.acquire()
+    slots.release()
+    assert slots.active == 1 and slots.acquire()
+    for _ in range(5):
+        slots.release()
+    assert slots.active == 0
+
+
+def test_stream_endpoint_caps_open_streams(app, client, create_event, login_as):
+    event_id = create_event()
+    login_as("budi")
+    app.extensions["stream_slots"].limit = 1
+    url = f"/event/{event_id}/stream"
+    first = client.get(url, buffered=False)
+    assert first.status_code == 200 and first.mimetype == "text/event-stream"
+    rejected = client.get(url, buffered=False)
+    assert rejected.status_code == 503 and rejected.headers["Retry-After"]
+    first.close()
+    assert app.extensions["stream_slots"].active == 0
+    second = client.get(f"{url}?last_index=-2", buffered=False, headers={"Last-Event-ID": "-2"})
+    assert second.status_code == 200
+    chunks = iter(second.response)
+    assert next(chunks).startswith(b"retry:")
+    assert next(chunks).startswith(b"id: 0\nevent: snapshot")
+    second.close()
+    assert client.get("/event/tidak-ada/stream").status_code == 404
@@ -0,0 +1,146 @@
+"""Known-answer test Merkle tree & bukti (vektor uji RFC 6962 / Certificate Transparency)."""
+
+import pytest
+
+from merkle import EMPTY_ROOT, MerkleTree, block_leaf, verify_consistency, verify_inclusion
+
+LEAVES = [
+    b"",
+    b"\x00",
+    b"\x10",
+    b"\x20\x21",
+    b"\x30\x31",
+    b"\x40\x41\x42\x43",
+    bytes(range(0x50, 0x58)),
+    bytes(range(0x60, 0x70)),
+]
+
+# Root untuk tree berisi LEAVES[:n], n = 1..8
+ROOTS = [
+    "6e340b9cffb37a989ca544e6bb780a2c78901d3fb33738768511a30617afa01d",
+    "fac54203e7cc696cf0dfcb42c92a1d9dbaf70ad9e621f4bd8d98662f00e3c125",
+    "aeb6bcfe274b70a14fb067a5e5578264db0fa9b51af5e0ba159158f329e06e77",
+    "d37ee418976dd95753c1c73862b9398fa2a2cf9b4ff0fdfe8b30cd95209614b7",
+    "4e3bbb1f7b478dcfe71fb631631519a3bca12c9aefca1612bfce4c13a86264d4",
+    "76e67dadbcdf1e10e1b74ddc608abd2f98dfb16fbce75277b5232a127f2087ef",
+    "ddb89be403809e325750d3d263cd78929c2942b7942a34b77e122c9594a74c8c",
+    "5dc9da79a70659a9ad559cb701ded9a2ab9d823aad2f4960cfe370eff4604328",
+]
+
+# (index leaf, ukuran tree, bukti inklusi)
+INCLUSION_PROOFS = [
+    (0, 1, []),
+    (
+        0,
+        8,
+        [
+            "96a296d224f285c67bee93c30f8a309157f0daa35dc5b87e410b78630a09cfc7",
+            "5f083f0a1a33ca076a95279832580db3e0ef4584bdff1f54c8a360f50de3031e",
+            "6b47aaf29ee3c2af9af889bc1fb9254dabd31177f16232dd6aab035ca39bf6e4",
+        ],
+    ),
+    (
+        5,
+        8,
+        [
+            "bc1a0643b12e4d2d7c77918f44e0f4f79a838b6cf9ec5b5c283e1f4d88599e6b",
+            "ca854ea128ed050b41b35ffc1b87b8eb2bde461e9e3b5596ece6b9d5975a0ae0",
+            "d37ee418976dd95753c1c73862b9398fa2a2cf9b4ff0fdfe8b30cd95209614b7",
+        ],
+    ),
+    (2, 3, ["fac54203e7cc696cf0dfcb42c92a1d9dbaf70ad9e621f4bd8d98662f00e3c125"]),
+    (
+        1,
+        5,
+        [
+            "6e340b9cffb37a989ca544e6bb780a2c78901d3fb33738768511a30617afa01d",
+            "5f083f0a1a33ca076a95279832580db3e0ef4584bdff1f54c8a360f50de3031e",
+            "bc1a0643b12e4d2d7c77918f44e0f4f79a838b6cf9ec5b5c283e1f4d88599e6b",
+        ],
+    ),
+]
+
+# (ukuran lama, ukuran baru, bukti konsistensi)
+CONSISTENCY_PROOFS = [
+    (1, 1, []),
+    (
+        1,
+        8,
+        [
+            "96a296d224f285c67bee93c30f8a309157f0daa35dc5b87e410b78630a09cfc7",
+            "5f083f0a1a33ca076a95279832580db3e0ef4584bdff1f54c8a360f50de3031e",
+            "6b47aaf29ee3c2af9af889bc1fb9254dabd31177f16232dd6aab035ca39bf6e4",
+        ],
+    ),
+    (
+        6,
+        8,
+        [
+            "0ebc5d3437fbe2db158b9f126a1d118e308181031d0a949f8dededebc558ef6a",
+            "ca854ea128ed050b41b35ffc1b87b8eb2bde461e9e3b5596ece6b9d5975a0ae0",
+            "d37ee418976dd95753c1c73862b9398fa2a2cf9b4ff0fdfe8b30cd95209614b7",
+        ],
+    ),
+    (
+        2,
+        5,
+        [
+            "5f083f0a1a33ca076a95279832580db3e0ef4584bdff1f54c8a360f50de3031e",
+            "bc1a0643b12e4d2d7c77918f44e0f4f79a838b6cf9ec5b5c283e1f4d88599e6b",
+        ],
+    ),
+]
+
+
+@pytest.fixture
+def tree():
+    return MerkleTree(LEAVES)
+
+
+def test_empty_root():
+    assert MerkleTree().root() == EMPTY_ROOT
+    assert EMPTY_ROOT.hex() == "e3b0c44298fc1c149afbf4c8996fb92427ae41e4649b934ca495991b7852b855"
+
+
+@pytest.mark.parametrize("size", range(1, len(LEAVES) + 1))
+def test_root(tree, size):
+    assert tree.root(size).hex() == ROOTS[size - 1]
+    # Tree yang dibangun incremental sampai ``size`` sama dengan root historis
+    assert MerkleTree(LEAVES[:size]).root().hex() == ROOTS[size - 1]
+
+
+@pytest.mark.parametrize("index, size, expected", INCLUSION_PROOFS)
+def test_inclusion_proof(tree, index, size, expected):
+    proof = tree.inclusion_proof(index, size)
+    assert [p.hex() for p in proof] == expected
+    root = bytes.fromhex(ROOTS[size - 1])
+    assert verify_inclusion(LEAVES[index], index, size, proof, root)
+    assert not verify_inclusion(b"bukan leaf ini", index, size, proof, root)
+
+
+@pytest.mark.parametrize("old_size, new_size, expected", CONSISTENCY_PROOFS)
+def test_consistency_proof(tree, old_size, new_size, expected):
+    proof = tree.consistency_proof(old_size, new_size)
+    assert [p.hex() for p in proof] == expected
+    old_root = bytes.fromhex(ROOTS[old_size - 1])
+    new_root = bytes.fromhex(ROOTS[new_size - 1])
+    assert verify_consistency(old_size, new_size, old_root, new_root, proof)
+    if old_size != new_size:
+        assert not verify_consistency(old_size, new_size, new_root, new_root, proof)
+
+
+def test_all_proofs_verify():
+    leaves = [block_leaf(f"{i:064x}") for i in range(37)]
+    tree = MerkleTree(leaves)
+    for size in range(1, len(leaves) + 1):
+        root = tree.root(size)
+        for index in range(size):
+            assert verify_inclusion(leaves[index], index, size, tree.inclusion_proof(index, size), root)
+        for old_size in range(1, size + 1):
+            proof = tree.consistency_proof(old_size, size)
+            assert verify_consistency(old_size, size, tree.root(old_size), root, proof)
+
+
+def test_block_leaf_uses_raw_digest():
+    assert block_leaf("ab" * 32) == bytes.fromhex("ab" * 32)
+    assert block_leaf("0") == b"0"
@@ -0,0 +1,50 @@
+"""Registry metrik, endpoint /admin/metrics dan profiling per request."""
+
+from metrics import MetricsRegistry
+
+
+def test_histogram_buckets_are_cumulative():
+    registry = MetricsRegistry(buckets=(0.1, 1.0))
+    registry.describe("latency", "histogram", "Latensi.")
+    for value in (0.05, 0.5, 5.0):
+        registry.observe("latency", value, route="a")
+    text = registry.render()
+    assert "# TYPE latency histogram" in text
+    assert 'latency_bucket{route="a",le="0.1"} 1' in text
+    assert 'latency_bucket{route="a",le="1.0"} 2' in text
+    assert 'latency_bucket{route="a",le="+Inf"} 3' in text
+    assert 'latency_count{route="a"} 3' in text
+
+
+def test_counters_gauges_and_label_escaping():
+    registry = MetricsRegistry()
+    registry.inc("bytes", 10, backend="json")
+    registry.inc("bytes", 5, backend="json")
+    registry.set_gauge("length", 3, event_id='a"b')
+    text = registry.render()
+    assert 'bytes{backend="json"} 15.0' in text
+    assert 'length{event_id="a\\"b"} 3' in text
+    registry.clear_gauge("length")
+    assert "length" not in registry.render()
+
+
+def test_metrics_endpoint_admin_only(app, client, create_event, login_as):
+    event_id = create_event()
+    client.get(f"/event/{event_id}/results")
+    body = client.get("/admin/metrics").get_data(as_text=True)
+    assert 'chainvote_http_request_duration_seconds_count{endpoint="event_results",method="GET",status="200"}' in body
+    assert f'chainvote_chain_length{{event_id="{event_id}"}} 1' in body
+    assert "chainvote_storage_bytes_written_total" in body
+    login_as("budi")
+    assert client.get("/admin/metrics").status_code == 403
+    assert client.get("/admin/profiling").status_code == 403
+
+
+def test_profiling_toggle(client, login_as):
+    login_as("admin", "admin")
+    assert client.post("/admin/profiling", data={"enabled": "1"}).get_json()["enabled"]
+    client.get("/readyz")
+    profiles = client.get("/admin/profiling").get_json()["profiles"]
+    assert any(p["path"] == "/readyz" and "function calls" in p["stats"] for p in profiles)
+    body = client.post("/admin/profiling", data={"enabled": "0"}).get_json()
+    assert body == {"enabled": False, "profiles": []}
@@ -0,0 +1,85 @@
+"""Hash password PBKDF2, upgrade hash lama saat login, dan index user di memori."""
+
+import json
+
+from passwords import PasswordHasher, is_hashed
+from storage import JsonUserStore
+
+
+def test_hash_and_verify():
+    hasher = PasswordHasher(iterations=1000, workers=2)
+    try:
+        stored = hasher.hash("rahasia")
+        assert is_hashed(stored) and stored.split("$")[1] == "1000"
+        assert hasher.verify("rahasia", stored) and not hasher.verify("salah", stored)
+        assert hasher.hash("rahasia") != stored  # salt acak
+        assert all(hasher.verify(p, h) for p, h in zip(["a", "b"], hasher.hash_many(["a", "b"])))
+        assert not hasher.verify("rahasia", None)
+        assert not hasher.verify("rahasia", "pbkdf2_sha256$rusak")
+    finally:
+        hasher.close()
+
+
+def test_needs_rehash():
+    weak = PasswordHasher(iterations=500, workers=1)
+    strong = PasswordHasher(iterations=1000, workers=1)
+    try:
+        old = weak.hash("pw")
+        assert strong.verify("pw", old)
+        assert strong.needs_rehash(old) and not weak.needs_rehash(old)
+        assert strong.needs_rehash("pw")  # plain text lama
+        assert not strong.needs_rehash(strong.hash("pw"))
+    finally:
+        weak.close()
+        strong.close()
+
+
+def _login(client, username, password):
+    response = client.post("/login", data={"username": username, "password": password})
+    return response.headers["Location"]
+
+
+def test_login_upgrades_legacy_passwords(app, client):
+    store = app.extensions["user_store"]
+    hasher = app.extensions["password_hasher"]
+    weak = PasswordHasher(iterations=10, workers=1)
+    try:
+        store.add_users(
+            [
+                {"username": "plain", "password": "pw-plain", "role": "user"},
+                {"username": "lemah", "password": weak.hash("pw-lemah"), "role": "user"},
+            ]
+        )
+    finally:
+        weak.close()
+
+    assert _login(client, "plain", "salah").endswith("/login")
+    assert store.find_user("plain")["password"] == "pw-plain"  # login gagal tidak mengubah apa pun
+
+    for username in ("plain", "lemah"):
+        assert _login(client, username, f"pw-{username}").endswith("/")
+        stored = store.find_user(username)["password"]
+        assert is_hashed(stored) and not hasher.needs_rehash(stored)
+        assert hasher.verify(f"pw-{username}", stored)
+    # Login berikutnya memakai hash baru
+    assert _login(client, "plain", "pw-plain").endswith("/")
+
+
+def test_register_stores_hash(app, client):
+    client.post("/register", data={"username": "baru", "password": "pw", "confirm": "pw"})
+    stored = app.extensions["user_store"].find_user("baru")["password"]
+    assert is_hashed(stored) and stored != "pw"
+
+
+def test_user_index_follows_file_changes(tmp_path):
+    users_file = tmp_path / "users.json"
+    store = JsonUserStore(str(users_file))
+    try:
+        store.add_users([{"username": "a", "password": "x", "role": "user"}])
+        assert store.find_user("a")["role"] == "user"
+        # Proses lain menulis ulang file: index di memori harus ikut berubah
+        users_file.write_text(json.dumps([{"username": "b", "password": "y", "role": "admin"}]))
+        assert store.find_user("a") is None
+        assert store.find_user("b")["role"] == "admin"
+    finally:
+        store.close()
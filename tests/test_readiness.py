@@ -0,0 +1,97 @@
+"""Start cepat: create_app tidak membaca chain; warm-up background & /readyz."""
+
+import threading
+import time
+
+import pytest
+
+import app as app_module
+from blockchain import create_genesis_block
+from storage import EventCache, JsonlEventStore
+
+
+@pytest.fixture
+def second_app(app, monkeypatch):
+    """``second_app()``: worker baru di direktori data yang sama (warm-up aktif)."""
+    apps = []
+
+    def make():
+        monkeypatch.setattr(app_module, "WARMUP_ENABLED", True)
+        flask_app = app_module.create_app()
+        apps.append(flask_app)
+        return flask_app
+
+    yield make
+    for flask_app in apps:
+        flask_app.extensions["image_pipeline"].close()
+        flask_app.extensions["event_store"].close()
+        flask_app.extensions["user_store"].close()
+
+
+def _wait_ready(client, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        response = client.get("/readyz")
+        if response.status_code == 200:
+            return response.get_json()
+        time.sleep(0.01)
+    raise AssertionError("worker tidak pernah siap")
+
+
+def test_ready_immediately_without_warmup(client):
+    body = client.get("/readyz").get_json()
+    assert body["status"] == "ready" and body["warmed_chains"] == 0
+
+
+def test_create_app_does_not_read_chains(app, create_event, second_app, monkeypatch):
+    create_event()
+    gate = threading.Event()
+    original_warm = EventCache.warm
+
+    def gated_warm(self, limit=None):
+        gate.wait(5)
+        return original_warm(self, limit)
+
+    original_open = JsonlEventStore.open_chain
+
+    def guarded_open(self, event_id):
+        assert gate.is_set(), "chain dibaca sebelum warm-up"
+        return original_open(self, event_id)
+
+    monkeypatch.setattr(EventCache, "warm", gated_warm)
+    monkeypatch.setattr(JsonlEventStore, "open_chain", guarded_open)
+    worker = second_app()
+    client = worker.test_client()
+    assert client.get("/readyz").status_code == 503
+    assert client.get("/readyz").get_json()["status"] == "warming"
+    # Request tetap dilayani selama warm-up
+    assert client.get("/login").status_code == 200
+    gate.set()
+    assert _wait_ready(client)["warmed_chains"] == 1
+
+
+def test_warmup_error_still_marks_ready(app, second_app, monkeypatch):
+    def broken(self, limit=None):
+        raise OSError("disk")
+
+    monkeypatch.setattr(EventCache, "warm", broken)
+    body = _wait_ready(second_app().test_client())
+    assert body["error"] == "disk" and body["ready_after_seconds"] >= 0
+
+
+def test_warm_loads_newest_open_events(tmp_path):
+    store = JsonlEventStore(str(tmp_path / "events_meta.json"), str(tmp_path / "chains"))
+    try:
+        store.create_events(
+            [
+                {"event_id": f"e{i}", "candidates": ["A"], "status": "closed" if i == 3 else "open",
+                 "blockchain": [create_genesis_block()]}
+                for i in range(5)
+            ]
+        )
+        cache = EventCache(store)
+        assert cache.warm(limit=2) == 2
+        assert sorted(cache.cached_chain_lengths()) == ["e2", "e4"]
+        assert EventCache(store).warm() == 4
+    finally:
+        store.close()
@@ -0,0 +1,49 @@
+"""Tally berjalan: hasil JSON mengikuti vote baru dan dibangun ulang setelah chain ditulis ulang."""
+
+from blockchain import summary_from_counts
+
+
+def _vote(app, event_id, voter, candidate):
+    with app.test_client() as client:
+        with client.session_transaction() as sess:
+            sess["user"] = {"username": voter, "role": "user"}
+        assert client.post(f"/event/{event_id}", data={"candidate": candidate}).status_code == 302
+
+
+def test_summary_from_counts():
+    summary = summary_from_counts(["A", "B", "C"], {"A": 2, "B": 2, "X": 9})
+    assert summary == {"counts": {"A": 2, "B": 2, "C": 0}, "total": 4, "winners": ["A", "B"]}
+    assert summary_from_counts(["A"], {})["winners"] == []
+
+
+def test_results_follow_new_votes(app, client, create_event):
+    event_id = create_event(candidates=("A", "B"))
+    body = client.get(f"/event/{event_id}/results").get_json()
+    assert body["counts"] == {"A": 0, "B": 0} and body["total"] == 0 and body["chain_length"] == 1
+
+    for voter, candidate in (("v1", "A"), ("v2", "B"), ("v3", "A")):
+        _vote(app, event_id, voter, candidate)
+    body = client.get(f"/event/{event_id}/results").get_json()
+    assert body["counts"] == {"A": 2, "B": 1}
+    assert body["total"] == 3 and body["winners"] == ["A"] and body["chain_length"] == 4
+
+    response = client.post(f"/event/{event_id}/votes/batch", json={"votes": [{"voter_id": "v4", "candidate": "B"}]})
+    assert response.get_json()["accepted"] == 1
+    body = client.get(f"/event/{event_id}/results").get_json()
+    assert body["counts"] == {"A": 2, "B": 2} and body["winners"] == ["A", "B"]
+
+
+def test_tally_rebuilt_after_tamper(app, client, create_event, login_as):
+    event_id = create_event(candidates=("A", "B"))
+    for voter in ("v1", "v2"):
+        _vote(app, event_id, voter, "A")
+    login_as("attacker", "attacker")
+    response = client.post(f"/event/{event_id}/block/1/tamper", data={"candidate": "B"})
+    assert response.status_code == 302
+    assert app.extensions["events_cache"].get_tally(event_id) == {"A": 1, "B": 1}
+    assert client.get(f"/event/{event_id}/results").get_json()["counts"] == {"A": 1, "B": 1}
+
+
+def test_results_unknown_event(client, login_as):
+    login_as("budi")
+    assert client.get("/event/tidak-ada/results").status_code == 404
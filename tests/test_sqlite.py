@@ -0,0 +1,131 @@
+"""Backend SQLite, impor users.json, dan salin data json <-> sqlite (``storage_tool``)."""
+
+import json
+
+import pytest
+
+from blockchain import create_genesis_block, make_block
+from storage import JsonlEventStore, JsonUserStore
+from storage_sqlite import SqliteEventStore, SqliteUserStore
+from storage_tool import copy_storage
+
+
+def _event(event_id, votes=0):
+    chain = [create_genesis_block()]
+    for i in range(votes):
+        chain.append(make_block(chain[-1], f"voter-{i}", "AB"[i % 2]))
+    return {"event_id": event_id, "name": event_id, "candidates": ["A", "B"], "blockchain": chain}
+
+
+@pytest.fixture
+def sqlite_stores(tmp_path):
+    events = SqliteEventStore(str(tmp_path / "chainvote.db"))
+    users = SqliteUserStore(str(tmp_path / "chainvote.db"))
+    yield events, users
+    events.close()
+    users.close()
+
+
+@pytest.fixture
+def json_stores(tmp_path):
+    events = JsonlEventStore(str(tmp_path / "events_meta.json"), str(tmp_path / "chains"))
+    users = JsonUserStore(str(tmp_path / "users.json"))
+    yield events, users
+    events.close()
+    users.close()
+
+
+def test_sqlite_event_round_trip(sqlite_stores):
+    store, _ = sqlite_stores
+    event = _event("e1", votes=3)
+    store.create_event(event)
+    signature = store.chain_signature("e1")
+    block = make_block(event["blockchain"][-1], "baru", "A")
+    store.append_blocks("e1", [block], durable=True)
+    assert store.chain_signature("e1") != signature
+    assert store.load_chain("e1") == event["blockchain"] + [block]
+    assert list(store.iter_blocks("e1", 2, 4)) == event["blockchain"][2:4]
+
+    meta_signature = store.meta_signature()
+    store.save_event_meta(dict(store.get_event_meta("e1"), name="Baru"))
+    assert store.meta_signature() != meta_signature
+    assert store.get_event_meta("e1")["name"] == "Baru"
+
+    tampered = list(store.load_chain("e1"))
+    tampered[1] = dict(tampered[1], candidate="B")
+    store.replace_chain("e1", tampered)
+    assert store.load_chain("e1") == tampered
+    assert store.delete_event("e1") and store.get_event_meta("e1") is None
+    assert store.load_chain("e1") == []
+
+
+def test_sqlite_users(sqlite_stores):
+    _, users = sqlite_stores
+    assert users.add_users([{"username": "a", "password": "x", "role": "user"}] * 2) == 1
+    assert not users.add_user({"username": "a", "password": "y", "role": "user"})
+    assert users.update_user({"username": "a", "password": "z", "role": "admin"})
+    assert users.find_user("a") == {"username": "a", "password": "z", "role": "admin"}
+    assert users.find_user("tidak-ada") is None
+    assert not users.update_user({"username": "tidak-ada"})
+
+
+def test_users_json_imported_once(sqlite_stores, tmp_path):
+    _, users = sqlite_stores
+    users_file = tmp_path / "users.json"
+    users_file.write_text(json.dumps([{"username": "lama", "password": "pw", "role": "user"}]), encoding="utf-8")
+    assert users.migrate_legacy(str(users_file)) == 1
+    assert users.find_user("lama")["password"] == "pw"
+    users.update_user({"username": "lama", "password": "baru", "role": "user"})
+    # Start berikutnya tidak mengimpor ulang (password yang sudah diganti tidak kembali)
+    assert users.migrate_legacy(str(users_file)) == 0
+    assert users.find_user("lama")["password"] == "baru"
+
+
+def test_copy_json_to_sqlite_and_back(json_stores, sqlite_stores, tmp_path):
+    src_events, src_users = json_stores
+    dst_events, dst_users = sqlite_stores
+    events = [_event("e1", votes=4), _event("e2")]
+    src_events.create_events(events)
+    src_users.add_users([{"username": "u1", "password": "p", "role": "user"}])
+
+    stats = copy_storage(src_events, src_users, dst_events, dst_users)
+    assert stats == {"events": 2, "blocks": 6, "users": 1, "skipped_events": 0, "archived_events": 0}
+    assert dst_events.load_chain("e1") == events[0]["blockchain"]
+    assert dst_users.find_user("u1")["password"] == "p"
+    # Salin ulang: semuanya sudah ada
+    again = copy_storage(src_events, src_users, dst_events, dst_users)
+    assert again["events"] == 0 and again["skipped_events"] == 2 and again["users"] == 0
+
+    back_events = JsonlEventStore(str(tmp_path / "kembali.json"), str(tmp_path / "kembali"))
+    back_users = JsonUserStore(str(tmp_path / "kembali-users.json"))
+    try:
+        copy_storage(dst_events, dst_users, back_events, back_users)
+        assert [m["event_id"] for m in back_events.list_event_meta()] == ["e1", "e2"]
+        assert back_events.load_chain("e1") == events[0]["blockchain"]
+        assert back_users.find_user("u1") is not None
+    finally:
+        back_events.close()
+        back_users.close()
+
+
+def test_app_on_sqlite_backend(tmp_path, monkeypatch):
+    import app as app_module
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(app_module, "STORAGE_BACKEND", "sqlite")
+    monkeypatch.setattr(app_module, "PASSWORD_HASH_ITERATIONS", 1000)
+    monkeypatch.setattr(app_module, "WARMUP_ENABLED", False)
+    (tmp_path / "users.json").write_text(
+        json.dumps([{"username": "lama", "password": "rahasia", "role": "user"}]), encoding="utf-8"
+    )
+    flask_app = app_module.create_app()
+    try:
+        assert isinstance(flask_app.extensions["event_store"], SqliteEventStore)
+        client = flask_app.test_client()
+        response = client.post("/login", data={"username": "lama", "password": "rahasia"})
+        assert response.status_code == 302 and response.headers["Location"].endswith("/")
+        assert flask_app.extensions["user_store"].find_user("admin") is not None
+    finally:
+        flask_app.extensions["image_pipeline"].close()
+        flask_app.extensions["event_store"].close()
+        flask_app.extensions["user_store"].close()
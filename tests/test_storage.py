@@ -0,0 +1,109 @@
+"""JsonlEventStore: katalog + log JSON Lines per event, append tanpa menulis ulang."""
+
+import json
+import os
+
+import pytest
+
+from blockchain import create_genesis_block, make_block
+from storage import JsonlEventStore
+
+
+def _event(event_id, votes=0):
+    chain = [create_genesis_block()]
+    for i in range(votes):
+        chain.append(make_block(chain[-1], f"voter-{i}", "AB"[i % 2]))
+    return {"event_id": event_id, "name": event_id, "candidates": ["A", "B"], "blockchain": chain}
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = JsonlEventStore(str(tmp_path / "events_meta.json"), str(tmp_path / "chains"), fsync_batch_size=4)
+    yield store
+    store.close()
+
+
+def _reopen(store):
+    store.close()
+    return JsonlEventStore(store.meta_file, store.chains_dir)
+
+
+def test_create_and_append_round_trip(store):
+    event = _event("e1", votes=2)
+    store.create_event(event)
+    chain = event["blockchain"]
+    new_blocks = [make_block(chain[-1], "v-baru", "A")]
+    new_blocks.append(make_block(new_blocks[-1], "v-lain", "B"))
+    store.append_blocks("e1", new_blocks[:1])
+    store.append_blocks("e1", new_blocks[1:], durable=True)
+
+    reopened = _reopen(store)
+    try:
+        assert reopened.get_event_meta("e1") == {k: v for k, v in event.items() if k != "blockchain"}
+        assert reopened.load_chain("e1") == chain + new_blocks
+        assert reopened.load_event("e1")["blockchain"] == chain + new_blocks
+        # Satu baris per blok; append tidak menulis ulang katalog
+        with open(reopened.chain_path("e1"), encoding="utf-8") as f:
+            assert [json.loads(line) for line in f] == chain + new_blocks
+    finally:
+        reopened.close()
+
+
+def test_append_does_not_touch_other_events(store):
+    store.create_events([_event("e1"), _event("e2", votes=1)])
+    meta_before = store.meta_signature()
+    other_before = store.chain_signature("e2")
+    store.append_blocks("e1", [make_block(store.load_chain("e1")[-1], "v", "A")], durable=True)
+    assert store.meta_signature() == meta_before
+    assert store.chain_signature("e2") == other_before
+    assert [m["event_id"] for m in store.list_event_meta()] == ["e1", "e2"]
+
+
+def test_truncated_last_line_is_skipped(store):
+    event = _event("e1", votes=3)
+    store.create_event(event)
+    with open(store.chain_path("e1"), "a", encoding="utf-8") as f:
+        f.write('{"index": 4, "timest')
+    assert store.load_chain("e1") == event["blockchain"]
+    assert list(store.iter_blocks("e1")) == event["blockchain"]
+
+
+def test_iter_blocks_range(store):
+    event = _event("e1", votes=9)
+    store.create_event(event)
+    chain = event["blockchain"]
+    assert list(store.iter_blocks("e1", 3, 6)) == chain[3:6]
+    assert list(store.iter_blocks("e1", 8)) == chain[8:]
+    assert list(store.iter_blocks("tidak-ada")) == []
+
+
+def test_read_appended_returns_only_the_tail(store):
+    event = _event("e1", votes=2)
+    store.create_event(event)
+    since = store.chain_signature("e1")
+    block = make_block(event["blockchain"][-1], "v", "A")
+    store.append_blocks("e1", [block], durable=True)
+    assert store.read_appended("e1", 3, since) == [block]
+    # Log ditulis ulang (inode baru): ekor tidak bisa dipercaya
+    since = store.chain_signature("e1")
+    store.replace_chain("e1", event["blockchain"])
+    assert store.read_appended("e1", 3, since) is None
+
+
+def test_delete_event(store):
+    store.create_event(_event("e1", votes=1))
+    assert store.delete_event("e1")
+    assert not store.delete_event("e1")
+    assert store.get_event_meta("e1") is None
+    assert not os.path.exists(store.chain_path("e1"))
+
+
+def test_migrate_legacy_events_json(store, tmp_path):
+    legacy = [_event("lama-1", votes=2), _event("lama-2")]
+    legacy_file = tmp_path / "events.json"
+    legacy_file.write_text(json.dumps(legacy), encoding="utf-8")
+    assert store.migrate_legacy(str(legacy_file)) == 2
+    assert not legacy_file.exists() and (tmp_path / "events.json.migrated").exists()
+    assert store.load_chain("lama-1") == legacy[0]["blockchain"]
+    assert [m["event_id"] for m in store.list_event_meta()] == ["lama-1", "lama-2"]
+    assert store.migrate_legacy(str(legacy_file)) == 0
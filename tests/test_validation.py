@@ -0,0 +1,81 @@
+"""Validasi incremental: hanya blok setelah checkpoint yang di-hash ulang."""
+
+import pytest
+
+import storage
+from blockchain import create_genesis_block, make_block
+from storage import EventCache, JsonlEventStore
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    """Cache dengan chain list biasa; posisi awal setiap validasi dicatat di ``cache.starts``."""
+    store = JsonlEventStore(str(tmp_path / "events_meta.json"), str(tmp_path / "chains"))
+    cache = EventCache(store, revalidate_interval=3600, compact=False)
+    cache.starts = []
+    original = storage.find_invalid_block
+
+    def recording(chain, start=0, hasher=None):
+        cache.starts.append(start)
+        return original(chain, start, hasher) if hasher is not None else original(chain, start)
+
+    monkeypatch.setattr(storage, "find_invalid_block", recording)
+    chain = [create_genesis_block()]
+    for i in range(5):
+        chain.append(make_block(chain[-1], f"v{i}", "A"))
+    cache.create_event({"event_id": "e", "candidates": ["A", "B"], "blockchain": chain})
+    yield cache
+    store.close()
+
+
+def _append(cache, voter):
+    cache.append_blocks("e", [make_block(cache.get_chain("e")[-1], voter, "B")])
+
+
+def test_only_new_blocks_are_rehashed(cache):
+    assert cache.check_chain("e") is None
+    assert cache.check_chain("e") is None  # checkpoint di ujung: tidak ada yang di-hash
+    _append(cache, "baru-1")
+    _append(cache, "baru-2")
+    assert cache.check_chain("e") is None
+    assert cache.starts == [0, 6]
+
+
+def test_full_check_restarts_from_genesis(cache):
+    cache.check_chain("e")
+    assert cache.check_chain("e", full=True) is None
+    assert cache.starts == [0, 0]
+
+
+def test_rewrite_rewinds_checkpoint(cache):
+    cache.check_chain("e")
+    chain = list(cache.get_chain("e"))
+    chain[3] = dict(chain[3], candidate="B")
+    cache.replace_chain("e", chain, modified_index=3)
+    assert cache.check_chain("e") == 3
+    assert cache.starts == [0, 3]
+    # Hasil rusak diingat sampai chain berubah lagi
+    assert cache.check_chain("e") == 3
+    assert cache.starts == [0, 3]
+
+
+def test_prefix_changed_outside_cache_is_not_trusted(cache):
+    cache.check_chain("e")
+    chain = cache.get_chain("e")
+    chain[5] = dict(chain[5], hash="0" * 64)  # ujung checkpoint tidak cocok lagi
+    assert cache.check_chain("e") == 5
+    assert cache.starts == [0, 0]
+
+
+def test_blockchain_page_reports_first_invalid_block(app, client, create_event, login_as):
+    event_id = create_event(candidates=("A", "B"))
+    for voter in ("v1", "v2", "v3"):
+        login_as(voter)
+        client.post(f"/event/{event_id}", data={"candidate": "A"})
+    login_as("budi")
+    assert b"Rusak mulai blok" not in client.get(f"/event/{event_id}/blockchain").data
+    login_as("attacker", "attacker")
+    client.post(f"/event/{event_id}/block/2/tamper", data={"candidate": "B"})
+    assert app.extensions["events_cache"].check_chain(event_id) == 3
+    login_as("budi")
+    assert b"Rusak mulai blok #3" in client.get(f"/event/{event_id}/blockchain").data
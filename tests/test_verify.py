@@ -0,0 +1,63 @@
+"""Verifikasi penuh paralel: laporan sama dengan verifikasi di satu proses."""
+
+import pytest
+
+from blockchain import create_genesis_block, find_invalid_block, make_block
+from hashing import get_hasher
+from verify import verify_chain
+
+
+def _chain(length, hasher=None):
+    kwargs = {"hasher": hasher} if hasher is not None else {}
+    chain = [create_genesis_block(**kwargs)]
+    for i in range(1, length):
+        chain.append(make_block(chain[-1], f"v{i}", "AB"[i % 2], **kwargs))
+    return chain
+
+
+def _damaged(chain):
+    chain = [dict(b) for b in chain]
+    chain[7]["candidate"] = "Z"  # hash tidak cocok
+    chain[40]["previous_hash"] = "f" * 64  # link putus (di batas segmen saat segment_size=20)
+    return chain
+
+
+def test_valid_chain_report():
+    report = verify_chain(_chain(30), max_workers=1)
+    assert report["valid"] and report["genesis_ok"]
+    assert report["length"] == 30 and report["first_invalid"] is None
+    assert report["hash_scheme"] == {"version": 1, "algorithm": "sha256"}
+
+
+def test_reports_every_problem():
+    chain = _damaged(_chain(60))
+    report = verify_chain(chain, max_workers=1)
+    assert not report["valid"]
+    assert report["first_invalid"] == 7 == find_invalid_block(chain)
+    assert report["broken_links"] == [40]
+    assert [m["index"] for m in report["hash_mismatches"]] == [7, 40]
+
+
+def test_bad_genesis():
+    chain = _chain(5)
+    chain[0] = dict(chain[0], previous_hash="x")
+    report = verify_chain(chain, max_workers=1)
+    assert not report["genesis_ok"] and report["first_invalid"] == 0
+
+
+@pytest.mark.parametrize("algorithm", ["sha256", "blake2b"])
+def test_parallel_matches_serial(algorithm):
+    hasher = get_hasher(2, algorithm)
+    chain = _damaged(_chain(60, hasher))
+    serial = verify_chain(chain, max_workers=1, hasher=hasher)
+    # Pool proses (spawn) dengan segmen kecil: sambungan antar-segmen dicek di proses utama
+    parallel = verify_chain(chain, max_workers=2, segment_size=20, parallel_threshold=0, hasher=hasher)
+    assert parallel == serial
+    assert parallel["hash_scheme"] == {"version": 2, "algorithm": algorithm}
+
+
+def test_audit_endpoint(app, client, create_event, login_as):
+    event_id = create_event()
+    assert client.get(f"/event/{event_id}/blockchain/audit").get_json()["valid"]
+    login_as("budi")
+    assert client.get(f"/event/{event_id}/blockchain/audit").status_code == 403
@@ -0,0 +1,147 @@
+"""VoteWriter: group commit, penolakan voter ganda, writer idle berhenti sendiri."""
+
+import threading
+
+import pytest
+
+from ingest import VoteRejected, VoteWriter
+
+
+class _Event:
+    """Event di memori dengan commit yang bisa ditahan untuk memaksa vote mengantre."""
+
+    def __init__(self, candidates=("A", "B")):
+        self.event = {"event_id": "e", "candidates": list(candidates), "blockchain": [{"index": 0}]}
+        self.commits = []
+        self.fail_next = False
+        self.entered = threading.Event()
+        self.gate = threading.Event()
+        self.gate.set()
+
+    def find(self, event_id):
+        return self.event if event_id == "e" else None
+
+    def has_voted(self, event, voter_id):
+        return any(b.get("voter_id") == voter_id for b in event["blockchain"][1:])
+
+    def commit(self, event, votes):
+        self.entered.set()
+        self.gate.wait(5)
+        if self.fail_next:
+            self.fail_next = False
+            raise OSError("disk penuh")
+        chain = event["blockchain"]
+        blocks = [{"index": len(chain) + i, "voter_id": v, "candidate": c} for i, (v, c) in enumerate(votes)]
+        chain.extend(blocks)
+        self.commits.append(len(blocks))
+        return blocks
+
+
+@pytest.fixture
+def store():
+    return _Event()
+
+
+def _writer(store, **kwargs):
+    return VoteWriter(store.find, store.has_voted, store.commit, **kwargs)
+
+
+def test_submit_returns_block_index(store):
+    writer = _writer(store)
+    assert writer.submit("e", "v1", "A", timeout=5) == 1
+    assert writer.submit("e", "v2", "B", timeout=5) == 2
+
+
+def test_queued_votes_are_committed_together(store):
+    writer = _writer(store)
+    store.gate.clear()
+    first = writer.submit_async("e", "v0", "A")
+    # Commit pertama sedang berjalan (tertahan): vote berikutnya menumpuk di antrean
+    assert store.entered.wait(5)
+    rest = [writer.submit_async("e", f"v{i}", "AB"[i % 2]) for i in range(1, 21)]
+    store.gate.set()
+    assert first.result(5) == 1
+    assert sorted(f.result(5) for f in rest) == list(range(2, 22))
+    assert store.commits[0] == 1
+    assert sum(store.commits) == 21 and len(store.commits) < 21
+
+
+def test_duplicate_voter_rejected_in_same_batch_and_later(store):
+    writer = _writer(store)
+    store.gate.clear()
+    futures = [writer.submit_async("e", "sama", c) for c in ("A", "B", "A")]
+    store.gate.set()
+    outcomes = []
+    for future in futures:
+        try:
+            outcomes.append(future.result(5))
+        except VoteRejected as exc:
+            outcomes.append(exc.reason)
+    assert outcomes.count(VoteRejected.ALREADY_VOTED) == 2
+    assert [b["voter_id"] for b in store.event["blockchain"][1:]] == ["sama"]
+    with pytest.raises(VoteRejected) as info:
+        writer.submit("e", "sama", "B", timeout=5)
+    assert info.value.reason == VoteRejected.ALREADY_VOTED
+
+
+def test_rejections(store):
+    writer = _writer(store)
+    with pytest.raises(VoteRejected) as info:
+        writer.submit("e", "v1", "Z", timeout=5)
+    assert info.value.reason == VoteRejected.INVALID_CANDIDATE
+    with pytest.raises(VoteRejected) as info:
+        writer.submit("tidak-ada", "v1", "A", timeout=5)
+    assert info.value.reason == VoteRejected.EVENT_NOT_FOUND
+    store.event["status"] = "closed"
+    with pytest.raises(VoteRejected) as info:
+        writer.submit("e", "v1", "A", timeout=5)
+    assert info.value.reason == VoteRejected.EVENT_CLOSED
+    assert store.commits == []
+
+
+def test_commit_error_fails_batch_but_writer_survives(store):
+    writer = _writer(store)
+    store.fail_next = True
+    with pytest.raises(OSError):
+        writer.submit("e", "v1", "A", timeout=5)
+    assert writer.submit("e", "v1", "A", timeout=5) == 1
+
+
+def test_idle_writer_thread_exits(store):
+    writer = _writer(store, idle_timeout=0.05)
+    before = set(threading.enumerate())
+    assert writer.submit("e", "v1", "A", timeout=5) == 1
+    [thread] = [t for t in threading.enumerate() if t not in before and t.name == "vote-writer-e"]
+    thread.join(5)
+    assert not thread.is_alive()
+    assert "e" not in writer._queues
+    # Vote berikutnya membuat writer baru
+    assert writer.submit("e", "v2", "B", timeout=5) == 2
+
+
+def test_concurrent_app_votes_are_not_lost(app, create_event):
+    event_id = create_event(candidates=("A", "B"))
+    voters = [f"voter-{i}" for i in range(60)]
+    clients = []
+    for voter in voters:
+        client = app.test_client()
+        with client.session_transaction() as sess:
+            sess["user"] = {"username": voter, "role": "user"}
+        clients.append(client)
+
+    def vote(i):
+        clients[i].post(f"/event/{event_id}", data={"candidate": "AB"[i % 2]})
+        clients[i].post(f"/event/{event_id}", data={"candidate": "A"})  # vote kedua ditolak
+
+    threads = [threading.Thread(target=vote, args=(i,)) for i in range(len(voters))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    store = app.extensions["event_store"]
+    store.sync()
+    chain = store.load_chain(event_id)
+    assert sorted(b["voter_id"] for b in chain[1:]) == sorted(voters)
+    assert [b["index"] for b in chain] == list(range(len(chain)))
+    assert app.extensions["events_cache"].check_chain(event_id, full=True) is None
@@ -0,0 +1,60 @@
+"""Vote lewat halaman event: satu vote per user, dicek lewat index voter cache."""
+
+
+def _flashes(client):
+    with client.session_transaction() as sess:
+        return sess.pop("_flashes", [])
+
+
+def test_vote_once_then_rejected(app, client, create_event, login_as):
+    event_id = create_event(candidates=("A", "B"))
+    login_as("budi")
+    assert client.post(f"/event/{event_id}", data={"candidate": "A"}).status_code == 302
+    assert _flashes(client) == [("success", "Vote berhasil direkam di blockchain.")]
+
+    response = client.post(f"/event/{event_id}", data={"candidate": "B"})
+    assert response.status_code == 302
+    [(category, message)] = _flashes(client)
+    assert category == "warning" and "sudah memberikan suara" in message
+
+    cache = app.extensions["events_cache"]
+    assert cache.get_voters(event_id) == {"budi"}
+    assert [b["voter_id"] for b in list(cache.get_chain(event_id))[1:]] == ["budi"]
+
+
+def test_voter_index_is_per_event(app, client, create_event, login_as):
+    first = create_event(name="Satu")
+    second = create_event(name="Dua")
+    login_as("budi")
+    client.post(f"/event/{first}", data={"candidate": "A"})
+    _flashes(client)
+    client.post(f"/event/{second}", data={"candidate": "B"})
+    assert _flashes(client) == [("success", "Vote berhasil direkam di blockchain.")]
+    cache = app.extensions["events_cache"]
+    assert cache.get_voters(first) == {"budi"} and cache.get_voters(second) == {"budi"}
+
+
+def test_voter_index_survives_reload(app, client, create_event, login_as):
+    event_id = create_event()
+    login_as("budi")
+    client.post(f"/event/{event_id}", data={"candidate": "A"})
+    cache = app.extensions["events_cache"]
+    cache.invalidate()
+    # Index dibangun ulang dari storage: vote kedua tetap ditolak
+    _flashes(client)
+    client.post(f"/event/{event_id}", data={"candidate": "B"})
+    [(category, _)] = _flashes(client)
+    assert category == "warning"
+    assert cache.get_voters(event_id) == {"budi"}
+
+
+def test_invalid_candidate_and_admin_vote_rejected(app, client, create_event, login_as):
+    event_id = create_event()
+    login_as("budi")
+    client.post(f"/event/{event_id}", data={"candidate": "Z"})
+    assert _flashes(client) == [("danger", "Kandidat tidak valid.")]
+    login_as("admin", "admin")
+    client.post(f"/event/{event_id}", data={"candidate": "A"})
+    [(category, _)] = _flashes(client)
+    assert category == "warning"
+    assert app.extensions["events_cache"].get_voters(event_id) == set()
@@ -0,0 +1,12 @@
+"""Entry point WSGI untuk server produksi (lihat ``gunicorn.conf.py``).
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+Setiap worker memanggil ``create_app()`` sendiri; koordinasi antar worker
+(lock per event & broadcast invalidasi cache) aktif jika
+``CHAINVOTE_MULTIPROCESS=1`` (di-set otomatis oleh ``gunicorn.conf.py``).
+"""
+
+from app import create_app
+
+app = create_app()